@@ -22,7 +22,6 @@ from llobot.environments.projects import ProjectEnv
 from llobot.environments.retrievals import RetrievalsEnv
 from llobot.environments.knowledge import KnowledgeEnv
 from llobot.formats.knowledge import KnowledgeFormat, standard_knowledge_format
-from llobot.knowledge import Knowledge
 from llobot.knowledge.ranking.rankers import KnowledgeRanker, standard_ranker
 from llobot.commands.retrievals.exact import handle_exact_retrieval_commands
 from llobot.commands.retrievals.overviews import assume_overview_retrieval_commands
@@ -58,19 +57,10 @@ def flush_retrieval_commands(
     knowledge_env = env[KnowledgeEnv]
     context = env[ContextEnv]
 
-    docs = {}
-
-    # We iterate over all retrieved paths. Read operation will return None
-    # for files that are unreadable or do not exist, effectively filtering them out.
-    for path in retrieved_paths:
-        content = project.read(path)
-        if content is not None:
-            # We skip files that have already been seen in the context.
-            # Document format guarantees non-empty output, so we don't need to check it.
-            if path not in knowledge_env:
-                docs[path] = content
-
-    retrieved_knowledge = Knowledge(docs)
+    # We skip files that have already been seen in the context. Read operation
+    # leaves out files that are unreadable or do not exist, effectively filtering them out.
+    # Document format guarantees non-empty output, so we don't need to check it.
+    retrieved_knowledge = project.read_many(path for path in retrieved_paths if path not in knowledge_env)
     knowledge_env.update(retrieved_knowledge)
 
     ranking = ranker.rank(retrieved_knowledge)
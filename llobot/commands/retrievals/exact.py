@@ -10,6 +10,7 @@ from llobot.environments import Environment
 from llobot.environments.context import ContextEnv
 from llobot.environments.projects import ProjectEnv
 from llobot.environments.retrievals import RetrievalsEnv
+from llobot.knowledge.subsets.compiled import compile_subset
 from llobot.knowledge.subsets.parsing import parse_pattern
 
 _PATH_RE = re.compile(r'^(?:~/)?(?:[a-zA-Z0-9_.-]+/)*[a-zA-Z0-9_.-]+$')
@@ -38,7 +39,7 @@ def handle_exact_retrieval_command(text: str, env: Environment) -> bool:
         text = '/' + text[2:]
 
     knowledge_index = env[ProjectEnv].union.index()
-    subset = parse_pattern(text)
+    subset = compile_subset(parse_pattern(text))
     matches = list(knowledge_index & subset)
 
     if matches:
@@ -24,6 +24,11 @@ class RankedKnowledgeCrammer(KnowledgeCrammer, ValueTypeMixin):
     ranking that fit within the provided budget. The process is iterative:
     it formats a selection, checks if it fits, and if not, removes documents
     from the end of the selection and tries again.
+
+    Project knowledge is obtained via `Project.read_lazy()` and budgeted by
+    estimated sizes, so that only documents needed for ranking and rendering
+    are read. Documents that turn out to be unreadable (e.g. binary files)
+    are skipped without consuming budget.
     """
     _ranker: KnowledgeRanker
     _blacklist: KnowledgeSubset
@@ -58,7 +63,7 @@ class RankedKnowledgeCrammer(KnowledgeCrammer, ValueTypeMixin):
         builder = env[ContextEnv].builder
         initial_mark = builder.mark()
 
-        knowledge = env[ProjectEnv].union.read_all()
+        knowledge = env[ProjectEnv].union.read_lazy()
 
         if self._budget <= 0:
             return
@@ -72,7 +77,10 @@ class RankedKnowledgeCrammer(KnowledgeCrammer, ValueTypeMixin):
         selection_paths = []
         cost = 0
         for path in ranking:
-            doc_cost = len(knowledge[path])
+            # Reading lazily loaded documents drops unreadable ones and makes their size exact.
+            if not knowledge[path] and path not in knowledge:
+                continue
+            doc_cost = knowledge.size(path)
             if cost + doc_cost > self._budget:
                 break
             cost += doc_cost
@@ -103,7 +111,7 @@ class RankedKnowledgeCrammer(KnowledgeCrammer, ValueTypeMixin):
             removed_cost = 0
             while removed_cost < overrun and selection_paths:
                 removed_path = selection_paths.pop()
-                removed_cost += len(knowledge[removed_path])
+                removed_cost += knowledge.size(removed_path)
 
             if not selection_paths:
                 return
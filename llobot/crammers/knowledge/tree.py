@@ -8,7 +8,6 @@ from llobot.environments.context import ContextEnv
 from llobot.environments.knowledge import KnowledgeEnv
 from llobot.environments.projects import ProjectEnv
 from llobot.formats.knowledge import KnowledgeFormat, standard_knowledge_format
-from llobot.knowledge import Knowledge
 from llobot.knowledge.ranking.lexicographical import LexicographicalRanker
 from llobot.knowledge.subsets import coerce_subset
 from llobot.knowledge.subsets.standard import overviews_subset
@@ -46,18 +45,16 @@ class RootKnowledgeCrammer(KnowledgeCrammer, ValueTypeMixin):
         project = env[ProjectEnv].union
 
         # Collect all immediate children of all prefixes
-        candidates = {}
-        overviews = overviews_subset()
-
+        files = []
         for prefix in project.prefixes:
             for item in project.items(prefix):
-                # We only care about files directly under the prefix that match the overviews subset
-                if isinstance(item, ProjectFile) and project.tracked(item) and item.path in overviews:
-                    content = project.read(item.path)
-                    if content is not None:
-                        candidates[item.path] = content
+                if isinstance(item, ProjectFile) and project.tracked(item):
+                    files.append(item.path)
+
+        # We only care about files directly under the prefix that match the overviews subset
+        candidates = overviews_subset().filter(files)
 
-        knowledge = Knowledge(candidates)
+        knowledge = project.read_many(candidates)
 
         # Rank the candidates (lexicographically)
         ranking = LexicographicalRanker().rank(knowledge)
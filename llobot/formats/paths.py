@@ -19,6 +19,18 @@ def coerce_path(path: str | Path | PurePosixPath) -> PurePosixPath:
     Raises:
         ValueError: If the path is absolute, contains wildcards, `~`, or `..`.
     """
+    if type(path) is PurePosixPath:
+        # Already parsed paths are validated with string operations and returned as is,
+        # which is much faster and keeps their cached string form and hash.
+        text = str(path)
+        if text.startswith('/'):
+            raise ValueError(f"Path must be relative: {path}")
+        if '*' in text or '?' in text or '[' in text:
+            raise ValueError(f"Path must not contain wildcards: {path}")
+        for part in text.split('/'):
+            if part == '..' or part == '~':
+                raise ValueError(f"Path must not contain '{part}': {path}")
+        return path
     if isinstance(path, (Path, PurePosixPath)):
         if path.is_absolute():
             raise ValueError(f"Path must be relative: {path}")
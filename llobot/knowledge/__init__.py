@@ -27,20 +27,41 @@ subsets/
     Pattern-based filtering and selection with KnowledgeSubset
 resolver
     `KnowledgeResolver` for efficient, proximity-based path resolution.
+tables
+    `PathTable` that interns paths to dense integer IDs for bitset indexes.
+lazy
+    `LazyKnowledge` that reads documents on demand.
+deltas
+    `KnowledgeDelta` describing changes between two versions of knowledge.
 """
 from __future__ import annotations
+import hashlib
+from itertools import compress
+import weakref
 from pathlib import PurePosixPath
-from typing import TYPE_CHECKING, Callable, Iterator
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+from llobot.knowledge.tables import PathTable
 from llobot.utils.fs import read_document
 from llobot.utils.values import ValueTypeMixin
 from llobot.formats.paths import coerce_path
 
 if TYPE_CHECKING:
+    from llobot.knowledge.deltas import KnowledgeDelta
     from llobot.knowledge.indexes import KnowledgeIndex
     from llobot.knowledge.ranking import KnowledgeRanking
     from llobot.knowledge.scores import KnowledgeScores
     from llobot.knowledge.subsets import KnowledgeSubset
 
+_DIGEST_SIZE = 16
+_DIGEST_MODULUS = 1 << (8 * _DIGEST_SIZE)
+
+def _content_digest(content: str) -> bytes:
+    return hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=_DIGEST_SIZE).digest()
+
+def _entry_digest(path: PurePosixPath, content_digest: bytes) -> int:
+    data = str(path).encode('utf-8', 'surrogatepass') + b'\0' + content_digest
+    return int.from_bytes(hashlib.blake2b(data, digest_size=_DIGEST_SIZE).digest())
+
 class Knowledge(ValueTypeMixin):
     """
     An immutable collection of documents, indexed by `pathlib.PurePosixPath`.
@@ -48,56 +69,291 @@ class Knowledge(ValueTypeMixin):
     Knowledge objects behave like a read-only dictionary mapping paths to
     their string content. They support various operations for filtering,
     transforming, and combining knowledge bases.
+
+    Hashing and equality are based on `digest`, which is computed once and
+    mostly reused by knowledge derived via `&`, `|`, `-`, and `/`.
+
+    Filtering via `&` and `-` returns a view that shares storage with the
+    original knowledge and lists only the selected paths. The view builds its
+    own dictionary only when individual documents are looked up.
+
+    Knowledge can remember its `parent`, the older version it was derived
+    from, together with paths that might have changed since. `diff()` uses
+    this lineage to compare related versions in time proportional to the
+    number of changes.
     """
-    _documents: dict[PurePosixPath, str]
+    # Documents of this knowledge or `None` if this is a view that was not materialized yet.
+    _documents: dict[PurePosixPath, str] | None
+    # Storage shared with the knowledge this view was filtered from.
+    _base: dict[PurePosixPath, str]
+    # Paths of this view in order or `None` if this knowledge contains all of `_base`.
+    _selection: list[PurePosixPath] | None
+    # Content digests and path-dependent entry digests computed so far, shared with derived knowledge.
+    _digests: dict[PurePosixPath, tuple[bytes, int]]
+    _digest: str | None
+    # Shared with knowledge derived by filtering and merging.
+    _table: PathTable
+    # Weak reference to the parent, so that lineage does not keep old versions alive.
+    _parent: weakref.ref[Knowledge] | None
+    _changes: frozenset[PurePosixPath]
 
-    def __init__(self, documents: dict[PurePosixPath, str] | None = None):
+    def __init__(self,
+        documents: dict[PurePosixPath, str] | None = None,
+        *,
+        parent: Knowledge | None = None,
+        changes: Iterable[PurePosixPath] = (),
+    ):
         """
         Initializes a new Knowledge object.
 
         Args:
             documents: A dictionary of paths and their content.
+            parent: Older version of this knowledge, which enables fast `diff()`.
+            changes: Paths that might differ from `parent`. All other paths
+                     must be either absent from both or have the same content.
+        """
+        self._documents = self._base = {coerce_path(p): c for p, c in documents.items()} if documents else {}
+        self._selection = None
+        self._digests = {}
+        self._digest = None
+        self._table = PathTable()
+        self._parent = weakref.ref(parent) if parent is not None else None
+        self._changes = frozenset(changes)
+
+    @staticmethod
+    def _trusted(documents: dict[PurePosixPath, str], table: PathTable | None = None) -> Knowledge:
         """
+        Creates knowledge from documents with already validated paths without copying them.
+        """
+        result = Knowledge.__new__(Knowledge)
+        result._documents = result._base = documents
+        result._selection = None
+        result._digests = {}
+        result._digest = None
+        result._table = table if table is not None else PathTable()
+        result._parent = None
+        result._changes = frozenset()
+        return result
+
+    def _view(self, selection: list[PurePosixPath]) -> Knowledge:
+        """
+        Creates a view of selected paths that shares storage, digests, and path table.
+        """
+        result = Knowledge.__new__(Knowledge)
+        result._documents = None
+        result._base = self._base
+        result._selection = selection
+        # Documents in the view have the same content as in this knowledge, so their digests are the same too.
+        result._digests = self._digests
+        result._digest = None
+        result._table = self._table
+        result._parent = None
+        result._changes = frozenset()
+        return result
+
+    def _materialized(self) -> dict[PurePosixPath, str]:
+        documents = self._documents
         if documents is None:
-            documents = {}
-        self._documents = {coerce_path(p): c for p, c in documents.items()}
+            base = self._base
+            documents = self._documents = {path: base[path] for path in self._selection or ()}
+        return documents
+
+    def _paths(self) -> Iterable[PurePosixPath]:
+        return self._selection if self._selection is not None else self._base.keys()
+
+    def _ephemeral_fields(self) -> Iterable[str]:
+        return ['_digests', '_digest', '_table', '_parent', '_changes']
+
+    def _inherit_digests(self, source: Knowledge, paths: Callable[[PurePosixPath], PurePosixPath | None] = lambda path: path) -> Knowledge:
+        """
+        Reuses digests of documents that were carried over from other knowledge.
+
+        Args:
+            source: Knowledge the documents were taken from.
+            paths: Maps source paths to paths in this knowledge or to `None`
+                   if the document was not carried over.
+        """
+        # Digests can be shared with views that fill them concurrently, so we iterate over a copy.
+        for source_path, (content_digest, entry) in source._digests.copy().items():
+            path = paths(source_path)
+            if path is not None and path in self._materialized():
+                self._digests[path] = (content_digest, entry if path == source_path else _entry_digest(path, content_digest))
+        return self
+
+    @property
+    def digest(self) -> str:
+        """
+        Content-based identity of the knowledge as a hexadecimal string.
+
+        Every document is hashed with BLAKE2 together with its path and the
+        results are summed, so the digest does not depend on document order.
+        It is stable across processes and can be used as a snapshot ID.
+        Per-document digests are shared with knowledge derived by filtering,
+        merging, and prefixing, so that the digest of derived knowledge does
+        not require hashing content again.
+        """
+        if self._digest is None:
+            total = 0
+            for path, content in self:
+                digests = self._digests.get(path)
+                if digests is None:
+                    content_digest = _content_digest(content)
+                    digests = (content_digest, _entry_digest(path, content_digest))
+                    self._digests[path] = digests
+                total += digests[1]
+            self._digest = (total % _DIGEST_MODULUS).to_bytes(_DIGEST_SIZE).hex()
+        return self._digest
+
+    def content_digest(self, path: PurePosixPath) -> bytes:
+        """
+        BLAKE2 digest of one document's content.
+
+        The digest is stable across processes and shared with derived
+        knowledge like the digests behind `digest`.
+
+        Args:
+            path: Path of the document, which must be present.
+
+        Returns:
+            16-byte digest of the content.
+        """
+        digests = self._digests.get(path)
+        if digests is None:
+            content_digest = _content_digest(self[path])
+            digests = (content_digest, _entry_digest(path, content_digest))
+            self._digests[path] = digests
+        return digests[0]
+
+    @property
+    def parent(self) -> Knowledge | None:
+        """
+        Older version of this knowledge if it is known and still alive.
+        """
+        return self._parent() if self._parent is not None else None
+
+    def _changes_since(self, ancestor: Knowledge) -> set[PurePosixPath] | None:
+        """
+        Collects paths that might have changed since an ancestor or returns `None` if it is not an ancestor.
+        """
+        changes: set[PurePosixPath] = set()
+        current: Knowledge | None = self
+        while current is not None:
+            if current is ancestor:
+                return changes
+            changes.update(current._changes)
+            current = current.parent
+        return None
+
+    def _same_content(self, other: Knowledge, path: PurePosixPath) -> bool:
+        mine = self._digests.get(path)
+        theirs = other._digests.get(path)
+        if mine is not None and theirs is not None:
+            return mine[0] == theirs[0]
+        return self[path] == other[path]
+
+    def diff(self, other: Knowledge) -> KnowledgeDelta:
+        """
+        Finds documents that changed between this knowledge and a newer version.
+
+        If one of the two is an ancestor of the other via `parent`, only paths
+        recorded as changed along the lineage are compared. Otherwise all paths
+        are compared. Content is compared by digests when both sides already
+        have them and directly otherwise.
+
+        Args:
+            other: The newer version of the knowledge.
+
+        Returns:
+            Delta that turns this knowledge into `other`.
+        """
+        from llobot.knowledge.deltas import KnowledgeDelta
+        from llobot.knowledge.indexes import KnowledgeIndex
+        if other is self:
+            return KnowledgeDelta()
+        candidates = other._changes_since(self)
+        if candidates is None:
+            candidates = self._changes_since(other)
+        if candidates is None:
+            candidates = {*self.keys(), *other.keys()}
+        added = []
+        removed = []
+        modified = []
+        for path in candidates:
+            if path not in other:
+                if path in self:
+                    removed.append(path)
+            elif path not in self:
+                added.append(path)
+            elif not self._same_content(other, path):
+                modified.append(path)
+        return KnowledgeDelta(added=KnowledgeIndex(added), removed=KnowledgeIndex(removed), modified=KnowledgeIndex(modified))
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Knowledge):
+            return NotImplemented
+        # Subclasses like LazyKnowledge define their own identity.
+        if type(other) is not type(self):
+            return False
+        return len(self) == len(other) and self.digest == other.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
 
     def __repr__(self) -> str:
         return str(self.keys())
 
     def keys(self) -> KnowledgeIndex:
-        """Returns a `KnowledgeIndex` of all paths in the collection."""
+        """
+        Returns a `KnowledgeIndex` of all paths in the collection.
+
+        The index uses path table of this knowledge, so set operations on
+        indexes of related knowledge are fast.
+        """
         from llobot.knowledge.indexes import KnowledgeIndex
-        return KnowledgeIndex(self._documents.keys())
+        return KnowledgeIndex(self._paths(), table=self._table)
 
     def __len__(self) -> int:
-        return len(self._documents)
+        return len(self._selection) if self._selection is not None else len(self._base)
 
     @property
     def cost(self) -> int:
         """The total number of characters in all documents."""
-        return sum(len(content) for content in self._documents.values())
+        return sum(len(content) for _, content in self)
+
+    def size(self, path: PurePosixPath) -> int:
+        """
+        Returns the cost of a document in characters or 0 if it is not present.
+
+        Subclasses that load documents lazily may return an estimate, which
+        lets callers budget documents without loading them.
+        """
+        return len(self._materialized().get(path, ''))
 
     def __bool__(self) -> bool:
-        return bool(self._documents)
+        return len(self) > 0
 
     def __contains__(self, path: PurePosixPath | str) -> bool:
-        return PurePosixPath(path) in self._documents
+        return PurePosixPath(path) in self._materialized()
 
     def __getitem__(self, path: PurePosixPath) -> str:
         """
         Gets the content of a document. Returns an empty string if not found.
         """
-        return self._documents.get(path, '')
+        return self._materialized().get(path, '')
 
     def __iter__(self) -> Iterator[tuple[PurePosixPath, str]]:
-        return iter(self._documents.items())
+        if self._documents is not None:
+            return iter(self._documents.items())
+        base = self._base
+        return ((path, base[path]) for path in self._selection or ())
 
     def transform(self, operation: Callable[[PurePosixPath, str], str]) -> Knowledge:
         """
         Creates a new `Knowledge` object by applying an operation to each document.
         """
-        return Knowledge({path: operation(path, content) for path, content in self})
+        return Knowledge._trusted({path: operation(path, content) for path, content in self}, self._table)
 
     def __and__(self, subset: KnowledgeSubset | str | PurePosixPath | KnowledgeIndex | KnowledgeRanking | KnowledgeScores) -> Knowledge:
         """
@@ -105,13 +361,21 @@ class Knowledge(ValueTypeMixin):
         """
         from llobot.knowledge.subsets import coerce_subset
         subset = coerce_subset(subset)
-        return Knowledge({path: content for path, content in self if path in subset})
+        paths = list(self._paths())
+        selection = list(compress(paths, subset.mask(paths)))
+        if len(selection) == len(paths):
+            return self
+        return self._view(selection)
 
     def __or__(self, addition: Knowledge) -> Knowledge:
         """
         Merges this knowledge with another, overwriting with new content.
         """
-        return Knowledge(self._documents | addition._documents)
+        documents = {path: content for path, content in addition}
+        result = Knowledge._trusted(self._materialized() | documents, self._table)
+        result._parent = weakref.ref(self)
+        result._changes = frozenset(documents)
+        return result._inherit_digests(self, lambda path: path if path not in documents else None)._inherit_digests(addition)
 
     def __sub__(self, subset: KnowledgeSubset | str | PurePosixPath | KnowledgeIndex | PurePosixPath | KnowledgeRanking | KnowledgeScores) -> Knowledge:
         """
@@ -124,8 +388,8 @@ class Knowledge(ValueTypeMixin):
         """
         Creates a new `Knowledge` with a prefix prepended to all paths.
         """
-        prefix = PurePosixPath(prefix)
-        return Knowledge({prefix/path: content for path, content in self})
+        prefix = coerce_path(prefix)
+        return Knowledge._trusted({prefix/path: content for path, content in self})._inherit_digests(self, lambda path: prefix/path)
 
     def __truediv__(self, subtree: PurePosixPath | str) -> Knowledge:
         """
@@ -134,7 +398,9 @@ class Knowledge(ValueTypeMixin):
         Only paths within the `subtree` are kept.
         """
         subtree = PurePosixPath(subtree)
-        return Knowledge({path.relative_to(subtree): content for path, content in self if path.is_relative_to(subtree)})
+        return Knowledge._trusted({path.relative_to(subtree): content for path, content in self if path.is_relative_to(subtree)})._inherit_digests(
+            self, lambda path: path.relative_to(subtree) if path.is_relative_to(subtree) else None
+        )
 
 __all__ = [
     'Knowledge',
@@ -0,0 +1,79 @@
+"""
+Differences between two versions of knowledge.
+
+`KnowledgeDelta` is returned by `Knowledge.diff()`. Crawlers, resolvers, and
+scorers accept it in their `update()` methods, so that they can patch results
+computed for older knowledge instead of starting from scratch.
+"""
+from __future__ import annotations
+from llobot.knowledge.indexes import KnowledgeIndex
+from llobot.utils.values import ValueTypeMixin
+
+class KnowledgeDelta(ValueTypeMixin):
+    """
+    Paths that were added, removed, or modified between two versions of knowledge.
+    """
+    _added: KnowledgeIndex
+    _removed: KnowledgeIndex
+    _modified: KnowledgeIndex
+
+    def __init__(self, *,
+        added: KnowledgeIndex = KnowledgeIndex(),
+        removed: KnowledgeIndex = KnowledgeIndex(),
+        modified: KnowledgeIndex = KnowledgeIndex(),
+    ):
+        """
+        Creates a new delta.
+
+        Args:
+            added: Paths present only in the newer knowledge.
+            removed: Paths present only in the older knowledge.
+            modified: Paths present in both with different content.
+        """
+        self._added = added
+        self._removed = removed
+        self._modified = modified
+
+    def __repr__(self) -> str:
+        return f'KnowledgeDelta(added={self._added}, removed={self._removed}, modified={self._modified})'
+
+    @property
+    def added(self) -> KnowledgeIndex:
+        """Paths present only in the newer knowledge."""
+        return self._added
+
+    @property
+    def removed(self) -> KnowledgeIndex:
+        """Paths present only in the older knowledge."""
+        return self._removed
+
+    @property
+    def modified(self) -> KnowledgeIndex:
+        """Paths present in both with different content."""
+        return self._modified
+
+    @property
+    def changed(self) -> KnowledgeIndex:
+        """All paths that were added, removed, or modified."""
+        return self._added | self._removed | self._modified
+
+    @property
+    def structural(self) -> bool:
+        """Whether the set of paths changed, i.e. some paths were added or removed."""
+        return bool(self._added) or bool(self._removed)
+
+    def __len__(self) -> int:
+        return len(self._added) + len(self._removed) + len(self._modified)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def reversed(self) -> KnowledgeDelta:
+        """
+        Returns the delta in the opposite direction, from the newer to the older knowledge.
+        """
+        return KnowledgeDelta(added=self._removed, removed=self._added, modified=self._modified)
+
+__all__ = [
+    'KnowledgeDelta',
+]
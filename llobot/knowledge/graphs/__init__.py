@@ -16,6 +16,10 @@ chain
     `KnowledgeCrawlerChain` for combining crawlers.
 dummy
     `DummyCrawler` for a no-op crawler.
+references
+    `ReferenceCrawler` base with a persistent cache of extracted references.
+parallel
+    `CrawlPool` for parsing documents in worker processes.
 overview
     Crawler that links documents to overview files.
 java
@@ -26,19 +30,30 @@ rust
     Crawlers for Rust source code.
 """
 from __future__ import annotations
+from array import array
+import itertools
 from pathlib import PurePosixPath
-from typing import Iterator
-from llobot.utils.values import ValueTypeMixin
+from typing import Iterable, Iterator
 from llobot.knowledge.indexes import KnowledgeIndex
 
-class KnowledgeGraph(ValueTypeMixin):
+class KnowledgeGraph:
     """
     An immutable directed graph where nodes are `pathlib.PurePosixPath` objects.
 
-    The graph is represented as a dictionary mapping source nodes to a
-    `KnowledgeIndex` of their target nodes.
+    The graph is stored in compressed sparse row (CSR) form. Nodes are
+    numbered by their position in `paths`. Targets of node `i` are IDs in
+    `targets[offsets[i]:offsets[i + 1]]`, sorted in ascending order. The
+    node table may contain nodes without any links. They are not part of
+    the graph's value and they are not reported as sources.
+
+    Graphs derived via `reverse()` share the node table with the original,
+    so that algorithms like PageRank can use both without renumbering nodes.
     """
-    _graph: dict[PurePosixPath, KnowledgeIndex]
+    _paths: tuple[PurePosixPath, ...]
+    _offsets: array[int]
+    _targets: array[int]
+    _ids: dict[PurePosixPath, int] | None
+    _hash: int | None
 
     def __init__(self, graph: dict[PurePosixPath, KnowledgeIndex] = {}):
         """
@@ -46,24 +61,123 @@ class KnowledgeGraph(ValueTypeMixin):
 
         Args:
             graph: A dictionary representing the graph's adjacency list.
+                   Sources without targets are dropped.
+        """
+        ids: dict[PurePosixPath, int] = {}
+        for source, targets in graph.items():
+            if targets:
+                ids.setdefault(source, len(ids))
+        for targets in graph.values():
+            for target in targets:
+                ids.setdefault(target, len(ids))
+        adjacency = [set() for _ in ids]
+        for source, targets in graph.items():
+            if targets:
+                adjacency[ids[source]].update(map(ids.__getitem__, targets))
+        self._init(tuple(ids), adjacency)
+        self._ids = ids
+
+    def _init(self, paths: tuple[PurePosixPath, ...], adjacency: list[set[int]]):
+        self._paths = paths
+        self._offsets = array('i', [0])
+        self._offsets.extend(itertools.accumulate(len(targets) for targets in adjacency))
+        self._targets = array('i', itertools.chain.from_iterable(sorted(targets) for targets in adjacency))
+        self._ids = None
+        self._hash = None
+
+    @staticmethod
+    def _csr(paths: tuple[PurePosixPath, ...], offsets: array[int], targets: array[int], ids: dict[PurePosixPath, int] | None = None) -> KnowledgeGraph:
+        """
+        Wraps CSR arrays without copying. Targets of every node must be sorted and unique.
+        """
+        result = KnowledgeGraph.__new__(KnowledgeGraph)
+        result._paths = paths
+        result._offsets = offsets
+        result._targets = targets
+        result._ids = ids
+        result._hash = None
+        return result
+
+    @staticmethod
+    def from_ids(paths: tuple[PurePosixPath, ...], adjacency: list[set[int]]) -> KnowledgeGraph:
+        """
+        Creates a graph from a node table and target IDs of every node.
+
+        This skips path hashing, which makes it the fast path for builders
+        that number nodes themselves.
+
+        Args:
+            paths: Node table. Nodes are identified by their position in it.
+            adjacency: Target IDs for every node in the node table.
         """
-        self._graph = graph
+        result = KnowledgeGraph.__new__(KnowledgeGraph)
+        result._init(paths, adjacency)
+        return result
+
+    @property
+    def paths(self) -> tuple[PurePosixPath, ...]:
+        """Node table mapping node IDs to paths."""
+        return self._paths
+
+    @property
+    def offsets(self) -> array[int]:
+        """Offsets of every node's targets in `targets`, one more than there are nodes."""
+        return self._offsets
+
+    @property
+    def targets(self) -> array[int]:
+        """Target IDs of all links, grouped by source."""
+        return self._targets
+
+    def _id_table(self) -> dict[PurePosixPath, int]:
+        if self._ids is None:
+            self._ids = {path: id for id, path in enumerate(self._paths)}
+        return self._ids
+
+    def _source_ids(self) -> Iterator[int]:
+        offsets = self._offsets
+        return (id for id in range(len(self._paths)) if offsets[id] != offsets[id + 1])
+
+    def _target_ids(self, id: int) -> array[int]:
+        return self._targets[self._offsets[id]:self._offsets[id + 1]]
+
+    def _adjacency(self) -> dict[PurePosixPath, frozenset[PurePosixPath]]:
+        paths = self._paths
+        return {paths[id]: frozenset(map(paths.__getitem__, self._target_ids(id))) for id in self._source_ids()}
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, KnowledgeGraph):
+            return NotImplemented
+        if len(self._targets) != len(other._targets) or hash(self) != hash(other):
+            return False
+        if self._paths is other._paths:
+            return self._offsets == other._offsets and self._targets == other._targets
+        return self._adjacency() == other._adjacency()
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._adjacency().items()))
+        return self._hash
 
     def __repr__(self) -> str:
-        return str(self._graph)
+        return str({source: targets for source, targets in self})
 
     def keys(self) -> KnowledgeIndex:
         """Returns a `KnowledgeIndex` of all source nodes in the graph."""
-        return KnowledgeIndex(self._graph.keys())
+        return KnowledgeIndex(map(self._paths.__getitem__, self._source_ids()))
 
     def __len__(self) -> int:
-        return len(self._graph)
+        offsets = self._offsets
+        return sum(1 for id in range(len(self._paths)) if offsets[id] != offsets[id + 1])
 
     def __bool__(self) -> bool:
-        return bool(self._graph)
+        return bool(self._targets)
 
     def __contains__(self, source: PurePosixPath) -> bool:
-        return source in self._graph
+        id = self._id_table().get(source)
+        return id is not None and self._offsets[id] != self._offsets[id + 1]
 
     def __getitem__(self, source: PurePosixPath) -> KnowledgeIndex:
         """
@@ -71,10 +185,15 @@ class KnowledgeGraph(ValueTypeMixin):
 
         Returns an empty index if the source node is not in the graph.
         """
-        return self._graph.get(source, KnowledgeIndex())
+        id = self._id_table().get(source)
+        if id is None:
+            return KnowledgeIndex()
+        return KnowledgeIndex(map(self._paths.__getitem__, self._target_ids(id)))
 
     def __iter__(self) -> Iterator[tuple[PurePosixPath, KnowledgeIndex]]:
-        return iter(self._graph.items())
+        paths = self._paths
+        for id in self._source_ids():
+            yield paths[id], KnowledgeIndex(map(paths.__getitem__, self._target_ids(id)))
 
     def links(self) -> Iterator[tuple[PurePosixPath, PurePosixPath]]:
         """
@@ -83,31 +202,71 @@ class KnowledgeGraph(ValueTypeMixin):
         Yields:
             A tuple of (source, target) for each link.
         """
-        for source, targets in self:
-            for target in targets:
-                yield source, target
+        paths = self._paths
+        for id in self._source_ids():
+            source = paths[id]
+            for target in self._target_ids(id):
+                yield source, paths[target]
 
     def __or__(self, other: KnowledgeGraph) -> KnowledgeGraph:
         """
         Merges this graph with another, returning the union of their links.
+
+        Target IDs of the other graph are renumbered in bulk. Links are then
+        merged per node rather than per link.
         """
-        from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
-        builder = KnowledgeGraphBuilder()
-        for source, target in self.links():
-            builder.add(source, target)
-        for source, target in other.links():
-            builder.add(source, target)
-        return builder.build()
+        if not other._targets:
+            return self
+        if not self._targets:
+            return other
+        if other._paths is self._paths:
+            paths = self._paths
+            ids = self._ids
+            sources = list(range(len(paths)))
+            renumbered = other._targets
+        else:
+            ids = dict(self._id_table())
+            for path in other._paths:
+                ids.setdefault(path, len(ids))
+            paths = tuple(ids)
+            sources = list(map(ids.__getitem__, other._paths))
+            renumbered = array('i', map(sources.__getitem__, other._targets))
+        adjacency: list[set[int]] = [set() for _ in paths]
+        offsets = self._offsets
+        targets = self._targets
+        for id in self._source_ids():
+            adjacency[id].update(targets[offsets[id]:offsets[id + 1]])
+        offsets = other._offsets
+        for id in other._source_ids():
+            adjacency[sources[id]].update(renumbered[offsets[id]:offsets[id + 1]])
+        result = KnowledgeGraph.from_ids(paths, adjacency)
+        result._ids = ids
+        return result
 
     def reverse(self) -> KnowledgeGraph:
         """
         Returns a new graph with all links reversed.
+
+        Links are reversed with a counting sort in O(E). The reversed graph
+        shares the node table with this graph.
         """
-        from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
-        builder = KnowledgeGraphBuilder()
-        for source, target in self.links():
-            builder.add(target, source)
-        return builder.build()
+        count = len(self._paths)
+        degrees = [0] * count
+        for target in self._targets:
+            degrees[target] += 1
+        offsets = array('i', [0])
+        offsets.extend(itertools.accumulate(degrees))
+        positions = offsets.tolist()
+        reversed_targets = array('i', [0]) * len(self._targets)
+        source_offsets = self._offsets
+        targets = self._targets
+        # Sources are visited in ascending order, so targets of every node in the reversed graph come out sorted.
+        for source in range(count):
+            for index in range(source_offsets[source], source_offsets[source + 1]):
+                target = targets[index]
+                reversed_targets[positions[target]] = source
+                positions[target] += 1
+        return KnowledgeGraph._csr(self._paths, offsets, reversed_targets, self._ids)
 
     def symmetrical(self) -> KnowledgeGraph:
         """
@@ -2,20 +2,47 @@
 A mutable builder for `KnowledgeGraph`.
 """
 from __future__ import annotations
-from collections import defaultdict
 from pathlib import PurePosixPath
 from llobot.knowledge.graphs import KnowledgeGraph
-from llobot.knowledge.indexes import KnowledgeIndex
 
 class KnowledgeGraphBuilder:
     """
     A mutable builder for constructing `KnowledgeGraph` instances.
+
+    Paths are numbered as they are added, so that `build()` can emit CSR
+    arrays directly. A builder seeded from a graph adopts its node table.
     """
-    _graph: defaultdict[PurePosixPath, set[PurePosixPath]]
+    _paths: list[PurePosixPath]
+    _ids: dict[PurePosixPath, int]
+    _links: dict[int, set[int]]
+
+    def __init__(self, graph: KnowledgeGraph | None = None):
+        """
+        Initializes a `KnowledgeGraphBuilder`.
+
+        Args:
+            graph: Optional graph whose links are copied into the builder,
+                   so that it can be patched incrementally.
+        """
+        self._paths = []
+        self._ids = {}
+        self._links = {}
+        if graph is not None:
+            self._paths = list(graph.paths)
+            self._ids = {path: id for id, path in enumerate(self._paths)}
+            offsets = graph.offsets
+            targets = graph.targets
+            for id in range(len(self._paths)):
+                if offsets[id] != offsets[id + 1]:
+                    self._links[id] = set(targets[offsets[id]:offsets[id + 1]])
 
-    def __init__(self):
-        """Initializes an empty `KnowledgeGraphBuilder`."""
-        self._graph = defaultdict(set)
+    def _intern(self, path: PurePosixPath) -> int:
+        id = self._ids.get(path)
+        if id is None:
+            id = len(self._paths)
+            self._ids[path] = id
+            self._paths.append(path)
+        return id
 
     def add(self, source: PurePosixPath, target: PurePosixPath):
         """
@@ -28,13 +55,30 @@ class KnowledgeGraphBuilder:
             target: The target node.
         """
         if source != target:
-            self._graph[source].add(target)
+            source_id = self._intern(source)
+            targets = self._links.get(source_id)
+            if targets is None:
+                targets = self._links[source_id] = set()
+            targets.add(self._intern(target))
+
+    def remove(self, source: PurePosixPath):
+        """
+        Removes all links from the given source node.
+
+        Args:
+            source: The source node.
+        """
+        id = self._ids.get(source)
+        if id is not None:
+            self._links.pop(id, None)
 
     def build(self) -> KnowledgeGraph:
         """
         Constructs an immutable `KnowledgeGraph` from the current state.
         """
-        return KnowledgeGraph({path: KnowledgeIndex(targets) for path, targets in self._graph.items()})
+        empty = set()
+        adjacency = [self._links.get(id, empty) for id in range(len(self._paths))]
+        return KnowledgeGraph.from_ids(tuple(self._paths), adjacency)
 
 __all__ = [
     'KnowledgeGraphBuilder',
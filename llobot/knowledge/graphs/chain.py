@@ -2,30 +2,51 @@
 A crawler that is a chain of other crawlers.
 """
 from __future__ import annotations
+from collections import defaultdict
 from functools import lru_cache
+import threading
+import weakref
+from pathlib import PurePosixPath
+from typing import Iterable
 from llobot.utils.values import ValueTypeMixin
 from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
 from llobot.knowledge.graphs import KnowledgeGraph
+from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
 from llobot.knowledge.graphs.crawler import KnowledgeCrawler
+from llobot.knowledge.subsets import KnowledgeSubset
+from llobot.knowledge.subsets.empty import EmptySubset
+from llobot.knowledge.subsets.suffix import SuffixSubset
+from llobot.knowledge.subsets.union import UnionSubset
+from llobot.knowledge.subsets.universal import UniversalSubset
+
+# Number of recent crawls per chain that newer knowledge can be crawled incrementally from.
+_HISTORY_SIZE = 4
 
 @lru_cache(maxsize=2)
 def _crawl_cached(chain: 'KnowledgeCrawlerChain', knowledge: Knowledge) -> KnowledgeGraph:
     """
     Cached execution of a crawler chain.
     """
-    graph = KnowledgeGraph()
-    for crawler in chain._crawlers:
-        graph |= crawler.crawl(knowledge)
-    return graph
+    return chain._crawl_incrementally(knowledge)
 
 class KnowledgeCrawlerChain(KnowledgeCrawler, ValueTypeMixin):
     """
-    A crawler that runs several crawlers in sequence and merges their graphs.
+    A crawler that runs several crawlers and collects their links in one graph.
+
+    Documents are partitioned once by suffix and every crawler receives only
+    documents in its `KnowledgeCrawler.subset`. All crawlers write into one
+    shared builder.
 
     The results of the `crawl` method are cached based on the chain's value
-    and the knowledge base.
+    and the knowledge base. The chain also remembers graphs of a few recently
+    crawled versions of knowledge to crawl their descendants incrementally.
+    Crawled knowledge is referenced weakly, so the chain does not keep it alive.
     """
     _crawlers: tuple[KnowledgeCrawler, ...]
+    _lock: threading.Lock
+    # Weakly referenced recently crawled knowledge with its graph, most recent last.
+    _history: list[tuple[weakref.ref[Knowledge], KnowledgeGraph]]
 
     def __init__(self, *crawlers: KnowledgeCrawler):
         """
@@ -42,18 +63,113 @@ class KnowledgeCrawlerChain(KnowledgeCrawler, ValueTypeMixin):
             else:
                 flattened.append(crawler)
         self._crawlers = tuple(flattened)
+        self._lock = threading.Lock()
+        self._history = []
+
+    def _ephemeral_fields(self) -> Iterable[str]:
+        return ['_lock', '_history']
+
+    @property
+    def crawlers(self) -> tuple[KnowledgeCrawler, ...]:
+        """Crawlers in the chain."""
+        return self._crawlers
+
+    @property
+    def subset(self) -> KnowledgeSubset:
+        """
+        Union of subsets of all crawlers in the chain.
+        """
+        subsets = list(dict.fromkeys(crawler.subset for crawler in self._crawlers))
+        if not subsets:
+            return EmptySubset()
+        if len(subsets) == 1:
+            return subsets[0]
+        return UnionSubset(*subsets)
+
+    def crawl_into(self, knowledge: Knowledge, sources: list[PurePosixPath], builder: KnowledgeGraphBuilder):
+        """
+        Dispatches documents to interested crawlers, which write into the shared builder.
+
+        Documents are grouped by suffix once. Partitions for suffix subsets
+        are assembled from the groups. Other subsets are evaluated once per
+        distinct subset.
+        """
+        by_suffix: dict[str, list[PurePosixPath]] | None = None
+        partitions: dict[KnowledgeSubset, list[PurePosixPath]] = {}
+        for crawler in self._crawlers:
+            subset = crawler.subset
+            partition = partitions.get(subset)
+            if partition is None:
+                if isinstance(subset, UniversalSubset):
+                    partition = sources
+                elif isinstance(subset, SuffixSubset):
+                    if by_suffix is None:
+                        by_suffix = defaultdict(list)
+                        for path in sources:
+                            by_suffix[path.suffix].append(path)
+                    partition = [path for suffix in subset.suffixes for path in by_suffix.get(suffix, ())]
+                else:
+                    partition = subset.filter(sources)
+                partitions[subset] = partition
+            if partition or isinstance(subset, UniversalSubset):
+                crawler.crawl_into(knowledge, partition, builder)
+
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, graph: KnowledgeGraph) -> KnowledgeGraph:
+        """
+        Re-crawls only modified documents if no documents were added or removed.
+
+        Links of modified documents are removed from the graph and crawled
+        again by all interested crawlers into one shared builder. Adding or
+        removing documents can change how links of unchanged documents
+        resolve, so such changes are crawled from scratch.
+        """
+        if delta.structural:
+            builder = KnowledgeGraphBuilder()
+            self.crawl_into(knowledge, list(knowledge.keys()), builder)
+            return builder.build()
+        builder = KnowledgeGraphBuilder(graph)
+        for path in delta.modified:
+            builder.remove(path)
+        self.crawl_into(knowledge, list(delta.modified), builder)
+        return builder.build()
+
+    def _crawl_incrementally(self, knowledge: Knowledge) -> KnowledgeGraph:
+        """
+        Crawls knowledge, updating the graph of its nearest recently crawled ancestor if there is one.
+        """
+        with self._lock:
+            history = list(self._history)
+        base = None
+        ancestor = knowledge
+        while base is None and ancestor is not None:
+            known = next((graph for reference, graph in reversed(history) if reference() is ancestor), None)
+            base = (ancestor, known) if known is not None else None
+            ancestor = ancestor.parent
+        if base is not None:
+            graph = self.update(knowledge, base[0].diff(knowledge), base[1])
+        else:
+            builder = KnowledgeGraphBuilder()
+            self.crawl_into(knowledge, list(knowledge.keys()), builder)
+            graph = builder.build()
+        with self._lock:
+            # Drop entries for knowledge that is gone or that is crawled again.
+            alive = [(reference, known) for reference, known in self._history if (crawled := reference()) is not None and crawled is not knowledge]
+            self._history = alive[-(_HISTORY_SIZE - 1):] + [(weakref.ref(knowledge), graph)]
+        return graph
 
     def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
         """
         Crawls the knowledge base using all crawlers in the chain.
 
-        The execution is cached.
+        The execution is cached. If an ancestor of the knowledge (see
+        `Knowledge.parent`) was crawled recently and no documents were added
+        or removed since, only modified documents are crawled again.
 
         Args:
             knowledge: The knowledge base to crawl.
 
         Returns:
-            The merged `KnowledgeGraph` from all crawlers.
+            The `KnowledgeGraph` with links from all crawlers.
         """
         return _crawl_cached(self, knowledge)
 
@@ -3,8 +3,13 @@ Base `KnowledgeCrawler` and standard crawler implementations.
 """
 from __future__ import annotations
 from functools import cache
+from pathlib import PurePosixPath
 from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
 from llobot.knowledge.graphs import KnowledgeGraph
+from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
+from llobot.knowledge.subsets import KnowledgeSubset
+from llobot.knowledge.subsets.universal import UniversalSubset
 
 class KnowledgeCrawler:
     """
@@ -12,7 +17,22 @@ class KnowledgeCrawler:
 
     A crawler defines a method to create a `KnowledgeGraph` from a
     `Knowledge` base. Crawlers can be chained using the `|` operator.
+
+    Links from a document may depend on its path and content and on paths of
+    other documents, but not on content of other documents. Crawlers can be
+    then asked to link from only some documents via `crawl_into()`, which
+    chains use to dispatch documents and to crawl changed documents again.
     """
+    @property
+    def subset(self) -> KnowledgeSubset:
+        """
+        Documents this crawler links from.
+
+        Chains pass only documents in this subset to `crawl_into()`.
+        Defaults to all documents.
+        """
+        return UniversalSubset()
+
     def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
         """
         Creates a graph for the given knowledge.
@@ -25,6 +45,44 @@ class KnowledgeCrawler:
         """
         return KnowledgeGraph()
 
+    def crawl_into(self, knowledge: Knowledge, sources: list[PurePosixPath], builder: KnowledgeGraphBuilder):
+        """
+        Adds links from the given documents into a shared builder.
+
+        The default implementation crawls the whole knowledge and copies
+        links of the requested documents. Links from paths that are not in
+        the knowledge cannot be requested, so they are always copied.
+        Crawlers override this method to avoid building their own graph.
+
+        Args:
+            knowledge: The knowledge base to crawl.
+            sources: Paths of documents to link from, all in `subset`.
+            builder: Builder that receives the links.
+        """
+        graph = self.crawl(knowledge)
+        wanted = set(sources)
+        for source, targets in graph:
+            if source in wanted or source not in knowledge:
+                for target in targets:
+                    builder.add(source, target)
+
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, graph: KnowledgeGraph) -> KnowledgeGraph:
+        """
+        Updates a graph crawled from older knowledge to match newer knowledge.
+
+        The default implementation crawls the new knowledge from scratch.
+        Crawlers override it to re-crawl only the changed documents.
+
+        Args:
+            knowledge: The newer knowledge.
+            delta: Changes from the older knowledge to `knowledge`.
+            graph: Graph this crawler produced for the older knowledge.
+
+        Returns:
+            The same graph as `crawl(knowledge)` would return.
+        """
+        return self.crawl(knowledge)
+
     def __or__(self, other: KnowledgeCrawler) -> KnowledgeCrawler:
         """
         Chains this crawler with another one.
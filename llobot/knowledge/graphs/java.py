@@ -5,12 +5,14 @@ from __future__ import annotations
 from functools import cache
 import re
 from pathlib import PurePosixPath
+from typing import Iterable
 from llobot.utils.values import ValueTypeMixin
 from llobot.knowledge import Knowledge
-from llobot.knowledge.graphs import KnowledgeGraph
-from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
 from llobot.knowledge.graphs.crawler import KnowledgeCrawler
-from llobot.knowledge.resolver import cached_knowledge_resolver
+from llobot.knowledge.graphs.references import ReferenceCrawler
+from llobot.knowledge.resolver import KnowledgeResolver
+from llobot.knowledge.subsets import KnowledgeSubset
+from llobot.knowledge.subsets.suffix import SuffixSubset
 
 @cache
 def standard_java_crawler() -> KnowledgeCrawler:
@@ -21,7 +23,7 @@ def standard_java_crawler() -> KnowledgeCrawler:
     """
     return JavaPascalCaseCrawler()
 
-class JavaPascalCaseCrawler(KnowledgeCrawler, ValueTypeMixin):
+class JavaPascalCaseCrawler(ReferenceCrawler, ValueTypeMixin):
     """
     Crawls Java files for PascalCase identifiers and links them to corresponding files.
     """
@@ -30,31 +32,19 @@ class JavaPascalCaseCrawler(KnowledgeCrawler, ValueTypeMixin):
     _string_re = re.compile(r'"(?:[^"\\]|\\.)*"')
     _pattern = re.compile(r'\b[A-Z][A-Za-z0-9]*\b')
 
-    def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
-        """
-        Crawls Java files in the knowledge base.
+    @property
+    def subset(self) -> KnowledgeSubset:
+        return SuffixSubset('.java')
 
-        Args:
-            knowledge: The knowledge base to crawl.
+    def _extract(self, path: PurePosixPath, content: str) -> Iterable[str]:
+        content = self._comment_re.sub(' ', content)
+        content = self._text_block_re.sub(' ', content)
+        content = self._string_re.sub(' ', content)
+        # Require at least one lowercase letter to avoid matching enums and constants.
+        return [name for name in self._pattern.findall(content) if not name.isupper()]
 
-        Returns:
-            A `KnowledgeGraph` with links from Java files to other files.
-        """
-        builder = KnowledgeGraphBuilder()
-        resolver = cached_knowledge_resolver(knowledge)
-        for path, content in knowledge:
-            if path.suffix == '.java':
-                content = self._comment_re.sub(' ', content)
-                content = self._text_block_re.sub(' ', content)
-                content = self._string_re.sub(' ', content)
-                names = set(self._pattern.findall(content))
-                for name in names:
-                    # Require at least one lowercase letter to avoid matching enums and constants.
-                    if not name.isupper():
-                        target = resolver.resolve_near(path, PurePosixPath(f'{name}.java'))
-                        if target:
-                            builder.add(path, target)
-        return builder.build()
+    def _resolve(self, knowledge: Knowledge, resolver: KnowledgeResolver, path: PurePosixPath, reference: str) -> PurePosixPath | None:
+        return resolver.resolve_near(path, PurePosixPath(f'{reference}.java'))
 
 __all__ = [
     'standard_java_crawler',
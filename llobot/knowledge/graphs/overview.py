@@ -2,8 +2,10 @@
 Crawler that links files to the nearest overview files.
 """
 from __future__ import annotations
+from pathlib import PurePosixPath
 from llobot.utils.values import ValueTypeMixin
 from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
 from llobot.knowledge.graphs import KnowledgeGraph
 from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
 from llobot.knowledge.graphs.crawler import KnowledgeCrawler
@@ -39,6 +41,16 @@ class OverviewCrawler(KnowledgeCrawler, ValueTypeMixin):
             A `KnowledgeGraph` with links to overview files.
         """
         builder = KnowledgeGraphBuilder()
+        self._link(knowledge, None, builder)
+        return builder.build()
+
+    def crawl_into(self, knowledge: Knowledge, sources: list[PurePosixPath], builder: KnowledgeGraphBuilder):
+        """
+        Links the given files to overview files in a shared builder.
+        """
+        self._link(knowledge, None if len(sources) == len(knowledge) else set(sources), builder)
+
+    def _link(self, knowledge: Knowledge, wanted: set[PurePosixPath] | None, builder: KnowledgeGraphBuilder):
         tree = coerce_tree(knowledge)
         seen = set()
 
@@ -54,12 +66,21 @@ class OverviewCrawler(KnowledgeCrawler, ValueTypeMixin):
                 sources = regular_sources + overview_sources
 
                 for source in sources:
-                    if source not in seen:
+                    if source not in seen and (wanted is None or source in wanted):
                         for target in targets:
                             builder.add(source, target)
 
                 seen.update(sources)
-        return builder.build()
+
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, graph: KnowledgeGraph) -> KnowledgeGraph:
+        """
+        Reuses the graph if no files were added or removed.
+
+        Links depend only on paths, not on content.
+        """
+        if delta.structural:
+            return self.crawl(knowledge)
+        return graph
 
 __all__ = [
     'OverviewCrawler',
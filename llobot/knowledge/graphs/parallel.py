@@ -0,0 +1,146 @@
+"""
+Process pool for parallel crawling.
+
+Regex crawling is CPU-bound, so threads do not help under the GIL.
+`CrawlPool` shards work across a lazily started `ProcessPoolExecutor`.
+Small batches stay in the calling process, because shipping documents to
+workers then costs more than parsing them.
+
+The standard pool is serial. Parallel crawling is opt-in by passing
+`CrawlPool()` to crawlers, for example `PythonImportsCrawler(pool=CrawlPool())`.
+Worker processes import the main module, so scripts that opt in must guard
+their entry point with `if __name__ == '__main__'`. Without the guard, every
+worker runs the script's top-level code again and the pool breaks.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cache
+import logging
+import multiprocessing
+from multiprocessing.context import BaseContext
+import os
+import pickle
+import threading
+from typing import Callable
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_PARALLEL_THRESHOLD = 1000
+
+# Every worker receives a few chunks, so that uneven chunks do not leave workers idle.
+_CHUNKS_PER_WORKER = 4
+
+class CrawlPool:
+    """
+    Lazily started process pool that maps functions over chunks of items.
+
+    Results are always returned in the order of items, so that graphs built
+    from them do not depend on scheduling. If the pool cannot be used, for
+    example because the function is not picklable or workers crash, the
+    work is done serially in the calling process.
+    """
+    _workers: int
+    _threshold: int
+    _context: BaseContext | None
+    _lock: threading.Lock
+    _executor: ProcessPoolExecutor | None
+
+    def __init__(self, *,
+        workers: int | None = None,
+        threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+        context: BaseContext | None = None,
+    ):
+        """
+        Creates a new pool. Worker processes are started on first parallel use.
+
+        Args:
+            workers: Number of worker processes. Defaults to the number of
+                     CPUs available to the process. Values below 2 disable
+                     parallelism.
+            threshold: Minimum number of items that are processed in parallel.
+            context: Multiprocessing context. Defaults to `forkserver` where
+                     available, because forking a process that runs other
+                     threads may deadlock the child. Contexts other than
+                     `fork` import the main module in workers, so scripts
+                     must guard their entry point with `if __name__ == '__main__'`.
+        """
+        self._workers = workers if workers is not None else (os.process_cpu_count() or 1)
+        self._threshold = threshold
+        if context is None and 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+        self._context = context
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def workers(self) -> int:
+        """Number of worker processes."""
+        return self._workers
+
+    @property
+    def threshold(self) -> int:
+        """Minimum number of items that are processed in parallel."""
+        return self._threshold
+
+    def map[T, R](self, function: Callable[[list[T]], list[R]], items: list[T]) -> list[R]:
+        """
+        Applies a function to chunks of items and concatenates the results.
+
+        Args:
+            function: Picklable function that returns one result per item.
+            items: Picklable items.
+
+        Returns:
+            Results in the order of items.
+        """
+        if len(items) < self._threshold or self._workers < 2:
+            return function(items)
+        # Executor fails to shut down cleanly after pickling errors, so the function is checked upfront.
+        try:
+            pickle.dumps(function)
+        except (pickle.PicklingError, AttributeError, TypeError) as ex:
+            _logger.warning(f'Cannot send function to crawl workers, continuing serially: {ex!r}')
+            return function(items)
+        count = min(len(items), self._workers * _CHUNKS_PER_WORKER)
+        size = -(-len(items) // count)
+        chunks = [items[start:start + size] for start in range(0, len(items), size)]
+        try:
+            results = list(self._pool().map(function, chunks))
+        except (BrokenProcessPool, OSError) as ex:
+            _logger.warning(f'Parallel crawling failed, continuing serially: {ex!r}')
+            self.shutdown()
+            return function(items)
+        return [result for chunk in results for result in chunk]
+
+    def shutdown(self):
+        """
+        Stops worker processes. They are started again when needed.
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._workers, mp_context=self._context)
+            return self._executor
+
+@cache
+def standard_crawl_pool() -> CrawlPool:
+    """
+    Returns the process-wide crawl pool, which crawls serially in the calling process.
+
+    Process pools require scripts to guard their entry point (see module
+    documentation), so they are not used unless requested explicitly.
+    """
+    return CrawlPool(workers=1)
+
+__all__ = [
+    'DEFAULT_PARALLEL_THRESHOLD',
+    'CrawlPool',
+    'standard_crawl_pool',
+]
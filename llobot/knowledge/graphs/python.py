@@ -5,12 +5,14 @@ from __future__ import annotations
 from functools import cache
 import re
 from pathlib import PurePosixPath
+from typing import Iterable
 from llobot.utils.values import ValueTypeMixin
 from llobot.knowledge import Knowledge
-from llobot.knowledge.graphs import KnowledgeGraph
-from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
 from llobot.knowledge.graphs.crawler import KnowledgeCrawler
-from llobot.knowledge.resolver import KnowledgeResolver, cached_knowledge_resolver
+from llobot.knowledge.graphs.references import ReferenceCrawler
+from llobot.knowledge.resolver import KnowledgeResolver
+from llobot.knowledge.subsets import KnowledgeSubset
+from llobot.knowledge.subsets.suffix import SuffixSubset
 
 def _python_module_paths(module: str) -> tuple[PurePosixPath, PurePosixPath]:
     """
@@ -89,53 +91,47 @@ def _resolve_python_module(knowledge: Knowledge, source: PurePosixPath, module:
         py_path, init_path = _python_module_paths(module)
         return resolver.resolve_near(source, py_path, init_path)
 
+class _PythonCrawler(ReferenceCrawler):
+    """
+    Base class for Python crawlers, which extract references from `.py` files.
+    """
+    @property
+    def subset(self) -> KnowledgeSubset:
+        return SuffixSubset('.py')
+
+    def _resolve(self, knowledge: Knowledge, resolver: KnowledgeResolver, path: PurePosixPath, reference: str) -> PurePosixPath | None:
+        return _resolve_python_module(knowledge, path, reference, resolver)
+
 @cache
 def standard_python_crawler() -> KnowledgeCrawler:
     """
     Returns the standard crawler for Python.
 
-    The standard Python crawler handles simple, `from`, and item imports.
+    The standard Python crawler handles simple, `from`, and item imports
+    in a single pass over every file.
     """
-    return PythonSimpleImportsCrawler() | PythonFromImportsCrawler() | PythonItemImportsCrawler()
+    return PythonImportsCrawler()
 
-class PythonSimpleImportsCrawler(KnowledgeCrawler, ValueTypeMixin):
+class PythonSimpleImportsCrawler(_PythonCrawler, ValueTypeMixin):
     """
     Crawls Python files for simple `import module` statements.
     """
     _pattern = re.compile(r'^ *import ([\w_]+(?:\.[\w_]+)*)', re.MULTILINE)
 
-    def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
-        builder = KnowledgeGraphBuilder()
-        resolver = cached_knowledge_resolver(knowledge)
-        for path, content in knowledge:
-            if path.suffix == '.py':
-                for module in self._pattern.findall(content):
-                    # Simple imports cannot be relative, so use resolver directly
-                    py_path, init_path = _python_module_paths(module)
-                    target = resolver.resolve_near(path, py_path, init_path)
-                    if target:
-                        builder.add(path, target)
-        return builder.build()
-
-class PythonFromImportsCrawler(KnowledgeCrawler, ValueTypeMixin):
+    def _extract(self, path: PurePosixPath, content: str) -> Iterable[str]:
+        # Simple imports cannot be relative, so they are always resolved by the resolver.
+        return self._pattern.findall(content)
+
+class PythonFromImportsCrawler(_PythonCrawler, ValueTypeMixin):
     """
     Crawls Python files for `from module import ...` statements.
     """
     _pattern = re.compile(r'^ *from ([\.\w_]+) import', re.MULTILINE)
 
-    def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
-        builder = KnowledgeGraphBuilder()
-        resolver = cached_knowledge_resolver(knowledge)
-        for path, content in knowledge:
-            if path.suffix == '.py':
-                modules = set(self._pattern.findall(content))
-                for module in modules:
-                    target = _resolve_python_module(knowledge, path, module, resolver)
-                    if target:
-                        builder.add(path, target)
-        return builder.build()
+    def _extract(self, path: PurePosixPath, content: str) -> Iterable[str]:
+        return self._pattern.findall(content)
 
-class PythonItemImportsCrawler(KnowledgeCrawler, ValueTypeMixin):
+class PythonItemImportsCrawler(_PythonCrawler, ValueTypeMixin):
     """
     Crawls Python `from module import item` statements where `item` is a submodule.
     """
@@ -143,28 +139,51 @@ class PythonItemImportsCrawler(KnowledgeCrawler, ValueTypeMixin):
     _multiline_re = re.compile(r'^ *from ([\.\w_]*) import +\(\s*([\w_.]+(?: as [\w_]+)?(?:,\s*[\w_.]+(?: as [\w_]+)?)*)', re.MULTILINE)
     _item_re = re.compile(r'([\w_.]+)(?: as [\w_]+)?')
 
-    def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
-        builder = KnowledgeGraphBuilder()
-        resolver = cached_knowledge_resolver(knowledge)
-        for path, content in knowledge:
-            if path.suffix == '.py':
-                for module, items in self._from_re.findall(content) + self._multiline_re.findall(content):
-                    for item in self._item_re.findall(items):
-                        # Try to resolve as a module first (item could be a submodule)
-                        if module == '.':
-                            base_module = f'.{item}'
-                        elif module:
-                            base_module = f'{module}.{item}'
-                        else:
-                            # from import x is not valid python
-                            continue
-                        target = _resolve_python_module(knowledge, path, base_module, resolver)
-                        if target:
-                            builder.add(path, target)
-        return builder.build()
+    def _extract(self, path: PurePosixPath, content: str) -> Iterable[str]:
+        for module, items in self._from_re.findall(content) + self._multiline_re.findall(content):
+            for item in self._item_re.findall(items):
+                # Try to resolve as a module first (item could be a submodule)
+                if module == '.':
+                    yield f'.{item}'
+                elif module:
+                    yield f'{module}.{item}'
+                # from import x is not valid python
+
+class PythonImportsCrawler(_PythonCrawler, ValueTypeMixin):
+    """
+    Crawls Python files for all import forms in a single regex pass.
+
+    It produces the same graph as the chain of `PythonSimpleImportsCrawler`,
+    `PythonFromImportsCrawler`, and `PythonItemImportsCrawler`, but every
+    file is scanned only once and references of all three crawlers are
+    resolved into one graph.
+    """
+    _pattern = re.compile(
+        r'^ *(?:'
+        r'import ([\w_]+(?:\.[\w_]+)*)'
+        r'|from ([\.\w_]*) import(?:'
+        r' ([\w_.]+(?: as [\w_]+)?(?:, [\w_.]+(?: as [\w_]+)?)*)'
+        r'| +\(\s*([\w_.]+(?: as [\w_]+)?(?:,\s*[\w_.]+(?: as [\w_]+)?)*)'
+        r')?)',
+        re.MULTILINE)
+    _item_re = PythonItemImportsCrawler._item_re
+
+    def _extract(self, path: PurePosixPath, content: str) -> Iterable[str]:
+        for simple, module, items, multiline in self._pattern.findall(content):
+            if simple:
+                yield simple
+            elif module:
+                yield module
+                if module == '.':
+                    prefix = '.'
+                else:
+                    prefix = module + '.'
+                for item in self._item_re.findall(items or multiline):
+                    yield prefix + item
 
 __all__ = [
     'standard_python_crawler',
+    'PythonImportsCrawler',
     'PythonSimpleImportsCrawler',
     'PythonFromImportsCrawler',
     'PythonItemImportsCrawler',
@@ -0,0 +1,432 @@
+"""
+Crawlers that extract references from every file independently.
+
+Source code crawlers first extract unresolved references (module names,
+identifiers) from the content of every file and then resolve them against
+paths in the knowledge base. Extraction is the expensive part and it depends
+only on the path and content of the file, so `ReferenceCrawler` remembers
+extracted references in a `ReferenceCache` keyed by crawler, path, and content
+digest. Only resolution is repeated when the knowledge changes. The standard
+cache is persisted under `cache_home()`, so that restarts do not parse
+unchanged files again. Files missing from the cache are parsed in parallel
+when there are many of them.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from functools import cache, partial
+import json
+import logging
+import os
+import threading
+from pathlib import Path, PurePosixPath
+from typing import Iterable, cast
+from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
+from llobot.knowledge.graphs import KnowledgeGraph
+from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
+from llobot.knowledge.graphs.crawler import KnowledgeCrawler
+from llobot.knowledge.graphs.parallel import CrawlPool, standard_crawl_pool
+from llobot.knowledge.resolver import KnowledgeResolver, cached_knowledge_resolver
+from llobot.utils.fs import cache_home, create_parents
+from llobot.utils.values import ValueTypeMixin
+from llobot.utils.versions import package_version
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_REFERENCE_CACHE_CAPACITY = 262144
+
+type ReferenceKey = tuple[str, PurePosixPath, bytes]
+
+class ReferenceCacheStats(ValueTypeMixin):
+    """
+    Statistics of a `ReferenceCache`.
+    """
+    _hits: int
+    _misses: int
+    _size: int
+
+    def __init__(self, *, hits: int = 0, misses: int = 0, size: int = 0):
+        """
+        Creates new cache statistics.
+
+        Args:
+            hits: Number of lookups answered from the cache.
+            misses: Number of lookups not found in the cache.
+            size: Current number of entries.
+        """
+        self._hits = hits
+        self._misses = misses
+        self._size = size
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups answered from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups not found in the cache."""
+        return self._misses
+
+    @property
+    def size(self) -> int:
+        """Current number of entries."""
+        return self._size
+
+class ReferenceCache:
+    """
+    Thread-safe LRU cache of references extracted from files, optionally persisted to disk.
+
+    Persistent cache is an append-only log with one JSON line per entry. It
+    is loaded on first use. It is compacted on load and on `flush()` when it
+    grows much larger than the set of live entries. Unreadable lines are skipped, so a truncated or
+    corrupted log only costs some re-parsing.
+    """
+    _location: Path | None
+    _capacity: int
+    _lock: threading.Lock
+    _entries: OrderedDict[ReferenceKey, tuple[str, ...]]
+    _pending: list[str]
+    _loaded: bool
+    # Number of lines in the log, including lines of evicted and overwritten entries.
+    _lines: int
+    _hits: int
+    _misses: int
+
+    def __init__(self, location: Path | str | None = None, *, capacity: int = DEFAULT_REFERENCE_CACHE_CAPACITY):
+        """
+        Creates an empty cache.
+
+        Args:
+            location: Log file that persists the cache or `None` for memory-only cache.
+            capacity: Maximum number of remembered files.
+        """
+        self._location = Path(location) if location is not None else None
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._pending = []
+        self._loaded = self._location is None
+        self._lines = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def location(self) -> Path | None:
+        """Log file that persists the cache or `None` for memory-only cache."""
+        return self._location
+
+    @property
+    def stats(self) -> ReferenceCacheStats:
+        """Snapshot of cache statistics."""
+        with self._lock:
+            return ReferenceCacheStats(hits=self._hits, misses=self._misses, size=len(self._entries))
+
+    def get(self, key: ReferenceKey) -> tuple[str, ...] | None:
+        """
+        Returns remembered references or `None` if they are not remembered.
+
+        Args:
+            key: Crawler key, file path, and content digest.
+        """
+        with self._lock:
+            self._load()
+            references = self._entries.get(key)
+            if references is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return references
+
+    def put(self, key: ReferenceKey, references: tuple[str, ...]):
+        """
+        Remembers references extracted from a file.
+
+        Persistent cache writes new entries to disk on `flush()`.
+
+        Args:
+            key: Crawler key, file path, and content digest.
+            references: References extracted from the file.
+        """
+        with self._lock:
+            self._load()
+            self._entries[key] = references
+            self._entries.move_to_end(key)
+            self._trim()
+            if self._location is not None:
+                self._pending.append(_encode(key, references))
+
+    def flush(self):
+        """
+        Appends entries added since the last flush to the log.
+
+        The log is compacted if it has grown much larger than the set of live
+        entries. I/O errors are logged and otherwise ignored, because the cache is
+        only an optimization.
+        """
+        with self._lock:
+            if not self._pending or self._location is None:
+                return
+            lines = ''.join(self._pending)
+            self._pending = []
+            try:
+                create_parents(self._location)
+                with open(self._location, 'a', encoding='utf-8') as file:
+                    file.write(lines)
+            except OSError as ex:
+                _logger.warning(f'Cannot write reference cache {self._location}: {ex}')
+                return
+            self._lines += lines.count('\n')
+            self._compact_if_bloated()
+
+    def clear(self):
+        """
+        Forgets all remembered references, including those persisted on disk.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._pending = []
+            self._loaded = True
+            self._lines = 0
+            if self._location is not None:
+                self._location.unlink(missing_ok=True)
+
+    def _trim(self):
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        assert self._location is not None
+        try:
+            with open(self._location, encoding='utf-8') as file:
+                for line in file:
+                    self._lines += 1
+                    decoded = _decode(line)
+                    if decoded is not None:
+                        key, references = decoded
+                        self._entries[key] = references
+                        self._entries.move_to_end(key)
+        except FileNotFoundError:
+            return
+        except (OSError, UnicodeDecodeError) as ex:
+            _logger.warning(f'Cannot read reference cache {self._location}: {ex}')
+            return
+        self._trim()
+        self._compact_if_bloated()
+
+    def _compact_if_bloated(self):
+        if self._lines > 2 * len(self._entries) + 1024:
+            self._compact()
+
+    def _compact(self):
+        assert self._location is not None
+        # Temporary file is private to the thread, so that concurrent compactions do not mix their output.
+        temporary = self._location.with_name(f'{self._location.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            with open(temporary, 'w', encoding='utf-8') as file:
+                file.writelines(_encode(key, references) for key, references in self._entries.items())
+            temporary.replace(self._location)
+        except OSError as ex:
+            _logger.warning(f'Cannot compact reference cache {self._location}: {ex}')
+            temporary.unlink(missing_ok=True)
+            return
+        self._lines = len(self._entries)
+
+def _encode(key: ReferenceKey, references: tuple[str, ...]) -> str:
+    crawler, path, digest = key
+    return json.dumps([crawler, str(path), digest.hex(), references]) + '\n'
+
+def _decode(line: str) -> tuple[ReferenceKey, tuple[str, ...]] | None:
+    try:
+        crawler, path, digest, references = json.loads(line)
+        return ((crawler, PurePosixPath(path), bytes.fromhex(digest)), tuple(references))
+    except (ValueError, TypeError):
+        return None
+
+@cache
+def standard_reference_cache() -> ReferenceCache:
+    """
+    Returns the process-wide reference cache persisted under `cache_home()`.
+    """
+    return ReferenceCache(cache_home()/'llobot/references.jsonl')
+
+class ReferenceCrawler(KnowledgeCrawler):
+    """
+    Base class for crawlers that extract references from every file independently.
+
+    Subclasses override `subset` to select files and implement `_extract()`
+    to parse unresolved references from content and `_resolve()` to find
+    target files.
+
+    Extraction must depend only on path and content of the file, because its
+    results are cached. Files missing from the cache are parsed in a
+    `CrawlPool` if there are enough of them, so crawlers must be picklable.
+    Resolution runs in the calling process. It may depend on paths in the
+    knowledge base, but not on content of other files, which makes it
+    possible to update graphs incrementally.
+    """
+    # Version of extraction in `_extract()`. Subclasses must increment it whenever they change what is extracted.
+    CACHE_VERSION: int = 1
+    _cache: ReferenceCache
+    _pool: CrawlPool
+
+    def __init__(self, *, cache: ReferenceCache | None = None, pool: CrawlPool | None = None):
+        """
+        Creates a new reference crawler.
+
+        Args:
+            cache: Cache for extracted references. Defaults to `standard_reference_cache()`.
+            pool: Pool for parallel extraction. Defaults to `standard_crawl_pool()`.
+        """
+        self._cache = cache if cache is not None else standard_reference_cache()
+        self._pool = pool if pool is not None else standard_crawl_pool()
+
+    def _ephemeral_fields(self) -> Iterable[str]:
+        return ['_cache', '_pool']
+
+    def __getstate__(self) -> dict:
+        # Cache and pool hold locks. Workers only extract references, so they use the standard ones.
+        return {name: value for name, value in vars(self).items() if name not in ('_cache', '_pool')}
+
+    def __setstate__(self, state: dict):
+        vars(self).update(state)
+        self._cache = standard_reference_cache()
+        self._pool = standard_crawl_pool()
+
+    @property
+    def cache(self) -> ReferenceCache:
+        """Cache for extracted references."""
+        return self._cache
+
+    @property
+    def pool(self) -> CrawlPool:
+        """Pool for parallel extraction."""
+        return self._pool
+
+    @property
+    def cache_key(self) -> str:
+        """
+        Identifies the crawler and version of its extraction in the reference cache.
+
+        Defaults to the qualified class name with `CACHE_VERSION` and
+        llobot version, so that persistent cache does not return references
+        extracted by older code. Subclasses must increment `CACHE_VERSION`
+        whenever they change `_extract()`, because development versions of
+        llobot do not change version with every edit. Crawlers whose
+        extraction is parameterized must include the parameters.
+        """
+        return f'{type(self).__module__}.{type(self).__qualname__}/{self.CACHE_VERSION}/{package_version()}'
+
+    def _extract(self, path: PurePosixPath, content: str) -> Iterable[str]:
+        raise NotImplementedError
+
+    def _resolve(self, knowledge: Knowledge, resolver: KnowledgeResolver, path: PurePosixPath, reference: str) -> PurePosixPath | None:
+        raise NotImplementedError
+
+    def references(self, knowledge: Knowledge, path: PurePosixPath) -> tuple[str, ...]:
+        """
+        Returns unresolved references in a file, extracting them only if they are not cached.
+
+        Args:
+            knowledge: The knowledge base containing the file.
+            path: Path of the file.
+
+        Returns:
+            Unique references in order of first occurrence.
+        """
+        return self.references_many(knowledge, [path])[0]
+
+    def references_many(self, knowledge: Knowledge, paths: list[PurePosixPath]) -> list[tuple[str, ...]]:
+        """
+        Returns unresolved references in many files.
+
+        Files that are not cached are parsed in the pool, in parallel if
+        there are enough of them.
+
+        Args:
+            knowledge: The knowledge base containing the files.
+            paths: Paths of the files.
+
+        Returns:
+            References of every file in the order of `paths`.
+        """
+        crawler = self.cache_key
+        keys = [(crawler, path, knowledge.content_digest(path)) for path in paths]
+        results = [self._cache.get(key) for key in keys]
+        missing = [i for i, references in enumerate(results) if references is None]
+        if missing:
+            extracted = self._pool.map(partial(_extract_chunk, self), [(paths[i], knowledge[paths[i]]) for i in missing])
+            for i, references in zip(missing, extracted):
+                self._cache.put(keys[i], references)
+                results[i] = references
+            self._cache.flush()
+        return cast(list[tuple[str, ...]], results)
+
+    def crawl_into(self, knowledge: Knowledge, sources: list[PurePosixPath], builder: KnowledgeGraphBuilder):
+        """
+        Resolves references of the given files into a shared builder.
+
+        The resolver of a recently crawled ancestor of the knowledge (see
+        `Knowledge.parent`) is updated with added and removed paths
+        instead of being rebuilt for every version of the knowledge.
+
+        Args:
+            knowledge: The knowledge base to crawl.
+            sources: Paths of files to link from, all in `subset`.
+            builder: Builder that receives the links.
+        """
+        resolver = cached_knowledge_resolver(knowledge)
+        for path, references in zip(sources, self.references_many(knowledge, sources)):
+            for reference in references:
+                target = self._resolve(knowledge, resolver, path, reference)
+                if target:
+                    builder.add(path, target)
+
+    def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
+        """
+        Resolves references of all files in `subset`.
+
+        Args:
+            knowledge: The knowledge base to crawl.
+
+        Returns:
+            A `KnowledgeGraph` with links from files to resolved references.
+        """
+        builder = KnowledgeGraphBuilder()
+        self.crawl_into(knowledge, self.subset.filter(knowledge.keys()), builder)
+        return builder.build()
+
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, graph: KnowledgeGraph) -> KnowledgeGraph:
+        """
+        Re-crawls only modified files if no files were added or removed.
+
+        Adding or removing files can change how references in unchanged files
+        resolve, so such changes are crawled from scratch, which is still
+        cheap thanks to the reference cache.
+        """
+        if delta.structural:
+            return self.crawl(knowledge)
+        builder = KnowledgeGraphBuilder(graph)
+        for path in delta.modified:
+            builder.remove(path)
+        self.crawl_into(knowledge, self.subset.filter(delta.modified), builder)
+        return builder.build()
+
+def _extract_chunk(crawler: ReferenceCrawler, documents: list[tuple[PurePosixPath, str]]) -> list[tuple[str, ...]]:
+    """
+    Extracts unique references from documents. Runs in pool workers.
+    """
+    return [tuple(dict.fromkeys(crawler._extract(path, content))) for path, content in documents]
+
+__all__ = [
+    'DEFAULT_REFERENCE_CACHE_CAPACITY',
+    'ReferenceKey',
+    'ReferenceCacheStats',
+    'ReferenceCache',
+    'standard_reference_cache',
+    'ReferenceCrawler',
+]
@@ -5,11 +5,14 @@ from __future__ import annotations
 from functools import cache
 import re
 from pathlib import PurePosixPath
+from typing import Iterable
 from llobot.utils.values import ValueTypeMixin
 from llobot.knowledge import Knowledge
-from llobot.knowledge.graphs import KnowledgeGraph
-from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
 from llobot.knowledge.graphs.crawler import KnowledgeCrawler
+from llobot.knowledge.graphs.references import ReferenceCrawler
+from llobot.knowledge.resolver import KnowledgeResolver
+from llobot.knowledge.subsets import KnowledgeSubset
+from llobot.knowledge.subsets.suffix import SuffixSubset
 
 def _source_path(source: PurePosixPath) -> PurePosixPath:
     """Convert a Rust file path to its module path."""
@@ -85,57 +88,65 @@ def standard_rust_crawler() -> KnowledgeCrawler:
     """
     return RustSubmoduleCrawler() | RustUseCrawler()
 
-class RustSubmoduleCrawler(KnowledgeCrawler, ValueTypeMixin):
+class _RustCrawler(ReferenceCrawler):
+    """
+    Base class for Rust crawlers, which extract references from `.rs` files.
+    """
+    @property
+    def subset(self) -> KnowledgeSubset:
+        return SuffixSubset('.rs')
+
+class RustSubmoduleCrawler(_RustCrawler, ValueTypeMixin):
     """
     Crawls Rust files for `mod` statements to find submodule relationships.
     """
     _pattern = re.compile(r'^ *(?:pub )?mod ([\w_]+);', re.MULTILINE)
 
-    def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
-        builder = KnowledgeGraphBuilder()
-        for path, content in knowledge:
-            if path.suffix == '.rs':
-                for module in self._pattern.findall(content):
-                    module_path = path.parent / module
-                    rs_path, mod_path = _rust_module_paths(module_path)
-
-                    if rs_path in knowledge:
-                        builder.add(path, rs_path)
-                    elif mod_path in knowledge:
-                        builder.add(path, mod_path)
-        return builder.build()
-
-class RustUseCrawler(KnowledgeCrawler, ValueTypeMixin):
+    def _extract(self, path: PurePosixPath, content: str) -> Iterable[str]:
+        return self._pattern.findall(content)
+
+    def _resolve(self, knowledge: Knowledge, resolver: KnowledgeResolver, path: PurePosixPath, reference: str) -> PurePosixPath | None:
+        rs_path, mod_path = _rust_module_paths(path.parent / reference)
+        if rs_path in knowledge:
+            return rs_path
+        elif mod_path in knowledge:
+            return mod_path
+        else:
+            return None
+
+class RustUseCrawler(_RustCrawler, ValueTypeMixin):
     """
     Crawls Rust files for `use` statements to find dependencies.
+
+    References are items of `use` statements prefixed with indentation of the
+    statement, which is used to guess nesting of inline modules.
     """
     _statement_pattern = re.compile(r'^( *)(?:pub )?use ([^;]+);', re.MULTILINE)
     _brace_pattern = re.compile(r'([\w_:]*){([^{}]*)}')
     _item_pattern = re.compile(r'([\w_:]+)')
 
-    def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
+    def _extract(self, path: PurePosixPath, content: str) -> Iterable[str]:
         def expand(matched) -> str:
             prefix = matched[1]
             return ', '.join([(prefix + item if prefix else item) for item in self._item_pattern.findall(matched[2])])
 
-        builder = KnowledgeGraphBuilder()
-        for path, content in knowledge:
-            if path.suffix == '.rs':
-                for indentation, spec in self._statement_pattern.findall(content):
-                    while True:
-                        expanded = self._brace_pattern.sub(expand, spec)
-                        if expanded == spec:
-                            break
-                        spec = expanded
-                    source = path
-                    while indentation:
-                        source = source/'nested-module'
-                        indentation = indentation[4:]
-                    for item in self._item_pattern.findall(spec):
-                        target = _resolve_use_path(source, item, knowledge)
-                        if target:
-                            builder.add(path, target)
-        return builder.build()
+        for indentation, spec in self._statement_pattern.findall(content):
+            while True:
+                expanded = self._brace_pattern.sub(expand, spec)
+                if expanded == spec:
+                    break
+                spec = expanded
+            for item in self._item_pattern.findall(spec):
+                yield indentation + item
+
+    def _resolve(self, knowledge: Knowledge, resolver: KnowledgeResolver, path: PurePosixPath, reference: str) -> PurePosixPath | None:
+        item = reference.lstrip(' ')
+        indentation = reference[:len(reference) - len(item)]
+        source = path
+        while indentation:
+            source = source/'nested-module'
+            indentation = indentation[4:]
+        return _resolve_use_path(source, item, knowledge)
 
 __all__ = [
     'standard_rust_crawler',
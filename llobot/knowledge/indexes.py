@@ -8,6 +8,7 @@ from llobot.formats.paths import coerce_path
 
 if TYPE_CHECKING:
     from llobot.knowledge.ranking import KnowledgeRanking
+    from llobot.knowledge.tables import PathTable
 
 class KnowledgeIndex(ValueTypeMixin):
     """
@@ -15,33 +16,110 @@ class KnowledgeIndex(ValueTypeMixin):
 
     This class behaves like a read-only set of paths, providing set operations
     and path manipulation methods.
+
+    Indexes created with a `PathTable` store paths as a bitset of interned
+    IDs. Set operations on indexes that share a table are then performed on
+    the bitsets without hashing any paths. Both representations compare equal
+    when they contain the same paths.
     """
-    _paths: frozenset[PurePosixPath]
+    _table: PathTable | None
+    _bits: int
+    # For indexes backed by a table, this is materialized on demand.
+    _paths: frozenset[PurePosixPath] | None
 
-    def __init__(self, paths: Iterable[PurePosixPath | str] | None = None):
+    def __init__(self, paths: Iterable[PurePosixPath | str] | None = None, *, table: PathTable | None = None):
         """
         Initializes a new `KnowledgeIndex`.
 
         Args:
             paths: An iterable of paths or path strings.
+            table: Table to intern the paths in. If provided, the index is
+                   stored as a bitset, which speeds up set operations with
+                   other indexes using the same table.
         """
         if paths is None:
             paths = []
-        self._paths = frozenset(coerce_path(path) for path in paths)
+        coerced = (coerce_path(path) for path in paths)
+        self._table = table
+        if table is not None:
+            self._bits = table.bits(coerced)
+            self._paths = None
+        else:
+            self._bits = 0
+            self._paths = frozenset(coerced)
+
+    @classmethod
+    def from_bits(cls, table: PathTable, bits: int) -> KnowledgeIndex:
+        """
+        Creates an index from a bitset of IDs interned in a table.
+
+        Args:
+            table: Table the IDs are interned in.
+            bits: Bitset of path IDs.
+        """
+        index = cls.__new__(cls)
+        index._table = table
+        index._bits = bits
+        index._paths = None
+        return index
+
+    def _ephemeral_fields(self) -> Iterable[str]:
+        return ['_table', '_bits', '_paths']
+
+    @property
+    def table(self) -> PathTable | None:
+        """Table the paths are interned in or `None` if the index is a plain set."""
+        return self._table
+
+    @property
+    def bits(self) -> int:
+        """Bitset of path IDs in `table`. Zero if the index has no table."""
+        return self._bits
+
+    def _path_set(self) -> frozenset[PurePosixPath]:
+        if self._paths is None:
+            assert self._table is not None
+            self._paths = frozenset(self._table.paths(self._bits))
+        return self._paths
+
+    def _shares_table(self, other: KnowledgeIndex) -> bool:
+        return self._table is not None and self._table is other._table
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, KnowledgeIndex):
+            return NotImplemented
+        if self._shares_table(other):
+            return self._bits == other._bits
+        return self._path_set() == other._path_set()
+
+    def __hash__(self) -> int:
+        if getattr(self, '_hash', None) is None:
+            self._hash = hash(self._path_set())
+        assert self._hash is not None
+        return self._hash
 
     def __repr__(self) -> str:
         return str(self.sorted())
 
     def __len__(self) -> int:
+        if self._paths is None:
+            return self._bits.bit_count()
         return len(self._paths)
 
     def __bool__(self) -> bool:
+        if self._paths is None:
+            return self._bits != 0
         return bool(self._paths)
 
     def __contains__(self, path: PurePosixPath | str) -> bool:
-        return PurePosixPath(path) in self._paths
+        return (path if isinstance(path, PurePosixPath) else PurePosixPath(path)) in self._path_set()
 
     def __iter__(self) -> Iterator[PurePosixPath]:
+        if self._paths is None:
+            assert self._table is not None
+            return iter(self._table.paths(self._bits))
         return iter(self._paths)
 
     def sorted(self) -> KnowledgeRanking:
@@ -64,23 +142,32 @@ class KnowledgeIndex(ValueTypeMixin):
         """
         Returns a new index with paths present in both this index and the whitelist.
         """
+        if isinstance(whitelist, KnowledgeIndex) and self._shares_table(whitelist):
+            assert self._table is not None
+            return KnowledgeIndex.from_bits(self._table, self._bits & whitelist._bits)
         whitelist = coerce_subset(whitelist)
-        return KnowledgeIndex(path for path in self if path in whitelist)
+        return KnowledgeIndex(whitelist.filter(self), table=self._table)
 
     def __or__(self, addition: PurePosixPath | KnowledgeIndex) -> KnowledgeIndex:
         """
         Returns a new index with paths from both this index and the addition.
         """
         if isinstance(addition, PurePosixPath):
-            return self | KnowledgeIndex([addition])
+            return self | KnowledgeIndex([addition], table=self._table)
         if isinstance(addition, KnowledgeIndex):
-            return KnowledgeIndex(self._paths | addition._paths)
+            if self._shares_table(addition):
+                assert self._table is not None
+                return KnowledgeIndex.from_bits(self._table, self._bits | addition._bits)
+            return KnowledgeIndex(self._path_set() | addition._path_set())
         raise TypeError
 
     def __sub__(self, blacklist: KnowledgeSubset | str | KnowledgeIndex | PurePosixPath) -> KnowledgeIndex:
         """
         Returns a new index with paths from this index that are not in the blacklist.
         """
+        if isinstance(blacklist, KnowledgeIndex) and self._shares_table(blacklist):
+            assert self._table is not None
+            return KnowledgeIndex.from_bits(self._table, self._bits & ~blacklist._bits)
         return self & ~coerce_subset(blacklist)
 
     def __rtruediv__(self, prefix: PurePosixPath | str) -> KnowledgeIndex:
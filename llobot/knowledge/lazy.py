@@ -0,0 +1,178 @@
+"""
+Knowledge that reads documents on demand.
+
+`LazyKnowledge` knows paths and approximate sizes of its documents up front,
+which is enough for ranking, scoring, and budgeting. Content of a document is
+read only when it is accessed, so that a large project does not have to be read
+entirely just to render the few documents that fit in the context.
+"""
+from __future__ import annotations
+import hashlib
+from itertools import compress
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, Callable, Hashable, Iterable, Iterator
+from llobot.knowledge import Knowledge
+from llobot.knowledge.tables import PathTable
+from llobot.utils.values import ValueTypeMixin, value_identity
+
+if TYPE_CHECKING:
+    from llobot.knowledge.indexes import KnowledgeIndex
+    from llobot.knowledge.ranking import KnowledgeRanking
+    from llobot.knowledge.scores import KnowledgeScores
+    from llobot.knowledge.subsets import KnowledgeSubset
+
+class LazyKnowledge(Knowledge):
+    """
+    Knowledge with known paths and sizes, which reads content on first access.
+
+    Documents the loader cannot read (e.g. binary files) are listed in `keys()`
+    until the first attempt to read them. They are then dropped from `keys()`,
+    their size becomes zero, and they are skipped during iteration. Sizes are
+    estimates, typically file sizes in bytes. Once read, content is remembered
+    and shared with knowledge derived by filtering.
+
+    Lazy knowledge is equal to other lazy knowledge with the same loader, sizes,
+    and version, which lets caches keyed by knowledge hit without reading any
+    content. It is never equal to eagerly loaded `Knowledge`. Its `digest`
+    reads all documents, but `fingerprint` identifies the knowledge across
+    processes without reading anything.
+    """
+    _loader: Callable[[PurePosixPath], str | None]
+    _sizes: dict[PurePosixPath, int]
+    _version: Hashable
+    _loaded: dict[PurePosixPath, str | None]
+    _unreadable: set[PurePosixPath]
+
+    def __init__(self, loader: Callable[[PurePosixPath], str | None], sizes: dict[PurePosixPath, int], *, version: Hashable = None):
+        """
+        Creates new lazy knowledge.
+
+        Args:
+            loader: Function that reads content of a document or returns `None`
+                    if it cannot be read. It should be value-comparable, for
+                    example a bound method of a project.
+            sizes: Estimated sizes of all documents in iteration order.
+            version: Identifies the state of the underlying documents, for
+                     example a tuple of modification times.
+        """
+        self._loader = loader
+        self._sizes = sizes
+        self._version = version
+        self._loaded = {}
+        self._unreadable = set()
+        self._digests = {}
+        self._digest = None
+        self._table = PathTable()
+        self._parent = None
+        self._changes = frozenset()
+
+    def _ephemeral_fields(self) -> Iterable[str]:
+        return ['_loaded', '_unreadable', '_digests', '_digest', '_table', '_parent', '_changes']
+
+    __eq__ = ValueTypeMixin.__eq__
+    __hash__ = ValueTypeMixin.__hash__
+
+    def _derive(self, sizes: dict[PurePosixPath, int]) -> LazyKnowledge:
+        derived = LazyKnowledge(self._loader, sizes, version=self._version)
+        derived._loaded = self._loaded
+        derived._unreadable = self._unreadable
+        derived._table = self._table
+        return derived
+
+    def _load(self, path: PurePosixPath) -> str | None:
+        if path not in self._loaded:
+            content = self._loader(path)
+            self._loaded[path] = content
+            if content is None:
+                self._unreadable.add(path)
+        return self._loaded[path]
+
+    @property
+    def version(self) -> Hashable:
+        """Identifies the state of the underlying documents."""
+        return self._version
+
+    @property
+    def fingerprint(self) -> str | None:
+        """
+        Hexadecimal identity of loader, sizes, and version that is stable across processes.
+
+        It is `None` if the loader is not a method of a value type or if the
+        version contains anything other than numbers and strings, for example
+        placeholders for recently modified files, whose content might change
+        without changing their stat data.
+        """
+        owner = getattr(self._loader, '__self__', None)
+        if not isinstance(owner, ValueTypeMixin) or not _plain(self._version):
+            return None
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(value_identity(owner).encode('utf-8'))
+        hasher.update(f'\0{self._loader.__name__}\0{self._version!r}\0'.encode('utf-8'))
+        for path in sorted(self._sizes):
+            hasher.update(f'{path}\0{self._sizes[path]}\0'.encode('utf-8'))
+        return hasher.hexdigest()
+
+    def keys(self) -> KnowledgeIndex:
+        from llobot.knowledge.indexes import KnowledgeIndex
+        if not self._unreadable:
+            return KnowledgeIndex(self._sizes.keys(), table=self._table)
+        return KnowledgeIndex([path for path in self._sizes if path not in self._unreadable], table=self._table)
+
+    def __len__(self) -> int:
+        return len(self._sizes) - sum(1 for path in self._unreadable if path in self._sizes)
+
+    @property
+    def cost(self) -> int:
+        """Estimated total size of all documents."""
+        return sum(self.size(path) for path in self._sizes)
+
+    def size(self, path: PurePosixPath) -> int:
+        """
+        Returns exact size of already read documents and estimated size of the rest.
+
+        Documents that could not be read have zero size.
+        """
+        if path in self._loaded:
+            return len(self._loaded[path] or '')
+        return self._sizes.get(path, 0)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __contains__(self, path: PurePosixPath | str) -> bool:
+        path = PurePosixPath(path)
+        return path in self._sizes and path not in self._unreadable
+
+    def __getitem__(self, path: PurePosixPath) -> str:
+        if path not in self._sizes:
+            return ''
+        return self._load(path) or ''
+
+    def __iter__(self) -> Iterator[tuple[PurePosixPath, str]]:
+        for path in self._sizes:
+            content = self._load(path)
+            if content is not None:
+                yield path, content
+
+    def __and__(self, subset: KnowledgeSubset | str | PurePosixPath | KnowledgeIndex | KnowledgeRanking | KnowledgeScores) -> Knowledge:
+        """
+        Filters the knowledge without reading any documents.
+        """
+        from llobot.knowledge.subsets import coerce_subset
+        subset = coerce_subset(subset)
+        return self._derive(dict(compress(self._sizes.items(), subset.mask(self._sizes))))
+
+    def __or__(self, addition: Knowledge) -> Knowledge:
+        """
+        Reads all documents and merges them with another knowledge.
+        """
+        return Knowledge({path: content for path, content in self}) | addition
+
+def _plain(value: Hashable) -> bool:
+    if isinstance(value, tuple):
+        return all(_plain(item) for item in value)
+    return value is None or isinstance(value, (int, float, str, bytes))
+
+__all__ = [
+    'LazyKnowledge',
+]
@@ -74,7 +74,7 @@ class KnowledgeRanking(ValueTypeMixin):
         Filters the ranking, keeping only paths in the given whitelist.
         """
         whitelist = coerce_subset(whitelist)
-        return KnowledgeRanking(path for path in self if path in whitelist)
+        return KnowledgeRanking(whitelist.filter(self._paths))
 
     def __sub__(self, blacklist: KnowledgeSubset | str | KnowledgeIndex | PurePosixPath) -> KnowledgeRanking:
         """
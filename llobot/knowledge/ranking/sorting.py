@@ -16,6 +16,25 @@ from llobot.knowledge.scores import KnowledgeScores
 from llobot.knowledge.scores.scorers import KnowledgeScorer, standard_scorer
 from llobot.utils.values import ValueTypeMixin
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def _rank(scores: KnowledgeScores, initial: KnowledgeRankingPrecursor | None, sign: float) -> KnowledgeRanking:
+    if initial is None:
+        ranking = coerce_ranking(scores.keys())
+    else:
+        ranking = coerce_ranking(initial)
+    paths = cast(list[PurePosixPath], list(ranking))
+    keys = [sign * scores[path] for path in paths]
+    # Stable argsort uses the original order as a tie-breaker.
+    if numpy is not None:
+        order = numpy.argsort(numpy.array(keys, dtype=numpy.float64), kind='stable').tolist()
+    else:
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+    return KnowledgeRanking([paths[index] for index in order])
+
 def rank_ascending(scores: KnowledgeScores, *, initial: KnowledgeRankingPrecursor | None = None) -> KnowledgeRanking:
     """
     Sorts a ranking in ascending order of scores.
@@ -31,19 +50,14 @@ def rank_ascending(scores: KnowledgeScores, *, initial: KnowledgeRankingPrecurso
     Returns:
         A new ranking sorted by score in ascending order.
     """
-    if initial is None:
-        ranking = coerce_ranking(scores.keys())
-    else:
-        ranking = coerce_ranking(initial)
-    # Sort by score. The original order is used as a tie-breaker because
-    # Python's sort is stable.
-    return KnowledgeRanking(sorted(ranking, key=lambda path: scores[cast(PurePosixPath, path)]))
+    return _rank(scores, initial, 1.0)
 
 def rank_descending(scores: KnowledgeScores, *, initial: KnowledgeRankingPrecursor | None = None) -> KnowledgeRanking:
     """
     Sorts a ranking in descending order of scores.
 
-    This is a convenience function that calls `rank_ascending` with negated scores.
+    Ties keep the order of the initial ranking, exactly as if `rank_ascending`
+    was called with negated scores.
 
     Args:
         scores: The scores to use for sorting.
@@ -52,7 +66,7 @@ def rank_descending(scores: KnowledgeScores, *, initial: KnowledgeRankingPrecurs
     Returns:
         A new ranking sorted by score in descending order.
     """
-    return rank_ascending(-scores, initial=initial)
+    return _rank(scores, initial, -1.0)
 
 class AscendingRanker(KnowledgeRanker, ValueTypeMixin):
     """
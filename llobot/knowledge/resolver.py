@@ -4,8 +4,22 @@ Index for efficient, proximity-based path resolution.
 from __future__ import annotations
 from functools import lru_cache
 from pathlib import PurePosixPath
+import threading
+from typing import TYPE_CHECKING, Callable
+import weakref
+from llobot.knowledge import Knowledge
 from llobot.knowledge.indexes import KnowledgeIndex, KnowledgeIndexPrecursor, coerce_index
 
+if TYPE_CHECKING:
+    from llobot.knowledge.deltas import KnowledgeDelta
+
+# Number of recently resolved knowledge versions that resolvers of newer knowledge can be updated from.
+_HISTORY_SIZE = 4
+
+_history_lock = threading.Lock()
+# Weakly referenced recently resolved knowledge with its resolver, most recent last.
+_history: list[tuple[weakref.ref[Knowledge], 'KnowledgeResolver']] = []
+
 @lru_cache(maxsize=2)
 def _cached_knowledge_resolver(index: KnowledgeIndex) -> 'KnowledgeResolver':
     """
@@ -13,11 +27,38 @@ def _cached_knowledge_resolver(index: KnowledgeIndex) -> 'KnowledgeResolver':
     """
     return KnowledgeResolver(index)
 
+def _knowledge_resolver(knowledge: Knowledge) -> 'KnowledgeResolver':
+    """
+    Updates resolver of the nearest recently resolved ancestor of the knowledge or creates a new one.
+    """
+    with _history_lock:
+        history = list(_history)
+    base = None
+    ancestor = knowledge
+    while base is None and ancestor is not None:
+        known = next((resolver for reference, resolver in reversed(history) if reference() is ancestor), None)
+        base = (ancestor, known) if known is not None else None
+        ancestor = ancestor.parent
+    if base is not None and base[0] is knowledge:
+        return base[1]
+    if base is not None:
+        resolver = base[1].update(base[0].diff(knowledge))
+    else:
+        resolver = _cached_knowledge_resolver(knowledge.keys())
+    with _history_lock:
+        # Drop entries for knowledge that is gone.
+        alive = [entry for entry in _history if entry[0]() is not None]
+        _history[:] = alive[-(_HISTORY_SIZE - 1):] + [(weakref.ref(knowledge), resolver)]
+    return resolver
+
 def cached_knowledge_resolver(index: KnowledgeIndexPrecursor) -> 'KnowledgeResolver':
     """
     Creates a knowledge resolver from a knowledge index or its precursor.
 
-    The resolver is cached for performance.
+    The resolver is cached for performance. If knowledge is given and the
+    resolver of its ancestor (see `Knowledge.parent`) is cached, it is
+    updated with `KnowledgeResolver.update()` instead of built from scratch.
+    Knowledge is referenced weakly.
 
     Args:
         index: The knowledge index to create a resolver from.
@@ -26,8 +67,36 @@ def cached_knowledge_resolver(index: KnowledgeIndexPrecursor) -> 'KnowledgeResol
     Returns:
         A `KnowledgeResolver` for efficient path lookups.
     """
+    if isinstance(index, Knowledge):
+        return _knowledge_resolver(index)
     return _cached_knowledge_resolver(coerce_index(index))
 
+def _name_key(path: PurePosixPath) -> str | None:
+    return path.name if path.parts else None
+
+def _tail_key(path: PurePosixPath) -> PurePosixPath | None:
+    parts = path.parts
+    return PurePosixPath(*parts[-2:]) if len(parts) >= 2 else None
+
+def _patch[K](table: dict[K, set[PurePosixPath]], delta: KnowledgeDelta, key: Callable[[PurePosixPath], K | None]) -> dict[K, set[PurePosixPath]]:
+    """
+    Copies a lookup table with changes applied. Sets that are not affected are shared.
+    """
+    patched: dict[K, set[PurePosixPath]] = {}
+    for path in delta.removed:
+        k = key(path)
+        if k is not None:
+            patched.setdefault(k, set(table.get(k, ()))).discard(path)
+    for path in delta.added:
+        k = key(path)
+        if k is not None:
+            patched.setdefault(k, set(table.get(k, ()))).add(path)
+    result = table | patched
+    for k, paths in patched.items():
+        if not paths:
+            del result[k]
+    return result
+
 class KnowledgeResolver:
     """
     Index for efficient path resolution, with disambiguation based on source
@@ -65,6 +134,26 @@ class KnowledgeResolver:
                     self._tails[tail] = set()
                 self._tails[tail].add(path)
 
+    def update(self, delta: KnowledgeDelta) -> KnowledgeResolver:
+        """
+        Returns a resolver for the index changed by the delta.
+
+        This resolver is left unchanged. Lookup tables are copied shallowly
+        and only entries affected by added and removed paths are rebuilt.
+
+        Args:
+            delta: Changes from the index of this resolver to the new index.
+
+        Returns:
+            Resolver for the new index, or this resolver if no paths were added or removed.
+        """
+        if not delta.structural:
+            return self
+        result = KnowledgeResolver(KnowledgeIndex())
+        result._names = _patch(self._names, delta, _name_key)
+        result._tails = _patch(self._tails, delta, _tail_key)
+        return result
+
     def resolve_all(self, *targets: PurePosixPath) -> KnowledgeIndex:
         """
         Resolves abbreviated paths to all possible full target paths.
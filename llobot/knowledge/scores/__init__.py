@@ -27,20 +27,98 @@ subset
     Scorer for an explicit subset of documents.
 normal
     Functions for score normalization.
+cached
+    Scorers that remember their results on disk.
 """
 from __future__ import annotations
+from array import array
+from itertools import compress, count
 import math
+import operator
 from pathlib import PurePosixPath
-from typing import Iterator, TYPE_CHECKING
+from typing import Callable, Iterable, Iterator, TYPE_CHECKING
 from llobot.utils.values import ValueTypeMixin
 from llobot.knowledge import Knowledge
 from llobot.knowledge.indexes import KnowledgeIndex, coerce_index
 from llobot.knowledge.subsets import KnowledgeSubset, coerce_subset
+from llobot.knowledge.tables import PathTable
 from llobot.formats.paths import coerce_path
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 if TYPE_CHECKING:
     from llobot.knowledge.ranking import KnowledgeRanking
 
+def _divide(numerator: float, denominator: float) -> float:
+    return numerator / denominator if denominator else 0.0
+
+def _override(base: float, override: float) -> float:
+    return override or base
+
+_PYTHON_OPERATIONS: dict[str, Callable[[float, float], float]] = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'div': _divide,
+    'or': _override,
+}
+
+def _padded(values: array[float], length: int) -> array[float]:
+    if len(values) >= length:
+        return values
+    return values + array('d', bytes(8 * (length - len(values))))
+
+def _nonzero_ids(values: array[float]) -> list[int]:
+    if numpy is not None:
+        return numpy.flatnonzero(numpy.frombuffer(values, dtype=numpy.float64)).tolist()
+    return list(compress(count(), values))
+
+def _combine(left: array[float], right: array[float], operation: str) -> array[float]:
+    """
+    Applies an operation to two dense score arrays, element by element.
+
+    Absent scores are zeros. Non-finite results are replaced with zeros.
+    """
+    length = max(len(left), len(right))
+    left = _padded(left, length)
+    right = _padded(right, length)
+    if numpy is not None:
+        lhs = numpy.frombuffer(left, dtype=numpy.float64)
+        rhs = numpy.frombuffer(right, dtype=numpy.float64)
+        with numpy.errstate(all='ignore'):
+            if operation == 'add':
+                result = lhs + rhs
+            elif operation == 'sub':
+                result = lhs - rhs
+            elif operation == 'mul':
+                result = lhs * rhs
+            elif operation == 'div':
+                result = numpy.divide(lhs, rhs, out=numpy.zeros(length), where=rhs != 0)
+            else:
+                result = numpy.where(rhs != 0, rhs, lhs)
+        result[~numpy.isfinite(result)] = 0
+        return array('d', result.tobytes())
+    result = array('d', map(_PYTHON_OPERATIONS[operation], left, right))
+    # Sum of finite scores is finite unless it overflows, so the slow path below is rare.
+    if not math.isfinite(sum(result)):
+        result = array('d', (value if math.isfinite(value) else 0.0 for value in result))
+    return result
+
+def _mask(values: array[float], bits: int) -> array[float]:
+    """
+    Zeroes scores of IDs missing from a bitset.
+    """
+    if numpy is not None and values:
+        dense = numpy.frombuffer(values, dtype=numpy.float64)
+        # Bitset is truncated and padded to exactly cover the array.
+        packed = (bits & ((1 << len(values)) - 1)).to_bytes((len(values) + 7) // 8, 'little')
+        flags = numpy.unpackbits(numpy.frombuffer(packed, dtype=numpy.uint8), count=len(values), bitorder='little')
+        return array('d', numpy.where(flags != 0, dense, 0.0).tobytes())
+    return array('d', (value if bit == '1' else 0.0 for value, bit in zip(values, bin(bits)[:1:-1])))
+
 class KnowledgeScores(ValueTypeMixin):
     """
     A mapping from document paths to numerical scores.
@@ -48,42 +126,123 @@ class KnowledgeScores(ValueTypeMixin):
     This class behaves like a dictionary of floats, but provides additional
     methods for arithmetic operations and filtering. Scores of zero and non-finite
     scores are not stored. It is immutable.
+
+    Scores created with a `PathTable` are stored in a dense `array('d')`
+    indexed by path ID, with zeros for absent paths. Arithmetic and filtering
+    of scores that share a table are then performed on whole arrays, using
+    NumPy when it is installed, without hashing any paths. Both
+    representations compare equal when they contain the same scores.
     """
-    _scores: dict[PurePosixPath, float]
+    _table: PathTable | None
+    # Scores indexed by path ID in the table. Only present if there is a table.
+    _values: array[float] | None
+    # For scores backed by a table, this is materialized on demand.
+    _scores: dict[PurePosixPath, float] | None
 
-    def __init__(self, scores: dict[PurePosixPath, float] | None = None):
+    def __init__(self, scores: dict[PurePosixPath, float] | None = None, *, table: PathTable | None = None):
         """
         Initializes a `KnowledgeScores` object.
 
         Args:
             scores: A dictionary of paths and their corresponding scores. Defaults to empty.
                     Scores that are zero or non-finite are filtered out.
+            table: Table to intern the paths in. If provided, scores are
+                   stored in a dense array, which speeds up operations with
+                   other scores and indexes using the same table.
         """
         if scores is None:
             scores = {}
-        self._scores = {coerce_path(path): float(score) for path, score in scores.items() if math.isfinite(score) and score != 0}
+        filtered = {coerce_path(path): float(score) for path, score in scores.items() if math.isfinite(score) and score != 0}
+        self._table = table
+        self._scores = filtered
+        if table is not None:
+            ids = [table.intern(path) for path in filtered]
+            values = array('d', bytes(8 * (max(ids) + 1))) if ids else array('d')
+            for id, score in zip(ids, filtered.values()):
+                values[id] = score
+            self._values = values
+        else:
+            self._values = None
+
+    @staticmethod
+    def _dense(table: PathTable, values: array[float]) -> KnowledgeScores:
+        """
+        Wraps a dense array of finite scores without copying it.
+        """
+        result = KnowledgeScores.__new__(KnowledgeScores)
+        result._table = table
+        result._values = values
+        result._scores = None
+        return result
+
+    def _ephemeral_fields(self) -> Iterable[str]:
+        return ['_table', '_values', '_scores']
+
+    def _dict(self) -> dict[PurePosixPath, float]:
+        if self._scores is None:
+            assert self._table is not None and self._values is not None
+            values = self._values
+            path = self._table.path
+            self._scores = {path(id): values[id] for id in _nonzero_ids(values)}
+        return self._scores
+
+    def _shares_table(self, other: KnowledgeScores) -> bool:
+        return self._table is not None and self._table is other._table
+
+    @property
+    def table(self) -> PathTable | None:
+        """Table the paths are interned in or `None` if scores are a plain dictionary."""
+        return self._table
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, KnowledgeScores):
+            return NotImplemented
+        if self._shares_table(other):
+            assert self._values is not None and other._values is not None
+            length = max(len(self._values), len(other._values))
+            return _padded(self._values, length) == _padded(other._values, length)
+        return self._dict() == other._dict()
+
+    def __hash__(self) -> int:
+        if getattr(self, '_hash', None) is None:
+            self._hash = hash(frozenset(self._dict().items()))
+        assert self._hash is not None
+        return self._hash
 
     def __repr__(self) -> str:
-        return str(self._scores)
+        return str(self._dict())
 
     def keys(self) -> KnowledgeIndex:
         """Returns a `KnowledgeIndex` of all paths with non-zero scores."""
-        return KnowledgeIndex(self._scores.keys())
+        if self._values is not None:
+            assert self._table is not None
+            return KnowledgeIndex.from_bits(self._table, PathTable.id_bits(_nonzero_ids(self._values)))
+        return KnowledgeIndex(self._dict().keys())
 
     def __len__(self) -> int:
-        return len(self._scores)
+        if self._values is not None:
+            return len(self._values) - self._values.count(0.0)
+        return len(self._dict())
 
     def __bool__(self) -> bool:
-        return bool(self._scores)
+        if self._values is not None:
+            return any(self._values)
+        return bool(self._dict())
 
     def __contains__(self, path: PurePosixPath | str) -> bool:
-        return PurePosixPath(path) in self._scores
+        return self[PurePosixPath(path)] != 0
 
     def __getitem__(self, path: PurePosixPath) -> float:
-        return self._scores.get(path, 0)
+        if self._values is not None:
+            assert self._table is not None
+            id = self._table.find(path)
+            return self._values[id] if id is not None and id < len(self._values) else 0
+        return self._dict().get(path, 0)
 
     def __iter__(self) -> Iterator[tuple[PurePosixPath, float]]:
-        return iter(self._scores.items())
+        return iter(self._dict().items())
 
     def _coerce_operand(self, other: int | float | KnowledgeScores | Knowledge) -> KnowledgeScores:
         """
@@ -101,17 +260,33 @@ class KnowledgeScores(ValueTypeMixin):
         """
         from llobot.knowledge.scores.constant import constant_scores
         if isinstance(other, (int, float)):
+            if self._values is not None:
+                assert self._table is not None
+                # Constant scores share the table, so that the operation runs on arrays.
+                constant = float(other) if math.isfinite(other) else 0.0
+                if numpy is not None:
+                    dense = numpy.frombuffer(self._values, dtype=numpy.float64)
+                    values = array('d', numpy.where(dense != 0, constant, 0.0).tobytes())
+                else:
+                    values = array('d', (constant if value else 0.0 for value in self._values))
+                return KnowledgeScores._dense(self._table, values)
             return constant_scores(self.keys(), other)
         return coerce_scores(other)
 
+    def _operation(self, other: KnowledgeScores, operation: str, merge: Callable[[KnowledgeIndex, KnowledgeIndex], KnowledgeIndex], function: Callable[[float, float], float]) -> KnowledgeScores:
+        if self._shares_table(other):
+            assert self._table is not None and self._values is not None and other._values is not None
+            return KnowledgeScores._dense(self._table, _combine(self._values, other._values, operation))
+        table = self._table if self._table is not None else other._table
+        return KnowledgeScores({path: function(self[path], other[path]) for path in merge(self.keys(), other.keys())}, table=table)
+
     def __add__(self, other: int | float | KnowledgeScores | Knowledge) -> KnowledgeScores:
         """
         Adds scores from another object to this one, path by path.
 
         The resulting `KnowledgeScores` contains a union of paths from both operands.
         """
-        other = self._coerce_operand(other)
-        return KnowledgeScores({path: self[path] + other[path] for path in self.keys() | other.keys()})
+        return self._operation(self._coerce_operand(other), 'add', operator.or_, operator.add)
 
     def __radd__(self, other: int | float) -> KnowledgeScores:
         """Reverse add. See `__add__`."""
@@ -127,10 +302,12 @@ class KnowledgeScores(ValueTypeMixin):
         """
         # Local import to avoid circular dependency.
         from llobot.knowledge.ranking import KnowledgeRanking
+        if isinstance(other, KnowledgeIndex) and self._values is not None and other.table is self._table:
+            assert self._table is not None
+            return KnowledgeScores._dense(self._table, _mask(self._values, ((1 << len(self._values)) - 1) & ~other.bits))
         if isinstance(other, (KnowledgeSubset, str, KnowledgeIndex, KnowledgeRanking)):
             return self & ~coerce_subset(other)
-        other = self._coerce_operand(other)
-        return KnowledgeScores({path: self[path] - other[path] for path in self.keys() | other.keys()})
+        return self._operation(self._coerce_operand(other), 'sub', operator.or_, operator.sub)
 
     def __rsub__(self, other: int | float) -> KnowledgeScores:
         """Reverse subtract. See `__sub__`."""
@@ -146,8 +323,7 @@ class KnowledgeScores(ValueTypeMixin):
 
         Only paths present in both operands are kept.
         """
-        other = self._coerce_operand(other)
-        return KnowledgeScores({path: self[path] * other[path] for path in self.keys() & other.keys()})
+        return self._operation(self._coerce_operand(other), 'mul', operator.and_, operator.mul)
 
     def __rmul__(self, other: int | float) -> KnowledgeScores:
         """Reverse multiply. See `__mul__`."""
@@ -159,8 +335,7 @@ class KnowledgeScores(ValueTypeMixin):
 
         Only paths present in both operands are kept.
         """
-        other = self._coerce_operand(other)
-        return KnowledgeScores({path: self[path] / other[path] for path in self.keys() & other.keys()})
+        return self._operation(self._coerce_operand(other), 'div', operator.and_, operator.truediv)
 
     def __rtruediv__(self, other: int | float) -> KnowledgeScores:
         """Reverse divide. See `__truediv__`."""
@@ -172,8 +347,18 @@ class KnowledgeScores(ValueTypeMixin):
 
         This is equivalent to set intersection on paths.
         """
+        if isinstance(subset, Knowledge):
+            subset = subset.keys()
+        if self._values is not None:
+            assert self._table is not None
+            if isinstance(subset, KnowledgeIndex) and subset.table is self._table:
+                return KnowledgeScores._dense(self._table, _mask(self._values, subset.bits))
+            ids = _nonzero_ids(self._values)
+            kept = compress(ids, coerce_subset(subset).mask([self._table.path(id) for id in ids]))
+            return KnowledgeScores._dense(self._table, _mask(self._values, PathTable.id_bits(kept)))
         subset = coerce_subset(subset)
-        return KnowledgeScores({path: score for path, score in self if path in subset})
+        scores = self._dict()
+        return KnowledgeScores(dict(compress(scores.items(), subset.mask(scores))))
 
     def __or__(self, other: KnowledgeScores) -> KnowledgeScores:
         """
@@ -181,11 +366,17 @@ class KnowledgeScores(ValueTypeMixin):
 
         If a path exists in both, the score from `other` is used.
         """
-        return KnowledgeScores(self._scores | other._scores)
+        if self._shares_table(other):
+            assert self._table is not None and self._values is not None and other._values is not None
+            return KnowledgeScores._dense(self._table, _combine(self._values, other._values, 'or'))
+        table = self._table if self._table is not None else other._table
+        return KnowledgeScores(self._dict() | other._dict(), table=table)
 
     def total(self) -> float:
         """Calculates the sum of all scores."""
-        return sum(self._scores.values())
+        if self._values is not None:
+            return sum(self._values)
+        return sum(self._dict().values())
 
 def coerce_scores(what: KnowledgeScores | Knowledge | KnowledgeIndex | KnowledgeRanking) -> KnowledgeScores:
     """
@@ -0,0 +1,348 @@
+"""
+Scorers that remember their results on disk.
+
+Scoring with crawling and PageRank is expensive and it is repeated for
+unchanged knowledge after every restart. `CachedScorer` stores results in a
+`ScoreCache` keyed by identity of the scorer (see `value_identity()`),
+`Knowledge.digest`, and version of scoring code, so that they survive
+restarts, but not upgrades. `LazyKnowledge` is keyed
+by its `LazyKnowledge.fingerprint` instead, because its digest would read
+all documents.
+
+Every entry is a separate file in the cache directory, which makes writes
+atomic and eviction simple. Files hold a zlib-compressed, NUL-separated
+list of paths followed by little-endian doubles. Least recently used files
+are deleted when the directory grows over its capacity.
+"""
+from __future__ import annotations
+from array import array
+from collections import OrderedDict
+from functools import cache
+import hashlib
+import logging
+import os
+from pathlib import Path, PurePosixPath
+import struct
+import sys
+import threading
+from typing import TYPE_CHECKING, Iterable
+import zlib
+from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
+from llobot.knowledge.lazy import LazyKnowledge
+from llobot.knowledge.scores import KnowledgeScores
+from llobot.knowledge.scores.scorers import KnowledgeScorer
+from llobot.utils.fs import cache_home
+from llobot.utils.values import ValueTypeMixin, value_identity
+from llobot.utils.versions import package_version
+
+if TYPE_CHECKING:
+    from llobot.knowledge.tables import PathTable
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_SCORE_CACHE_CAPACITY = 256 * 1024 * 1024
+
+# Recently used scores are also kept in memory, so that repeated scoring does not read and decode files.
+_MEMORY_ENTRIES = 8
+
+_MAGIC = b'llobot-scores-1\n'
+
+# Version of scorers' output. Increment it whenever scoring changes in development versions of llobot.
+SCORE_CACHE_VERSION = 1
+_HEADER = struct.Struct('<II')
+_SUFFIX = '.scores'
+
+class ScoreCache:
+    """
+    Thread-safe cache of `KnowledgeScores`, optionally persisted to a directory.
+
+    Unreadable entries are treated as missing, because the cache is only an
+    optimization. I/O errors are logged and otherwise ignored.
+    """
+    _location: Path | None
+    _capacity: int
+    _lock: threading.Lock
+    _memory: OrderedDict[str, KnowledgeScores]
+
+    def __init__(self, location: Path | str | None = None, *, capacity: int = DEFAULT_SCORE_CACHE_CAPACITY):
+        """
+        Creates a new cache.
+
+        Args:
+            location: Directory that persists the cache or `None` for memory-only cache.
+            capacity: Maximum total size of persisted entries in bytes.
+        """
+        self._location = Path(location) if location is not None else None
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+
+    @property
+    def location(self) -> Path | None:
+        """Directory that persists the cache or `None` for memory-only cache."""
+        return self._location
+
+    def get(self, key: str, *, table: PathTable | None = None) -> KnowledgeScores | None:
+        """
+        Returns remembered scores or `None` if they are not remembered.
+
+        Args:
+            key: Key returned by `score_cache_key()`.
+            table: Path table of the scored knowledge. Remembered scores are
+                   rebuilt over it, so that they are as fast in operations
+                   with the knowledge as freshly computed scores.
+        """
+        with self._lock:
+            scores = self._memory.get(key)
+            if scores is not None:
+                self._memory.move_to_end(key)
+        if scores is not None:
+            return _retable(scores, table)
+        if self._location is None:
+            return None
+        path = self._location/(key + _SUFFIX)
+        try:
+            data = path.read_bytes()
+            # Reads refresh modification time, which makes eviction least recently used.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except OSError as ex:
+            _logger.warning(f'Cannot read score cache entry {path}: {ex}')
+            return None
+        scores = _decode(data, table)
+        if scores is None:
+            _logger.warning(f'Ignoring corrupted score cache entry {path}')
+            return None
+        self._remember(key, scores)
+        return scores
+
+    def put(self, key: str, scores: KnowledgeScores):
+        """
+        Remembers scores and writes them to disk if the cache is persistent.
+
+        Args:
+            key: Key returned by `score_cache_key()`.
+            scores: Scores to remember.
+        """
+        self._remember(key, scores)
+        if self._location is None:
+            return
+        path = self._location/(key + _SUFFIX)
+        temporary = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            self._location.mkdir(parents=True, exist_ok=True)
+            temporary.write_bytes(_encode(scores))
+            temporary.replace(path)
+        except OSError as ex:
+            _logger.warning(f'Cannot write score cache entry {path}: {ex}')
+            temporary.unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def clear(self):
+        """
+        Forgets all remembered scores, including those persisted on disk.
+        """
+        with self._lock:
+            self._memory.clear()
+        if self._location is None:
+            return
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, scores: KnowledgeScores):
+        with self._lock:
+            self._memory[key] = scores
+            self._memory.move_to_end(key)
+            while len(self._memory) > _MEMORY_ENTRIES:
+                self._memory.popitem(last=False)
+
+    def _entries(self) -> list[Path]:
+        assert self._location is not None
+        try:
+            return [path for path in self._location.iterdir() if path.name.endswith(_SUFFIX)]
+        except OSError:
+            return []
+
+    def _evict(self):
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self._capacity:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+def _encode(scores: KnowledgeScores) -> bytes:
+    paths = zlib.compress('\0'.join(str(path) for path, _ in scores).encode('utf-8'), 1)
+    values = array('d', (score for _, score in scores))
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return _MAGIC + _HEADER.pack(len(values), len(paths)) + paths + values.tobytes()
+
+def _retable(scores: KnowledgeScores, table: PathTable | None) -> KnowledgeScores:
+    if table is None or scores.table is table:
+        return scores
+    return KnowledgeScores(dict(scores), table=table)
+
+def _decode(data: bytes, table: PathTable | None = None) -> KnowledgeScores | None:
+    if not data.startswith(_MAGIC) or len(data) < len(_MAGIC) + _HEADER.size:
+        return None
+    count, length = _HEADER.unpack_from(data, len(_MAGIC))
+    start = len(_MAGIC) + _HEADER.size
+    if len(data) != start + length + 8 * count:
+        return None
+    try:
+        text = zlib.decompress(data[start:start + length]).decode('utf-8')
+    except (zlib.error, UnicodeDecodeError):
+        return None
+    paths = text.split('\0') if count else []
+    if len(paths) != count:
+        return None
+    values = array('d')
+    values.frombytes(data[start + length:])
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return KnowledgeScores(dict(zip(map(PurePosixPath, paths), values)), table=table)
+
+def score_cache_key(scorer: KnowledgeScorer | str, knowledge: Knowledge) -> str | None:
+    """
+    Computes the cache key for scores of the given knowledge.
+
+    Content of `LazyKnowledge` is identified by its fingerprint, so that
+    computing the key does not read any documents. The key also includes
+    `SCORE_CACHE_VERSION` and llobot version, so that scores computed by
+    older code are not reused.
+
+    Args:
+        scorer: The scorer or its identity string.
+        knowledge: The scored knowledge.
+
+    Returns:
+        Hexadecimal key that is stable across processes or `None` if lazy
+        knowledge has no fingerprint and thus cannot be cached.
+    """
+    if isinstance(knowledge, LazyKnowledge):
+        fingerprint = knowledge.fingerprint
+        if fingerprint is None:
+            return None
+        content = 'lazy:' + fingerprint
+    else:
+        content = knowledge.digest
+    identity = scorer if isinstance(scorer, str) else value_identity(scorer)
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f'{SCORE_CACHE_VERSION}/{package_version()}'.encode('utf-8'))
+    hasher.update(b'\0')
+    hasher.update(identity.encode('utf-8'))
+    hasher.update(b'\0')
+    hasher.update(content.encode('ascii'))
+    return hasher.hexdigest()
+
+@cache
+def standard_score_cache() -> ScoreCache:
+    """
+    Returns the process-wide score cache persisted under `cache_home()`.
+    """
+    return ScoreCache(cache_home()/'llobot/scores')
+
+class CachedScorer(KnowledgeScorer, ValueTypeMixin):
+    """
+    A scorer that remembers results of another scorer in a `ScoreCache`.
+
+    The wrapped scorer must be deterministic and its identity must be stable
+    across processes, which is true for value types composed of value types.
+    Only `score()` and `update()` are cached. `rescore()` and
+    `update_rescore()` depend on initial scores, so they are passed through
+    to the wrapped scorer.
+    """
+    _scorer: KnowledgeScorer
+    _cache: ScoreCache
+    _identity: str
+
+    def __init__(self, scorer: KnowledgeScorer, *, cache: ScoreCache | None = None):
+        """
+        Creates a new cached scorer.
+
+        Args:
+            scorer: The scorer whose results are cached.
+            cache: Cache for scores. Defaults to `standard_score_cache()`.
+        """
+        self._scorer = scorer
+        self._cache = cache if cache is not None else standard_score_cache()
+        self._identity = value_identity(scorer)
+
+    def _ephemeral_fields(self) -> Iterable[str]:
+        return ['_cache', '_identity']
+
+    @property
+    def scorer(self) -> KnowledgeScorer:
+        """The scorer whose results are cached."""
+        return self._scorer
+
+    @property
+    def cache(self) -> ScoreCache:
+        """Cache for scores."""
+        return self._cache
+
+    def score(self, knowledge: Knowledge) -> KnowledgeScores:
+        """
+        Returns remembered scores or scores the knowledge with the wrapped scorer.
+
+        Lazy knowledge without fingerprint is scored without the cache.
+
+        Args:
+            knowledge: The knowledge base to score.
+
+        Returns:
+            Scores from the wrapped scorer.
+        """
+        key = score_cache_key(self._identity, knowledge)
+        if key is None:
+            return self._scorer.score(knowledge)
+        scores = self._cache.get(key, table=knowledge.keys().table)
+        if scores is None:
+            scores = self._scorer.score(knowledge)
+            self._cache.put(key, scores)
+        return scores
+
+    def rescore(self, knowledge: Knowledge, initial: KnowledgeScores) -> KnowledgeScores:
+        """
+        Passes rescoring through to the wrapped scorer.
+        """
+        return self._scorer.rescore(knowledge, initial)
+
+    def update_rescore(self, knowledge: Knowledge, delta: KnowledgeDelta, initial: KnowledgeScores, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Passes updates of rescoring through to the wrapped scorer.
+        """
+        return self._scorer.update_rescore(knowledge, delta, initial, scores)
+
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Returns remembered scores or updates scores with the wrapped scorer.
+        """
+        key = score_cache_key(self._identity, knowledge)
+        if key is None:
+            return self._scorer.update(knowledge, delta, scores)
+        cached = self._cache.get(key, table=knowledge.keys().table)
+        if cached is None:
+            cached = self._scorer.update(knowledge, delta, scores)
+            self._cache.put(key, cached)
+        return cached
+
+__all__ = [
+    'DEFAULT_SCORE_CACHE_CAPACITY',
+    'SCORE_CACHE_VERSION',
+    'ScoreCache',
+    'score_cache_key',
+    'standard_score_cache',
+    'CachedScorer',
+]
@@ -2,12 +2,19 @@
 A scorer that chains multiple scorers together.
 """
 from __future__ import annotations
+import threading
+from typing import Iterable
+import weakref
 from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
 from llobot.knowledge.scores import KnowledgeScores
 from llobot.knowledge.scores.scorers import KnowledgeScorer
 from llobot.knowledge.scores.constant import constant_scores
 from llobot.utils.values import ValueTypeMixin
 
+# Number of recently scored knowledge versions per chain that newer knowledge can be scored incrementally from.
+_HISTORY_SIZE = 4
+
 class KnowledgeScorerChain(KnowledgeScorer, ValueTypeMixin):
     """
     A scorer that applies a sequence of other scorers.
@@ -16,8 +23,17 @@ class KnowledgeScorerChain(KnowledgeScorer, ValueTypeMixin):
     scores, then refines them with `rescore()` from the subsequent scorers. The
     `rescore()` method applies `rescore()` from all component scorers to the
     initial scores.
+
+    The chain remembers scores of every scorer for a few recently scored
+    versions of knowledge. If an ancestor of the knowledge (see
+    `Knowledge.parent`) was scored recently, the delta is forwarded to all
+    scorers via `update()` and `update_rescore()`, so that they can patch
+    their older scores. Scored knowledge is referenced weakly.
     """
     _scorers: tuple[KnowledgeScorer, ...]
+    _lock: threading.Lock
+    # Weakly referenced recently scored knowledge, whether it was rescored, and scores of every scorer, most recent last.
+    _history: list[tuple[weakref.ref[Knowledge], bool, tuple[KnowledgeScores, ...]]]
 
     def __init__(self, *scorers: KnowledgeScorer):
         """
@@ -35,11 +51,57 @@ class KnowledgeScorerChain(KnowledgeScorer, ValueTypeMixin):
             else:
                 flattened.append(scorer)
         self._scorers = tuple(flattened)
+        self._lock = threading.Lock()
+        self._history = []
+
+    def _ephemeral_fields(self) -> Iterable[str]:
+        return ['_lock', '_history']
+
+    def _run(self, knowledge: Knowledge, initial: KnowledgeScores | None, delta: KnowledgeDelta | None, previous: tuple[KnowledgeScores, ...] | None) -> KnowledgeScores:
+        """
+        Runs all scorers, updating their previous scores if there are any, and remembers the results.
+        """
+        stages = []
+        scores = initial
+        for index, scorer in enumerate(self._scorers):
+            if delta is None or previous is None:
+                scores = scorer.score(knowledge) if scores is None else scorer.rescore(knowledge, scores)
+            elif scores is None:
+                scores = scorer.update(knowledge, delta, previous[index])
+            else:
+                scores = scorer.update_rescore(knowledge, delta, scores, previous[index])
+            stages.append(scores)
+        assert scores is not None
+        with self._lock:
+            # Drop entries for knowledge that is gone or that is scored again in the same way.
+            rescored = initial is not None
+            alive = [entry for entry in self._history if (scored := entry[0]()) is not None and (scored is not knowledge or entry[1] != rescored)]
+            self._history = alive[-(_HISTORY_SIZE - 1):] + [(weakref.ref(knowledge), rescored, tuple(stages))]
+        return scores
+
+    def _lookup(self, knowledge: Knowledge, rescored: bool, scores: KnowledgeScores | None = None) -> tuple[Knowledge, tuple[KnowledgeScores, ...]] | None:
+        """
+        Finds scores of every scorer for the nearest recently scored proper ancestor or for the given final scores.
+        """
+        with self._lock:
+            history = [(scored, stages) for reference, mode, stages in reversed(self._history) if mode == rescored and (scored := reference()) is not None]
+        if scores is not None:
+            return next(((scored, stages) for scored, stages in history if stages[-1] is scores), None)
+        ancestor = knowledge.parent
+        while ancestor is not None:
+            found = next((stages for scored, stages in history if scored is ancestor), None)
+            if found is not None:
+                return ancestor, found
+            ancestor = ancestor.parent
+        return None
 
     def score(self, knowledge: Knowledge) -> KnowledgeScores:
         """
         Calculates scores by running the full chain.
 
+        If an ancestor of the knowledge was scored recently, scores of every
+        scorer are updated instead.
+
         Args:
             knowledge: The knowledge base to score.
 
@@ -48,15 +110,18 @@ class KnowledgeScorerChain(KnowledgeScorer, ValueTypeMixin):
         """
         if not self._scorers:
             return constant_scores(knowledge)
-        scores = self._scorers[0].score(knowledge)
-        for scorer in self._scorers[1:]:
-            scores = scorer.rescore(knowledge, scores)
-        return scores
+        base = self._lookup(knowledge, False)
+        if base is None:
+            return self._run(knowledge, None, None, None)
+        return self._run(knowledge, None, base[0].diff(knowledge), base[1])
 
     def rescore(self, knowledge: Knowledge, initial: KnowledgeScores) -> KnowledgeScores:
         """
         Recalculates scores by running the full chain on initial scores.
 
+        If an ancestor of the knowledge was rescored recently, the delta is
+        forwarded to every scorer's `update_rescore()`.
+
         Args:
             knowledge: The knowledge base to score.
             initial: The initial scores to start from.
@@ -64,10 +129,38 @@ class KnowledgeScorerChain(KnowledgeScorer, ValueTypeMixin):
         Returns:
             The new `KnowledgeScores`.
         """
-        scores = initial
-        for scorer in self._scorers:
-            scores = scorer.rescore(knowledge, scores)
-        return scores
+        if not self._scorers:
+            return initial
+        base = self._lookup(knowledge, True)
+        if base is None:
+            return self._run(knowledge, initial, None, None)
+        return self._run(knowledge, initial, base[0].diff(knowledge), base[1])
+
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Forwards the delta to every scorer if the chain remembers how it produced the older scores.
+
+        Otherwise the knowledge is scored with `score()`.
+        """
+        if not self._scorers:
+            return constant_scores(knowledge)
+        base = self._lookup(knowledge, False, scores)
+        if base is None:
+            return self.score(knowledge)
+        return self._run(knowledge, None, delta, base[1])
+
+    def update_rescore(self, knowledge: Knowledge, delta: KnowledgeDelta, initial: KnowledgeScores, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Forwards the delta to every scorer if the chain remembers how it produced the older scores.
+
+        Otherwise the knowledge is rescored with `rescore()`.
+        """
+        if not self._scorers:
+            return initial
+        base = self._lookup(knowledge, True, scores)
+        if base is None:
+            return self.rescore(knowledge, initial)
+        return self._run(knowledge, initial, delta, base[1])
 
 __all__ = [
     'KnowledgeScorerChain',
@@ -3,6 +3,7 @@ Scorers that assign a constant score.
 """
 from __future__ import annotations
 from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
 from llobot.knowledge.indexes import KnowledgeIndex, KnowledgeIndexPrecursor, coerce_index
 from llobot.knowledge.scores import KnowledgeScores
 from llobot.knowledge.scores.scorers import KnowledgeScorer
@@ -20,7 +21,7 @@ def constant_scores(keys: KnowledgeIndexPrecursor, score: float = 1) -> Knowledg
         A `KnowledgeScores` object with the constant scores.
     """
     keys = coerce_index(keys)
-    return KnowledgeScores({path: score for path in keys})
+    return KnowledgeScores({path: score for path in keys}, table=keys.table)
 
 class ConstantScorer(KnowledgeScorer, ValueTypeMixin):
     """
@@ -49,6 +50,14 @@ class ConstantScorer(KnowledgeScorer, ValueTypeMixin):
         """
         return constant_scores(knowledge, self._score)
 
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Adjusts scores for added and removed documents. Scores do not depend on content.
+        """
+        if not delta.structural:
+            return scores
+        return (scores - delta.removed) | constant_scores(delta.added, self._score)
+
 __all__ = [
     'constant_scores',
     'ConstantScorer',
@@ -2,12 +2,47 @@
 Functions to aggregate scores by directory.
 """
 from __future__ import annotations
+from collections import defaultdict
+import operator
 from pathlib import PurePosixPath
+from typing import Callable
 from llobot.knowledge import Knowledge
 from llobot.knowledge.indexes import KnowledgeIndex, KnowledgeIndexPrecursor
 from llobot.knowledge.scores import KnowledgeScores
 from llobot.knowledge.scores.constant import constant_scores
 
+def _aggregate(scores: KnowledgeScores, combine: Callable[[float, float], float], *, recursive: bool) -> KnowledgeScores:
+    """
+    Aggregates file scores by directory with the given function.
+
+    Files are grouped by their parent first. Directories are then rolled into
+    their parents from the deepest up, so that `PurePosixPath.parents` is not
+    enumerated for every file.
+    """
+    directory_scores: dict[PurePosixPath, float] = {}
+    for path, score in scores:
+        parent = path.parent
+        current = directory_scores.get(parent)
+        directory_scores[parent] = score if current is None else combine(current, score)
+    # Root is never scored.
+    directory_scores.pop(PurePosixPath('.'), None)
+    if recursive and directory_scores:
+        levels: defaultdict[int, list[PurePosixPath]] = defaultdict(list)
+        for directory in directory_scores:
+            levels[len(directory.parts)].append(directory)
+        # Directories at depth 1 have root as their parent.
+        for depth in range(max(levels), 1, -1):
+            for directory in levels[depth]:
+                parent = directory.parent
+                score = directory_scores[directory]
+                current = directory_scores.get(parent)
+                if current is None:
+                    directory_scores[parent] = score
+                    levels[depth - 1].append(parent)
+                else:
+                    directory_scores[parent] = combine(current, score)
+    return KnowledgeScores(directory_scores, table=scores.table)
+
 def directory_max_scores(scores: KnowledgeScores, *, recursive: bool = True) -> KnowledgeScores:
     """
     Assigns each directory the highest score among contained files.
@@ -19,22 +54,7 @@ def directory_max_scores(scores: KnowledgeScores, *, recursive: bool = True) ->
     Returns:
         Directory scores with maximum file score per directory.
     """
-    directory_scores = {}
-
-    for path, score in scores:
-        if recursive:
-            # Include all parent directories except root
-            directories = [p for p in path.parents if p != PurePosixPath('.')]
-        else:
-            # Include only immediate parent if it's not root
-            parent = path.parent
-            directories = [parent] if parent != PurePosixPath('.') else []
-
-        for directory in directories:
-            current_max = directory_scores.get(directory, float('-inf'))
-            directory_scores[directory] = max(current_max, score)
-
-    return KnowledgeScores(directory_scores)
+    return _aggregate(scores, max, recursive=recursive)
 
 def directory_sum_scores(scores: KnowledgeScores, *, recursive: bool = True) -> KnowledgeScores:
     """
@@ -47,21 +67,7 @@ def directory_sum_scores(scores: KnowledgeScores, *, recursive: bool = True) ->
     Returns:
         Directory scores with sum of file scores per directory.
     """
-    directory_scores = {}
-
-    for path, score in scores:
-        if recursive:
-            # Include all parent directories except root
-            directories = [p for p in path.parents if p != PurePosixPath('.')]
-        else:
-            # Include only immediate parent if it's not root
-            parent = path.parent
-            directories = [parent] if parent != PurePosixPath('.') else []
-
-        for directory in directories:
-            directory_scores[directory] = directory_scores.get(directory, 0) + score
-
-    return KnowledgeScores(directory_scores)
+    return _aggregate(scores, operator.add, recursive=recursive)
 
 def directory_count_scores(keys: KnowledgeIndexPrecursor, *, recursive: bool = True) -> KnowledgeScores:
     """
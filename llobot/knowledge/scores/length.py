@@ -3,6 +3,7 @@ Scorers based on document length.
 """
 from __future__ import annotations
 from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
 from llobot.knowledge.scores import KnowledgeScores
 from llobot.knowledge.scores.scorers import KnowledgeScorer
 from llobot.utils.values import ValueTypeMixin
@@ -11,13 +12,17 @@ def score_length(knowledge: Knowledge) -> KnowledgeScores:
     """
     Assigns a score equal to the length of the document content.
 
+    Lengths are taken from `Knowledge.size()`, so that lazily loaded
+    knowledge is scored by estimated sizes without reading documents.
+
     Args:
         knowledge: The knowledge base.
 
     Returns:
         `KnowledgeScores` with scores equal to document lengths.
     """
-    return KnowledgeScores({path: len(content) for path, content in knowledge})
+    keys = knowledge.keys()
+    return KnowledgeScores({path: knowledge.size(path) for path in keys}, table=keys.table)
 
 class LengthScorer(KnowledgeScorer, ValueTypeMixin):
     """
@@ -36,6 +41,12 @@ class LengthScorer(KnowledgeScorer, ValueTypeMixin):
         """
         return score_length(knowledge)
 
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Scores only added and modified documents.
+        """
+        return (scores - delta.changed) | score_length(knowledge & (delta.added | delta.modified))
+
 __all__ = [
     'score_length',
     'LengthScorer',
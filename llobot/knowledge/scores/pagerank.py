@@ -1,9 +1,20 @@
 """
 Scorers based on the PageRank algorithm over the knowledge graph.
+
+Power iteration runs on NumPy when it is installed, which is an optional
+dependency. Otherwise it falls back to pure Python over integer-addressed
+lists and arrays.
 """
 from __future__ import annotations
+from array import array
 from functools import lru_cache
+import itertools
+import logging
+import threading
+from typing import Iterable
+import weakref
 from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
 from llobot.knowledge.graphs import KnowledgeGraph
 from llobot.knowledge.indexes import KnowledgeIndex
 from llobot.knowledge.scores import KnowledgeScores
@@ -12,7 +23,148 @@ from llobot.knowledge.scores.constant import constant_scores
 from llobot.knowledge.graphs.crawler import KnowledgeCrawler, standard_knowledge_crawler
 from llobot.utils.values import ValueTypeMixin
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_logger = logging.getLogger(__name__)
+
+# Number of recently scored knowledge versions per scorer that newer knowledge can warm-start from.
+_HISTORY_SIZE = 4
+
+# Warm starts stop saving iterations when larger share of documents changes, so such knowledge is scored from scratch.
+_WARM_START_MAX_CHANGES = 0.1
+
+def _iterate_python(
+    out_degrees: list[int],
+    backlink_offsets: array[int],
+    backlink_sources: array[int],
+    initial_table: list[float],
+    start_table: list[float],
+    damping: float,
+    iterations: int,
+    tolerance: float,
+) -> tuple[list[float], int]:
+    count = len(out_degrees)
+    sinks = [i for i, degree in enumerate(out_degrees) if not degree]
+    scores = start_table
+    iteration = 0
+    while iteration < iterations:
+        iteration += 1
+        new_scores = [0.0] * count
+        sink_spread = sum(scores[source] for source in sinks) / count
+        shares = [score / degree if degree else 0.0 for score, degree in zip(scores, out_degrees)]
+        for target in range(count):
+            incoming = initial_table[target] * sink_spread
+            for index in range(backlink_offsets[target], backlink_offsets[target + 1]):
+                incoming += shares[backlink_sources[index]]
+            new_scores[target] = (1 - damping) * initial_table[target] + damping * incoming
+        delta = sum(abs(new_scores[i] - scores[i]) for i in range(count)) / count
+        scores = new_scores
+        if delta < tolerance:
+            break
+    return scores, iteration
+
+def _iterate_numpy(
+    out_degrees: list[int],
+    backlink_offsets: array[int],
+    backlink_sources: array[int],
+    initial_table: list[float],
+    start_table: list[float],
+    damping: float,
+    iterations: int,
+    tolerance: float,
+) -> tuple[list[float], int]:
+    assert numpy is not None
+    count = len(out_degrees)
+    degrees = numpy.array(out_degrees, dtype=numpy.float64)
+    sinks = degrees == 0
+    # Sinks get zero weight instead of division by zero.
+    inverse_degrees = numpy.divide(1.0, degrees, out=numpy.zeros(count), where=~sinks)
+    # Backlinks in CSR form expand into a target for every link, so that the sparse product is a weighted bincount.
+    # Arrays of type 'i' hold C ints, which match numpy.intc on every platform.
+    offsets = numpy.frombuffer(backlink_offsets, dtype=numpy.intc)
+    sources = numpy.frombuffer(backlink_sources, dtype=numpy.intc)
+    targets = numpy.repeat(numpy.arange(count), numpy.diff(offsets))
+    initial = numpy.array(initial_table, dtype=numpy.float64)
+    scores = numpy.array(start_table, dtype=numpy.float64)
+    iteration = 0
+    while iteration < iterations:
+        iteration += 1
+        sink_spread = scores[sinks].sum() / count
+        incoming = numpy.bincount(targets, weights=(scores * inverse_degrees)[sources], minlength=count)
+        new_scores = (1 - damping) * initial + damping * (initial * sink_spread + incoming)
+        delta = numpy.abs(new_scores - scores).sum() / count
+        scores = new_scores
+        if delta < tolerance:
+            break
+    return scores.tolist(), iteration
+
 @lru_cache(maxsize=2)
+def _pagerank(
+    graph: KnowledgeGraph,
+    nodes: KnowledgeIndex,
+    initial: KnowledgeScores,
+    start: KnowledgeScores,
+    damping: float,
+    iterations: int,
+    tolerance: float,
+    vectorized: bool,
+) -> tuple[KnowledgeScores, int]:
+    """
+    Runs PageRank, optionally warm-started from scores of a similar graph, and reports the number of iterations.
+    """
+    if not graph and not nodes:
+        return KnowledgeScores(), 0
+    # Both backends work directly on the graph's CSR arrays, because the neat version using our high-level classes was too slow.
+    # The reversed graph shares the node table, so node IDs need no translation.
+    backlinks = graph.reverse()
+    offsets = graph.offsets
+    backlink_offsets = backlinks.offsets
+    backlink_sources = backlinks.targets
+    paths = list(graph.paths)
+    # Nodes in the table without any links are only included when requested.
+    present = [
+        i for i in range(len(paths))
+        if offsets[i] != offsets[i + 1] or backlink_offsets[i] != backlink_offsets[i + 1] or paths[i] in nodes
+    ]
+    if len(present) < len(paths):
+        compact = [0] * len(paths)
+        for i, id in enumerate(present):
+            compact[id] = i
+        reversed_offsets = backlinks.offsets
+        reversed_targets = backlinks.targets
+        backlink_offsets = array('i', [0])
+        backlink_offsets.extend(itertools.accumulate(reversed_offsets[id + 1] - reversed_offsets[id] for id in present))
+        backlink_sources = array('i', (
+            compact[source]
+            for id in present
+            for source in reversed_targets[reversed_offsets[id]:reversed_offsets[id + 1]]
+        ))
+    out_degrees = [offsets[id + 1] - offsets[id] for id in present]
+    ranking = [paths[id] for id in present]
+    extra = list(nodes - KnowledgeIndex(paths))
+    if extra:
+        ranking += extra
+        out_degrees += [0] * len(extra)
+        backlink_offsets = backlink_offsets + array('i', [backlink_offsets[-1]] * len(extra))
+    count = len(ranking)
+    if initial:
+        initial_norm = count / initial.total() if initial.total() else 0
+        initial_table = [initial[path] * initial_norm for path in ranking] if initial_norm else [1.0] * count
+    else:
+        initial_table = [1.0] * count
+    if start:
+        # Paths that were not scored before start from their initial score.
+        start_table = [start[path] or initial_table[i] for i, path in enumerate(ranking)]
+    else:
+        start_table = initial_table
+    iterate = _iterate_numpy if vectorized else _iterate_python
+    scores, iteration = iterate(out_degrees, backlink_offsets, backlink_sources, initial_table, start_table, damping, iterations, tolerance)
+    # Scores are not sorted, because sorting paths would cost more than the whole power iteration.
+    return KnowledgeScores(dict(zip(ranking, scores)), table=nodes.table), iteration
+
 def pagerank_scores(
     graph: KnowledgeGraph,
     nodes: KnowledgeIndex = KnowledgeIndex(),
@@ -20,11 +172,17 @@ def pagerank_scores(
     *,
     damping: float = 0.85,
     iterations: int = 100,
-    tolerance: float = 1.0e-3
+    tolerance: float = 1.0e-3,
+    vectorized: bool | None = None,
+    start: KnowledgeScores = KnowledgeScores(),
 ) -> KnowledgeScores:
     """
     Calculates PageRank scores for documents in a knowledge graph.
 
+    Scores of sinks, documents without outgoing links, are spread over all
+    documents in proportion to initial scores. Iteration stops when mean
+    absolute change of scores drops below tolerance.
+
     Args:
         graph: The knowledge graph to run PageRank on.
         nodes: An optional set of nodes to include, even if not in the graph.
@@ -32,43 +190,82 @@ def pagerank_scores(
         damping: The damping factor for PageRank.
         iterations: The maximum number of iterations to run.
         tolerance: The convergence tolerance.
+        vectorized: Whether to iterate with NumPy. Defaults to using NumPy when it is installed.
+        start: Scores to start iteration from, typically scores of an older
+               version of the graph. Documents without a start score start
+               from their initial score. Converged scores do not depend on
+               the starting point, but good starting point saves iterations.
 
     Returns:
         The calculated PageRank scores.
+
+    Raises:
+        ValueError: If vectorized iteration is requested, but NumPy is not installed.
     """
-    if not graph and not nodes:
-        return KnowledgeScores()
-    # This implementation is optimized to use Python's built-in types and integer-addressed lists,
-    # because the neat version using our high-level classes was too slow.
-    backlinks = graph.reverse()
-    nodes = nodes | graph.keys() | backlinks.keys()
-    ranking = list(nodes.sorted())
-    path_ids = {path: i for i, path in enumerate(ranking)}
-    count = len(ranking)
-    graph_table = [tuple(path_ids[target] for target in graph[source]) for source in ranking]
-    backlinks_table = [tuple(path_ids[source] for source in backlinks[target]) for target in ranking]
-    sinks = [i for i, targets in enumerate(graph_table) if not targets]
-    if initial:
-        initial_norm = count / initial.total() if initial.total() else 0
-        initial_table = [initial[path] * initial_norm for path in ranking] if initial_norm else [1.0] * count
-    else:
-        initial_table = [1.0] * count
-    scores = initial_table
-    for _ in range(iterations):
-        new_scores = [0.0] * count
-        sink_spread = sum(scores[source] for source in sinks) / count if count else 0
-        for target in range(count):
-            incoming = initial_table[target] * sink_spread
-            for source in backlinks_table[target]:
-                targets = graph_table[source]
-                if targets:
-                    incoming += scores[source] / len(targets)
-            new_scores[target] = (1 - damping) * initial_table[target] + damping * incoming
-        delta = sum(abs(new_scores[i] - scores[i]) for i in range(count)) / count if count else 0
-        scores = new_scores
-        if delta < tolerance:
-            break
-    return KnowledgeScores({ranking[i]: scores[i] for i in range(count)})
+    if vectorized is None:
+        vectorized = numpy is not None
+    elif vectorized and numpy is None:
+        raise ValueError('Vectorized PageRank requires NumPy')
+    scores, _ = _pagerank(graph, nodes, initial, start, damping, iterations, tolerance, vectorized)
+    return scores
+
+class PageRankStats(ValueTypeMixin):
+    """
+    Statistics of warm-started PageRank runs in a `PageRankScorer`.
+
+    Every warm run is compared with the cold run that started its lineage.
+    Both ran with the same tolerance, because the scorer uses one tolerance
+    for all runs. Warm runs from scores whose lineage is unknown are not
+    compared. Runs served from the PageRank cache are counted as if they
+    were computed again.
+    """
+    _runs: int
+    _warm_runs: int
+    _iterations: int
+    _saved_iterations: int
+    _lost_iterations: int
+
+    def __init__(self, *, runs: int = 0, warm_runs: int = 0, iterations: int = 0, saved_iterations: int = 0, lost_iterations: int = 0):
+        """
+        Creates new PageRank statistics.
+
+        Args:
+            runs: Number of PageRank runs.
+            warm_runs: Number of runs that started from scores of an older knowledge version.
+            iterations: Total number of iterations in all runs.
+            saved_iterations: Net iterations saved by warm starts, negative if they took longer than cold starts.
+            lost_iterations: Iterations that warm starts took beyond their cold starts.
+        """
+        self._runs = runs
+        self._warm_runs = warm_runs
+        self._iterations = iterations
+        self._saved_iterations = saved_iterations
+        self._lost_iterations = lost_iterations
+
+    @property
+    def runs(self) -> int:
+        """Number of PageRank runs."""
+        return self._runs
+
+    @property
+    def warm_runs(self) -> int:
+        """Number of runs that started from scores of an older knowledge version."""
+        return self._warm_runs
+
+    @property
+    def iterations(self) -> int:
+        """Total number of iterations in all runs."""
+        return self._iterations
+
+    @property
+    def saved_iterations(self) -> int:
+        """Net iterations saved by warm starts, negative if they took longer than cold starts."""
+        return self._saved_iterations
+
+    @property
+    def lost_iterations(self) -> int:
+        """Iterations that warm starts took beyond their cold starts."""
+        return self._lost_iterations
 
 class PageRankScorer(KnowledgeScorer, ValueTypeMixin):
     """
@@ -78,6 +275,10 @@ class PageRankScorer(KnowledgeScorer, ValueTypeMixin):
     _damping: float
     _iterations: int
     _tolerance: float
+    _lock: threading.Lock
+    # Weakly referenced recently scored knowledge with its scores and iteration count of the cold start on its lineage if known, most recent last.
+    _history: list[tuple[weakref.ref[Knowledge], KnowledgeScores, int | None]]
+    _stats: PageRankStats
 
     def __init__(self,
         crawler: KnowledgeCrawler = standard_knowledge_crawler(),
@@ -98,6 +299,18 @@ class PageRankScorer(KnowledgeScorer, ValueTypeMixin):
         self._damping = damping
         self._iterations = iterations
         self._tolerance = tolerance
+        self._lock = threading.Lock()
+        self._history = []
+        self._stats = PageRankStats()
+
+    def _ephemeral_fields(self) -> Iterable[str]:
+        return ['_lock', '_history', '_stats']
+
+    @property
+    def stats(self) -> PageRankStats:
+        """Statistics of PageRank runs, including iterations saved by warm starts."""
+        with self._lock:
+            return self._stats
 
     def score(self, knowledge: Knowledge) -> KnowledgeScores:
         """
@@ -116,7 +329,19 @@ class PageRankScorer(KnowledgeScorer, ValueTypeMixin):
         Calculates PageRank scores, starting from a given set of initial scores.
 
         It first crawls the knowledge to build a graph, then runs the PageRank
-        algorithm on it.
+        algorithm on it. If an ancestor of the knowledge (see `Knowledge.parent`)
+        was scored recently and less than a tenth of documents changed since,
+        iteration starts from its scores, which usually converges in a few
+        iterations after small edits. Knowledge lineage thus serves as project
+        identity, because knowledge hash changes with every edit. Scored
+        knowledge is referenced weakly. `update_rescore()` starts from the
+        given older scores instead.
+
+        Warm and cold starts stop on the same test, when mean absolute change
+        of scores drops below tolerance. The test bounds distance from the
+        exact PageRank regardless of the starting point, so warm and cold
+        scores of the same knowledge differ by less than tolerance times
+        `damping / (1 - damping)` on average.
 
         Args:
             knowledge: The knowledge base to score.
@@ -125,17 +350,88 @@ class PageRankScorer(KnowledgeScorer, ValueTypeMixin):
         Returns:
             The calculated PageRank scores.
         """
+        return self._rank(knowledge, initial, None)
+
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Calculates PageRank scores for newer knowledge, starting iteration from older scores.
+
+        Args:
+            knowledge: The newer knowledge.
+            delta: Changes from the older knowledge to `knowledge`.
+            scores: Scores this scorer returned for the older knowledge.
+
+        Returns:
+            The calculated PageRank scores.
+        """
+        return self.update_rescore(knowledge, delta, constant_scores(knowledge), scores)
+
+    def update_rescore(self, knowledge: Knowledge, delta: KnowledgeDelta, initial: KnowledgeScores, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Calculates PageRank scores for newer knowledge, starting iteration from older scores.
+
+        Args:
+            knowledge: The newer knowledge.
+            delta: Changes from the older knowledge to `knowledge`.
+            initial: The initial scores to use for the PageRank calculation.
+            scores: Scores this scorer returned from `rescore()` for the older knowledge.
+
+        Returns:
+            The calculated PageRank scores.
+        """
+        return self._rank(knowledge, initial, (delta, scores))
+
+    def _rank(self, knowledge: Knowledge, initial: KnowledgeScores, start: tuple[KnowledgeDelta, KnowledgeScores] | None) -> KnowledgeScores:
         graph = self._crawler.crawl(knowledge)
-        return pagerank_scores(
+        with self._lock:
+            history = list(self._history)
+        # Older scores with iteration count of the cold start on their lineage, if known, and changes since.
+        base: tuple[KnowledgeScores, int | None, KnowledgeDelta] | None = None
+        if start is not None:
+            delta, older = start
+            cold = next((cold for _, scores, cold in reversed(history) if scores is older), None)
+            base = (older, cold, delta)
+        else:
+            # Only proper ancestors are considered, so that scoring the same knowledge again is a cache hit in `_pagerank()`.
+            ancestor = knowledge.parent
+            while base is None and ancestor is not None:
+                found = next(((scores, cold) for reference, scores, cold in reversed(history) if reference() is ancestor), None)
+                if found is not None:
+                    base = (found[0], found[1], ancestor.diff(knowledge))
+                ancestor = ancestor.parent
+        if base is not None:
+            delta = base[2]
+            if len(delta.added) + len(delta.removed) + len(delta.modified) > _WARM_START_MAX_CHANGES * len(knowledge):
+                base = None
+        scores, iterations = _pagerank(
             graph,
             knowledge.keys(),
             initial,
-            damping=self._damping,
-            iterations=self._iterations,
-            tolerance=self._tolerance
+            base[0] if base is not None else KnowledgeScores(),
+            self._damping,
+            self._iterations,
+            self._tolerance,
+            numpy is not None,
         )
+        cold_iterations = base[1] if base is not None else iterations
+        with self._lock:
+            # Drop entries for knowledge that is gone or that is scored again.
+            alive = [entry for entry in self._history if (scored := entry[0]()) is not None and scored is not knowledge]
+            self._history = alive[-(_HISTORY_SIZE - 1):] + [(weakref.ref(knowledge), scores, cold_iterations)]
+            stats = self._stats
+            self._stats = PageRankStats(
+                runs=stats.runs + 1,
+                warm_runs=stats.warm_runs + (base is not None),
+                iterations=stats.iterations + iterations,
+                saved_iterations=stats.saved_iterations + (cold_iterations - iterations if cold_iterations is not None else 0),
+                lost_iterations=stats.lost_iterations + (max(0, iterations - cold_iterations) if cold_iterations is not None else 0),
+            )
+        if base is not None:
+            _logger.debug(f'Warm-started PageRank converged in {iterations} iterations, cold start on its lineage took {cold_iterations}')
+        return scores
 
 __all__ = [
     'pagerank_scores',
+    'PageRankStats',
     'PageRankScorer',
 ]
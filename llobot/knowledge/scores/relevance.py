@@ -27,12 +27,13 @@ class PositiveRelevanceScorer(KnowledgeScorer, ValueTypeMixin):
         self._irrelevant_weight = irrelevant_weight
 
     def score(self, knowledge: Knowledge) -> KnowledgeScores:
+        keys = knowledge.keys()
         scores = {}
-        for path in knowledge.keys():
+        for path in keys:
             if self._blacklist and path in self._blacklist:
                 continue
             scores[path] = 1.0 if path in self._relevant else self._irrelevant_weight
-        return KnowledgeScores(scores)
+        return KnowledgeScores(scores, table=keys.table)
 
 class NegativeRelevanceScorer(KnowledgeScorer, ValueTypeMixin):
     """
@@ -52,12 +53,13 @@ class NegativeRelevanceScorer(KnowledgeScorer, ValueTypeMixin):
         self._irrelevant_weight = irrelevant_weight
 
     def score(self, knowledge: Knowledge) -> KnowledgeScores:
+        keys = knowledge.keys()
         scores = {}
-        for path in knowledge.keys():
+        for path in keys:
             if self._blacklist and path in self._blacklist:
                 continue
             scores[path] = self._irrelevant_weight if path in self._irrelevant else 1.0
-        return KnowledgeScores(scores)
+        return KnowledgeScores(scores, table=keys.table)
 
 __all__ = [
     'PositiveRelevanceScorer',
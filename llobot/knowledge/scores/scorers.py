@@ -5,6 +5,7 @@ from __future__ import annotations
 from functools import cache
 from pathlib import PurePosixPath
 from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
 from llobot.knowledge.indexes import KnowledgeIndex
 from llobot.knowledge.scores import KnowledgeScores
 from llobot.knowledge.subsets import KnowledgeSubset, coerce_subset
@@ -45,6 +46,44 @@ class KnowledgeScorer:
         """
         return initial * self.score(knowledge)
 
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Updates scores calculated for older knowledge to match newer knowledge.
+
+        The default implementation scores the new knowledge from scratch.
+        Scorers that score every document independently override it to score
+        only added and modified documents.
+
+        Args:
+            knowledge: The newer knowledge.
+            delta: Changes from the older knowledge to `knowledge`.
+            scores: Scores this scorer returned for the older knowledge.
+
+        Returns:
+            The same scores as `score(knowledge)` would return.
+        """
+        return self.score(knowledge)
+
+    def update_rescore(self, knowledge: Knowledge, delta: KnowledgeDelta, initial: KnowledgeScores, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Updates scores rescored for older knowledge to match newer knowledge.
+
+        This is the `rescore()` counterpart of `update()`. The default
+        implementation rescores the new knowledge from scratch. Scorers
+        that iterate towards a fixed point override it to start from the
+        older scores.
+
+        Args:
+            knowledge: The newer knowledge.
+            delta: Changes from the older knowledge to `knowledge`.
+            initial: The initial scores for the newer knowledge.
+            scores: Scores this scorer returned from `rescore()` for the older knowledge.
+
+        Returns:
+            The same scores as `rescore(knowledge, initial)` would return.
+        """
+        return self.rescore(knowledge, initial)
+
     def __or__(self, other: KnowledgeScorer) -> KnowledgeScorer:
         """
         Chains this scorer with another one.
@@ -78,10 +117,13 @@ def standard_scorer() -> KnowledgeScorer:
 
     The standard scorer first applies negative relevance to down-weight ancillary
     files, and then applies PageRank to propagate scores through the knowledge graph.
+    Results are remembered in `standard_score_cache()`, so that unchanged
+    knowledge is not scored again after restart.
     """
+    from llobot.knowledge.scores.cached import CachedScorer
     from llobot.knowledge.scores.pagerank import PageRankScorer
     from llobot.knowledge.scores.relevance import NegativeRelevanceScorer
-    return NegativeRelevanceScorer() | PageRankScorer()
+    return CachedScorer(NegativeRelevanceScorer() | PageRankScorer())
 
 __all__ = [
     'KnowledgeScorer',
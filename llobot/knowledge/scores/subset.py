@@ -3,6 +3,7 @@ Scorer for an explicit subset of documents.
 """
 from __future__ import annotations
 from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
 from llobot.knowledge.scores import KnowledgeScores
 from llobot.knowledge.scores.scorers import KnowledgeScorer
 from llobot.knowledge.subsets import KnowledgeSubset
@@ -39,6 +40,14 @@ class SubsetScorer(KnowledgeScorer, ValueTypeMixin):
         from llobot.knowledge.scores.constant import constant_scores
         return constant_scores(knowledge & self._subset, self._score)
 
+    def update(self, knowledge: Knowledge, delta: KnowledgeDelta, scores: KnowledgeScores) -> KnowledgeScores:
+        """
+        Adjusts scores for added and removed documents. Scores do not depend on content.
+        """
+        if not delta.structural:
+            return scores
+        return (scores - delta.removed) | self.score(knowledge & delta.added)
+
 __all__ = [
     'SubsetScorer',
 ]
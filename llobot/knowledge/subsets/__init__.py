@@ -11,6 +11,8 @@ using logical operators (`|`, `&`, `-`, `~`).
 
 Submodules
 ----------
+compiled
+    Compiles subsets into a single fast matcher.
 complement
     Inverts a subset.
 difference
@@ -25,6 +27,8 @@ fullmatch
     Matches paths against a glob-like pattern matching the whole path.
 intersection
     Computes the intersection of two subsets.
+memos
+    Bounded memo of membership test results.
 parsing
     Parses string patterns and files into subsets.
 paths
@@ -43,8 +47,11 @@ universal
     A subset that matches everything.
 """
 from __future__ import annotations
+from itertools import compress
+import threading
 from pathlib import PurePosixPath
-from typing import Iterable, TYPE_CHECKING
+from typing import Iterable, TYPE_CHECKING, cast
+from llobot.knowledge.subsets.memos import SubsetMemo
 
 if TYPE_CHECKING:
     from llobot.knowledge import Knowledge
@@ -52,15 +59,20 @@ if TYPE_CHECKING:
     from llobot.knowledge.ranking import KnowledgeRanking
     from llobot.knowledge.scores import KnowledgeScores
 
+# Guards lazy creation of memos, so that concurrent first lookups share one memo.
+_memo_lock = threading.Lock()
+
 class KnowledgeSubset:
     """
     A filter for knowledge paths.
 
     Subsets are predicates that determine whether a given path is part of the
     subset. They can be combined using logical operators (`|`, `&`, `-`, `~`).
-    Subsets cache their results for performance.
+    Subsets remember results of recent membership tests in a bounded memo.
+    Many paths can be tested at once with `mask()` and `filter()`. Subclasses
+    can speed them up by overriding `contains_many()`.
     """
-    _memory: dict[PurePosixPath, bool]
+    _memory: SubsetMemo
 
     def contains(self, path: PurePosixPath) -> bool:
         """
@@ -68,17 +80,91 @@ class KnowledgeSubset:
         """
         raise NotImplementedError
 
+    @property
+    def memo(self) -> SubsetMemo:
+        """
+        Memo of membership test results used by the `in` operator.
+
+        The memo can be resized and its statistics inspected. It is created
+        on first use with default capacity.
+        """
+        try:
+            return self._memory
+        except AttributeError:
+            with _memo_lock:
+                try:
+                    return self._memory
+                except AttributeError:
+                    self._memory = SubsetMemo()
+                    return self._memory
+
     def __contains__(self, path: PurePosixPath) -> bool:
         try:
-            memory = self._memory
+            memo = self._memory
         except AttributeError:
-            memory = self._memory = {}
-        accepted = memory.get(path, None)
+            memo = self.memo
+        accepted = memo.get(path)
         if accepted is None:
-            # We will cache the result forever. There aren't going to be that many different paths.
-            memory[path] = accepted = self.contains(path)
+            # Concurrent threads might compute the same result twice, which is harmless.
+            accepted = self.contains(path)
+            memo.put(path, accepted)
         return accepted
 
+    def contains_many(self, paths: list[PurePosixPath]) -> list[bool]:
+        """
+        Checks many paths at once without consulting the memo.
+
+        This is the bulk counterpart of `contains()`. The default
+        implementation calls `contains()` for every path. Subclasses override
+        it to evaluate the whole batch faster.
+
+        Args:
+            paths: The paths to check.
+
+        Returns:
+            List of results in the order of `paths`.
+        """
+        return [self.contains(path) for path in paths]
+
+    def mask(self, paths: Iterable[PurePosixPath]) -> list[bool]:
+        """
+        Tests membership of many paths at once.
+
+        This is the bulk counterpart of the `in` operator. Remembered results
+        are taken from the memo and the rest is evaluated in one batch with
+        `contains_many()`.
+
+        Args:
+            paths: The paths to test.
+
+        Returns:
+            List of membership test results in the order of `paths`.
+        """
+        paths = list(paths)
+        memo = self.memo
+        results = memo.get_many(paths)
+        missing = [i for i, accepted in enumerate(results) if accepted is None]
+        if missing:
+            missing_paths = [paths[i] for i in missing]
+            computed = self.contains_many(missing_paths)
+            memo.put_many(missing_paths, computed)
+            for i, accepted in zip(missing, computed):
+                results[i] = accepted
+        return cast(list[bool], results)
+
+    def filter(self, paths: Iterable[PurePosixPath]) -> list[PurePosixPath]:
+        """
+        Keeps only paths that are in the subset.
+
+        Args:
+            paths: The paths to filter.
+
+        Returns:
+            Paths in the subset in the order of `paths`.
+        """
+        paths = list(paths)
+        return list(compress(paths, self.mask(paths)))
+
     def __or__(self, other: KnowledgeSubset) -> KnowledgeSubset:
         from llobot.knowledge.subsets.union import UnionSubset
         return UnionSubset(self, other)
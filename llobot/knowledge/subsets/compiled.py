@@ -0,0 +1,284 @@
+"""
+Compilation of subsets into a single matcher.
+
+Subsets produced by `parse_pattern()` are unions of many small subsets, each
+of which inspects the path on its own, often via slow `PurePosixPath`
+methods. `compile_subset()` merges suffix, filename, and directory rules into
+hash lookups, anchored directory prefixes into a path component trie, and all
+remaining glob patterns into one regular expression. The result matches
+exactly the same paths as the original subset.
+"""
+from __future__ import annotations
+import glob
+import re
+from pathlib import PurePosixPath
+from typing import Iterable
+from llobot.knowledge.subsets import KnowledgeSubset
+from llobot.knowledge.subsets.complement import ComplementSubset
+from llobot.knowledge.subsets.difference import DifferenceSubset
+from llobot.knowledge.subsets.directory import DirectorySubset
+from llobot.knowledge.subsets.empty import EmptySubset
+from llobot.knowledge.subsets.filename import FilenameSubset
+from llobot.knowledge.subsets.intersection import IntersectionSubset
+from llobot.knowledge.subsets.pattern import PatternSubset, SimplePatternSubset
+from llobot.knowledge.subsets.suffix import SuffixSubset
+from llobot.knowledge.subsets.union import UnionSubset
+from llobot.utils.values import ValueTypeMixin
+
+# Full patterns of the form `some/literal/dir/**` match everything under the directory.
+_PREFIX_PATTERN = re.compile(r'^([^*?\[\]]+)/\*\*$')
+
+def _translate(pattern: str, *, recursive: bool) -> str:
+    """
+    Translates a glob to a regex with the same semantics as `PurePosixPath` matching.
+    """
+    return glob.translate(str(PurePosixPath(pattern)), recursive=recursive, include_hidden=True, seps='/')
+
+def _suffix(name: str) -> str | None:
+    """
+    Returns suffix of a filename by the same rules as `PurePosixPath.suffix` or `None` if there is none.
+    """
+    dot = name.rfind('.')
+    return name[dot:] if 0 < dot < len(name) - 1 else None
+
+def _alternation(patterns: tuple[str, ...]) -> re.Pattern | None:
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns)) if patterns else None
+
+class CompiledSubset(KnowledgeSubset, ValueTypeMixin):
+    """
+    A union of path rules evaluated with hash lookups, a trie, and one regex.
+
+    Use `compile_subset()` to obtain compiled subsets. Union with another
+    compiled subset via `|` merges the rules. Other combinators keep the
+    compiled operands.
+    """
+    _suffixes: frozenset[str]
+    _filenames: frozenset[str]
+    _directories: frozenset[str]
+    _prefixes: frozenset[str]
+    _name_patterns: tuple[str, ...]
+    _patterns: tuple[str, ...]
+    _trie: dict
+    _name_regex: re.Pattern | None
+    _regex: re.Pattern | None
+
+    def __init__(self, *,
+        suffixes: Iterable[str] = (),
+        filenames: Iterable[str] = (),
+        directories: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+        name_patterns: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+    ):
+        """
+        Creates a new compiled subset.
+
+        Args:
+            suffixes: File suffixes as in `SuffixSubset`.
+            filenames: Filenames as in `FilenameSubset`.
+            directories: Directory names as in `DirectorySubset`.
+            prefixes: Directories relative to the root, whose content is matched.
+            name_patterns: Regular expressions that must match the filename.
+            patterns: Regular expressions that must match the whole path.
+        """
+        self._suffixes = frozenset(suffixes)
+        self._filenames = frozenset(filenames)
+        self._directories = frozenset(directories)
+        self._prefixes = frozenset(prefixes)
+        self._name_patterns = tuple(dict.fromkeys(name_patterns))
+        self._patterns = tuple(dict.fromkeys(patterns))
+        self._trie = {}
+        for prefix in self._prefixes:
+            node = self._trie
+            for part in prefix.split('/'):
+                node = node.setdefault(part, {})
+            node[None] = True
+        self._name_regex = _alternation(self._name_patterns)
+        self._regex = _alternation(self._patterns)
+
+    def _ephemeral_fields(self) -> Iterable[str]:
+        return ['_memory', '_trie', '_name_regex', '_regex']
+
+    @property
+    def suffixes(self) -> frozenset[str]:
+        """File suffixes as in `SuffixSubset`."""
+        return self._suffixes
+
+    @property
+    def filenames(self) -> frozenset[str]:
+        """Filenames as in `FilenameSubset`."""
+        return self._filenames
+
+    @property
+    def directories(self) -> frozenset[str]:
+        """Directory names as in `DirectorySubset`."""
+        return self._directories
+
+    @property
+    def prefixes(self) -> frozenset[str]:
+        """Directories relative to the root, whose content is matched."""
+        return self._prefixes
+
+    @property
+    def name_patterns(self) -> tuple[str, ...]:
+        """Regular expressions that must match the filename."""
+        return self._name_patterns
+
+    @property
+    def patterns(self) -> tuple[str, ...]:
+        """Regular expressions that must match the whole path."""
+        return self._patterns
+
+    def _in_directories(self, text: str) -> bool:
+        parts = text.split('/')
+        if not self._directories.isdisjoint(parts):
+            return True
+        node = self._trie
+        for part in parts[:-1]:
+            node = node.get(part)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+
+    def contains(self, path: PurePosixPath) -> bool:
+        """
+        Checks whether the path matches any of the rules.
+
+        Args:
+            path: The path to check.
+
+        Returns:
+            `True` if any rule matches the path.
+        """
+        text = str(path)
+        name = text.rpartition('/')[2]
+        if name in self._filenames:
+            return True
+        if self._suffixes and _suffix(name) in self._suffixes:
+            return True
+        if (self._directories or self._trie) and self._in_directories(text):
+            return True
+        if self._name_regex is not None and self._name_regex.match(name) is not None:
+            return True
+        return self._regex is not None and self._regex.match(text) is not None
+
+    def contains_many(self, paths: list[PurePosixPath]) -> list[bool]:
+        """
+        Checks many paths one rule at a time.
+
+        Every rule is applied in one comprehension to all paths not yet
+        matched by previous rules.
+
+        Args:
+            paths: The paths to check.
+
+        Returns:
+            List of results in the order of `paths`.
+        """
+        texts = [str(path) for path in paths]
+        names = [text.rpartition('/')[2] for text in texts]
+        pending = list(range(len(texts)))
+        if self._filenames:
+            filenames = self._filenames
+            pending = [i for i in pending if names[i] not in filenames]
+        if self._suffixes:
+            suffixes = self._suffixes
+            pending = [i for i in pending if _suffix(names[i]) not in suffixes]
+        if self._directories or self._trie:
+            in_directories = self._in_directories
+            pending = [i for i in pending if not in_directories(texts[i])]
+        if self._name_regex is not None:
+            match = self._name_regex.match
+            pending = [i for i in pending if match(names[i]) is None]
+        if self._regex is not None:
+            match = self._regex.match
+            pending = [i for i in pending if match(texts[i]) is None]
+        result = [True] * len(texts)
+        for i in pending:
+            result[i] = False
+        return result
+
+    def __or__(self, other: KnowledgeSubset) -> KnowledgeSubset:
+        other = compile_subset(other)
+        if isinstance(other, CompiledSubset):
+            return CompiledSubset(
+                suffixes=self._suffixes | other._suffixes,
+                filenames=self._filenames | other._filenames,
+                directories=self._directories | other._directories,
+                prefixes=self._prefixes | other._prefixes,
+                name_patterns=self._name_patterns + other._name_patterns,
+                patterns=self._patterns + other._patterns,
+            )
+        return UnionSubset(self, other)
+
+    def __and__(self, other: KnowledgeSubset) -> KnowledgeSubset:
+        return IntersectionSubset(self, compile_subset(other))
+
+    def __sub__(self, other: KnowledgeSubset) -> KnowledgeSubset:
+        return DifferenceSubset(self, compile_subset(other))
+
+def _compile_leaf(subset: KnowledgeSubset) -> CompiledSubset | None:
+    if isinstance(subset, SuffixSubset):
+        return CompiledSubset(suffixes=subset.suffixes)
+    if isinstance(subset, FilenameSubset):
+        return CompiledSubset(filenames=subset.names)
+    if isinstance(subset, DirectorySubset):
+        return CompiledSubset(directories=subset.directories)
+    if isinstance(subset, PatternSubset):
+        prefix = _PREFIX_PATTERN.match(subset.pattern)
+        if prefix and not subset.pattern.startswith('/'):
+            return CompiledSubset(prefixes=[str(PurePosixPath(prefix.group(1)))])
+        return CompiledSubset(patterns=[_translate(subset.pattern, recursive=True)])
+    if isinstance(subset, SimplePatternSubset):
+        # Relative patterns are matched from the right. Most of them have only one component, which is matched against the filename.
+        if '/' not in str(PurePosixPath(subset.pattern)):
+            return CompiledSubset(name_patterns=[_translate(subset.pattern, recursive=False)])
+        return CompiledSubset(patterns=['(?s:.*/)?' + _translate(subset.pattern, recursive=False)])
+    if isinstance(subset, EmptySubset):
+        return CompiledSubset()
+    return None
+
+def compile_subset(subset: KnowledgeSubset) -> KnowledgeSubset:
+    """
+    Compiles a subset, so that it matches paths faster.
+
+    Suffix, filename, directory, and pattern subsets are compiled into
+    `CompiledSubset`. Compiled members of unions are merged into one compiled
+    subset. Intersections, differences, and complements are rebuilt from
+    compiled operands. Other subsets are returned unchanged.
+
+    Args:
+        subset: The subset to compile.
+
+    Returns:
+        A subset that contains the same paths.
+    """
+    if isinstance(subset, CompiledSubset):
+        return subset
+    leaf = _compile_leaf(subset)
+    if leaf is not None:
+        return leaf
+    if isinstance(subset, UnionSubset):
+        merged = CompiledSubset()
+        others = []
+        for member in subset.subsets:
+            compiled = compile_subset(member)
+            if isinstance(compiled, CompiledSubset):
+                merged = merged | compiled
+            else:
+                others.append(compiled)
+        return UnionSubset(merged, *others) if others else merged
+    if isinstance(subset, IntersectionSubset):
+        return IntersectionSubset(*(compile_subset(member) for member in subset.subsets))
+    if isinstance(subset, DifferenceSubset):
+        return DifferenceSubset(compile_subset(subset.minuend), compile_subset(subset.subtrahend))
+    if isinstance(subset, ComplementSubset):
+        return ComplementSubset(compile_subset(subset.subset))
+    return subset
+
+__all__ = [
+    'CompiledSubset',
+    'compile_subset',
+]
@@ -3,6 +3,7 @@ A subset that inverts the logic of another subset.
 """
 from __future__ import annotations
 from pathlib import PurePosixPath
+from typing import Iterable
 from llobot.utils.values import ValueTypeMixin
 from llobot.knowledge.subsets import KnowledgeSubset
 
@@ -23,6 +24,11 @@ class ComplementSubset(KnowledgeSubset, ValueTypeMixin):
         """
         self._subset = subset
 
+    @property
+    def subset(self) -> KnowledgeSubset:
+        """The inverted subset."""
+        return self._subset
+
     def contains(self, path: PurePosixPath) -> bool:
         """
         Checks if the path is NOT in the original subset.
@@ -35,6 +41,21 @@ class ComplementSubset(KnowledgeSubset, ValueTypeMixin):
         """
         return not self._subset.contains(path)
 
+    def contains_many(self, paths: list[PurePosixPath]) -> list[bool]:
+        """
+        Tests many paths by inverting bulk results of the original subset.
+        """
+        return [not hit for hit in self._subset.contains_many(paths)]
+
+    def mask(self, paths: Iterable[PurePosixPath]) -> list[bool]:
+        """
+        Tests membership of many paths using memo of the original subset.
+
+        Complements are often created on the fly, for example by `-` on
+        knowledge containers, so their own memo would be discarded right away.
+        """
+        return [not hit for hit in self._subset.mask(paths)]
+
 __all__ = [
     'ComplementSubset',
 ]
@@ -26,6 +26,16 @@ class DifferenceSubset(KnowledgeSubset, ValueTypeMixin):
         self._minuend = minuend
         self._subtrahend = subtrahend
 
+    @property
+    def minuend(self) -> KnowledgeSubset:
+        """The subset to subtract from."""
+        return self._minuend
+
+    @property
+    def subtrahend(self) -> KnowledgeSubset:
+        """The subset to subtract."""
+        return self._subtrahend
+
     def contains(self, path: PurePosixPath) -> bool:
         """
         Checks if a path is in the first subset and not in the second.
@@ -38,6 +48,17 @@ class DifferenceSubset(KnowledgeSubset, ValueTypeMixin):
         """
         return self._minuend.contains(path) and not self._subtrahend.contains(path)
 
+    def contains_many(self, paths: list[PurePosixPath]) -> list[bool]:
+        """
+        Tests many paths, passing only paths in `minuend` to `subtrahend`.
+        """
+        result = self._minuend.contains_many(paths)
+        candidates = [i for i, hit in enumerate(result) if hit]
+        for i, hit in zip(candidates, self._subtrahend.contains_many([paths[i] for i in candidates])):
+            if hit:
+                result[i] = False
+        return result
+
 __all__ = [
     'DifferenceSubset',
 ]
@@ -24,6 +24,11 @@ class DirectorySubset(KnowledgeSubset, ValueTypeMixin):
         """
         self._directories = frozenset(directories)
 
+    @property
+    def directories(self) -> frozenset[str]:
+        """The names of the directories to match."""
+        return self._directories
+
     def contains(self, path: PurePosixPath) -> bool:
         """
         Checks if the path is in any of the specified directories.
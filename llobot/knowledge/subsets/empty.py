@@ -23,6 +23,12 @@ class EmptySubset(KnowledgeSubset, ValueTypeMixin):
         """
         return False
 
+    def contains_many(self, paths: list[PurePosixPath]) -> list[bool]:
+        """
+        Returns `False` for every path.
+        """
+        return [False for _ in paths]
+
 __all__ = [
     'EmptySubset',
 ]
@@ -21,6 +21,11 @@ class FilenameSubset(KnowledgeSubset, ValueTypeMixin):
         """
         self._names = frozenset(names)
 
+    @property
+    def names(self) -> frozenset[str]:
+        """The filenames to match."""
+        return self._names
+
     def contains(self, path: PurePosixPath) -> bool:
         """
         Checks if the path's filename is in the set of specified names.
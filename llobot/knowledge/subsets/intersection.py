@@ -30,6 +30,11 @@ class IntersectionSubset(KnowledgeSubset, ValueTypeMixin):
                 flattened.append(subset)
         self._subsets = tuple(flattened)
 
+    @property
+    def subsets(self) -> tuple[KnowledgeSubset, ...]:
+        """The subsets to intersect."""
+        return self._subsets
+
     def contains(self, path: PurePosixPath) -> bool:
         """
         Checks if a path is in all of the component subsets.
@@ -42,6 +47,22 @@ class IntersectionSubset(KnowledgeSubset, ValueTypeMixin):
         """
         return all(subset.contains(path) for subset in self._subsets)
 
+    def contains_many(self, paths: list[PurePosixPath]) -> list[bool]:
+        """
+        Tests many paths, passing only still matching paths to every next subset.
+        """
+        result = [True] * len(paths)
+        pending = list(range(len(paths)))
+        for subset in self._subsets:
+            if not pending:
+                break
+            accepted = subset.contains_many([paths[i] for i in pending])
+            for i, hit in zip(pending, accepted):
+                if not hit:
+                    result[i] = False
+            pending = [i for i, hit in zip(pending, accepted) if hit]
+        return result
+
 __all__ = [
     'IntersectionSubset',
 ]
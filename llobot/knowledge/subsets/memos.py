@@ -0,0 +1,184 @@
+"""
+Bounded memo for subset membership.
+
+Every `KnowledgeSubset` remembers results of recent membership tests in a
+`SubsetMemo`. Standard subsets are shared process-wide and tested against
+paths of every project served by the process, so the memo is a bounded LRU
+cache rather than an ever-growing dictionary.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+import threading
+from pathlib import PurePosixPath
+from llobot.utils.values import ValueTypeMixin
+
+DEFAULT_MEMO_CAPACITY = 131072
+
+class SubsetMemoStats(ValueTypeMixin):
+    """
+    Statistics of a `SubsetMemo`.
+    """
+    _hits: int
+    _misses: int
+    _evictions: int
+    _size: int
+    _capacity: int
+
+    def __init__(self, *, hits: int = 0, misses: int = 0, evictions: int = 0, size: int = 0, capacity: int = 0):
+        """
+        Creates new memo statistics.
+
+        Args:
+            hits: Number of lookups answered from the memo.
+            misses: Number of lookups not found in the memo.
+            evictions: Number of entries dropped to stay within capacity.
+            size: Current number of entries.
+            capacity: Maximum number of entries.
+        """
+        self._hits = hits
+        self._misses = misses
+        self._evictions = evictions
+        self._size = size
+        self._capacity = capacity
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups answered from the memo."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups not found in the memo."""
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """Number of entries dropped to stay within capacity."""
+        return self._evictions
+
+    @property
+    def size(self) -> int:
+        """Current number of entries."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of entries."""
+        return self._capacity
+
+class SubsetMemo:
+    """
+    Thread-safe LRU cache of membership test results.
+    """
+    _capacity: int
+    _lock: threading.Lock
+    _entries: OrderedDict[PurePosixPath, bool]
+    _hits: int
+    _misses: int
+    _evictions: int
+
+    def __init__(self, capacity: int = DEFAULT_MEMO_CAPACITY):
+        """
+        Creates an empty memo.
+
+        Args:
+            capacity: Maximum number of remembered paths. Zero disables the memo.
+        """
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of remembered paths."""
+        return self._capacity
+
+    @property
+    def stats(self) -> SubsetMemoStats:
+        """Snapshot of memo statistics."""
+        with self._lock:
+            return SubsetMemoStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                capacity=self._capacity,
+            )
+
+    def get(self, path: PurePosixPath) -> bool | None:
+        """
+        Returns remembered result for a path or `None` if it is not remembered.
+        """
+        with self._lock:
+            accepted = self._entries.get(path)
+            if accepted is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(path)
+            return accepted
+
+    def get_many(self, paths: list[PurePosixPath]) -> list[bool | None]:
+        """
+        Returns remembered results for many paths, `None` for paths that are not remembered.
+        """
+        with self._lock:
+            entries = self._entries
+            results = [entries.get(path) for path in paths]
+            hits = len(results) - results.count(None)
+            self._hits += hits
+            self._misses += len(results) - hits
+            if hits:
+                for path, accepted in zip(paths, results):
+                    if accepted is not None:
+                        entries.move_to_end(path)
+            return results
+
+    def put(self, path: PurePosixPath, accepted: bool):
+        """
+        Remembers result for a path, evicting the least recently used paths if necessary.
+        """
+        with self._lock:
+            self._entries[path] = accepted
+            self._entries.move_to_end(path)
+            self._trim()
+
+    def put_many(self, paths: list[PurePosixPath], accepted: list[bool]):
+        """
+        Remembers results for many paths at once.
+        """
+        with self._lock:
+            entries = self._entries
+            for path, hit in zip(paths, accepted):
+                entries[path] = hit
+                entries.move_to_end(path)
+            self._trim()
+
+    def resize(self, capacity: int):
+        """
+        Changes capacity, evicting paths if the memo is too large.
+        """
+        with self._lock:
+            self._capacity = capacity
+            self._trim()
+
+    def clear(self):
+        """
+        Forgets all remembered results. Statistics are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _trim(self):
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+__all__ = [
+    'DEFAULT_MEMO_CAPACITY',
+    'SubsetMemoStats',
+    'SubsetMemo',
+]
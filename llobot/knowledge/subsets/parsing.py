@@ -7,6 +7,7 @@ import inspect
 from importlib import resources
 import re
 from llobot.knowledge.subsets import KnowledgeSubset
+from llobot.knowledge.subsets.compiled import compile_subset
 from llobot.knowledge.subsets.directory import DirectorySubset
 from llobot.knowledge.subsets.empty import EmptySubset
 from llobot.knowledge.subsets.filename import FilenameSubset
@@ -111,6 +112,9 @@ def load_subset(filename: str, *, package: str | None = None) -> KnowledgeSubset
     """
     Load patterns from a resource file and parse them into a subset.
 
+    Resource files typically contain long pattern lists that are applied to
+    many paths, so the subset is compiled with `compile_subset()`.
+
     Args:
         filename: The name of the resource file.
         package: The package where the resource file is located. If `None`,
@@ -128,7 +132,7 @@ def load_subset(filename: str, *, package: str | None = None) -> KnowledgeSubset
             raise RuntimeError("Cannot infer package from stack frame.")
         package = frame.f_globals['__name__']
     content = (resources.files(package) / filename).read_text()
-    return parse_subset(content)
+    return compile_subset(parse_subset(content))
 
 
 __all__ = [
@@ -37,6 +37,13 @@ class PathsSubset(KnowledgeSubset, ValueTypeMixin):
         """
         return path in self._paths
 
+    def contains_many(self, paths: list[PurePosixPath]) -> list[bool]:
+        """
+        Tests many paths with plain lookups in the index.
+        """
+        index = self._paths
+        return [path in index for path in paths]
+
 __all__ = [
     'PathsSubset',
 ]
@@ -25,6 +25,11 @@ class PatternSubset(KnowledgeSubset, ValueTypeMixin):
         """
         self._pattern = pattern
 
+    @property
+    def pattern(self) -> str:
+        """The glob pattern."""
+        return self._pattern
+
     def contains(self, path: PurePosixPath) -> bool:
         """
         Checks if the path fully matches the pattern.
@@ -57,6 +62,11 @@ class SimplePatternSubset(KnowledgeSubset, ValueTypeMixin):
         """
         self._pattern = pattern
 
+    @property
+    def pattern(self) -> str:
+        """The glob pattern."""
+        return self._pattern
+
     def contains(self, path: PurePosixPath) -> bool:
         """
         Checks if the path matches the pattern using `path.match`.
@@ -33,6 +33,13 @@ class SoloSubset(KnowledgeSubset, ValueTypeMixin):
         """
         return self._path == path
 
+    def contains_many(self, paths: list[PurePosixPath]) -> list[bool]:
+        """
+        Tests many paths by comparing them with the single path.
+        """
+        own = self._path
+        return [own == path for path in paths]
+
 __all__ = [
     'SoloSubset',
 ]
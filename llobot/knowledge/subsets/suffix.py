@@ -21,6 +21,11 @@ class SuffixSubset(KnowledgeSubset, ValueTypeMixin):
         """
         self._suffixes = frozenset(suffixes)
 
+    @property
+    def suffixes(self) -> frozenset[str]:
+        """The file suffixes to match."""
+        return self._suffixes
+
     def contains(self, path: PurePosixPath) -> bool:
         """
         Checks if the path's suffix is in the set of specified suffixes.
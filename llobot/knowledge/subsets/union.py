@@ -30,6 +30,11 @@ class UnionSubset(KnowledgeSubset, ValueTypeMixin):
                 flattened.append(subset)
         self._subsets = tuple(flattened)
 
+    @property
+    def subsets(self) -> tuple[KnowledgeSubset, ...]:
+        """The component subsets."""
+        return self._subsets
+
     def contains(self, path: PurePosixPath) -> bool:
         """
         Checks if a path is in any of the component subsets.
@@ -42,6 +47,22 @@ class UnionSubset(KnowledgeSubset, ValueTypeMixin):
         """
         return any(subset.contains(path) for subset in self._subsets)
 
+    def contains_many(self, paths: list[PurePosixPath]) -> list[bool]:
+        """
+        Tests many paths, passing only still unmatched paths to every next subset.
+        """
+        result = [False] * len(paths)
+        pending = list(range(len(paths)))
+        for subset in self._subsets:
+            if not pending:
+                break
+            accepted = subset.contains_many([paths[i] for i in pending])
+            for i, hit in zip(pending, accepted):
+                if hit:
+                    result[i] = True
+            pending = [i for i, hit in zip(pending, accepted) if not hit]
+        return result
+
 __all__ = [
     'UnionSubset',
 ]
@@ -23,6 +23,12 @@ class UniversalSubset(KnowledgeSubset, ValueTypeMixin):
         """
         return True
 
+    def contains_many(self, paths: list[PurePosixPath]) -> list[bool]:
+        """
+        Returns `True` for every path.
+        """
+        return [True for _ in paths]
+
 __all__ = [
     'UniversalSubset',
 ]
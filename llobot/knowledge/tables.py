@@ -0,0 +1,101 @@
+"""
+Interning of paths to dense integer IDs.
+
+`PathTable` assigns consecutive integer IDs to paths. Sets of interned paths
+can be then represented as Python integers with one bit per ID, which turns
+set operations into word-level bitwise operations. Scores of interned paths
+can be similarly stored in dense arrays indexed by ID. `Knowledge` owns a table
+that is shared with knowledge derived from it by filtering and merging, so
+that indexes of related knowledge can be combined without hashing paths.
+"""
+from __future__ import annotations
+import threading
+from pathlib import PurePosixPath
+from typing import Iterable
+
+class PathTable:
+    """
+    Thread-safe, append-only mapping between paths and dense integer IDs.
+
+    Tables are compared by identity. Bitsets produced by one table are
+    meaningless with any other table.
+    """
+    _lock: threading.Lock
+    _ids: dict[PurePosixPath, int]
+    _paths: list[PurePosixPath]
+
+    def __init__(self):
+        """
+        Creates an empty table.
+        """
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._paths = []
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def find(self, path: PurePosixPath) -> int | None:
+        """
+        Returns ID of an interned path or `None` if the path is not interned.
+        """
+        return self._ids.get(path)
+
+    def intern(self, path: PurePosixPath) -> int:
+        """
+        Returns ID of a path, assigning the next free ID if necessary.
+        """
+        found = self._ids.get(path)
+        if found is not None:
+            return found
+        with self._lock:
+            found = self._ids.get(path)
+            if found is None:
+                found = len(self._paths)
+                self._paths.append(path)
+                self._ids[path] = found
+            return found
+
+    def path(self, id: int) -> PurePosixPath:
+        """
+        Returns the path with given ID.
+        """
+        return self._paths[id]
+
+    def bits(self, paths: Iterable[PurePosixPath]) -> int:
+        """
+        Interns paths and returns them as a bitset.
+        """
+        return PathTable.id_bits([self.intern(path) for path in paths])
+
+    @staticmethod
+    def id_bits(ids: Iterable[int]) -> int:
+        """
+        Returns a bitset with the given IDs.
+        """
+        ids = list(ids)
+        if not ids:
+            return 0
+        # Setting bits in a bytearray is linear, while repeatedly OR-ing bits into an int is quadratic.
+        buffer = bytearray(max(ids) // 8 + 1)
+        for id in ids:
+            buffer[id >> 3] |= 1 << (id & 7)
+        return int.from_bytes(buffer, 'little')
+
+    @staticmethod
+    def ids(bits: int) -> list[int]:
+        """
+        Returns IDs in a bitset in ascending order.
+        """
+        return [id for id, bit in enumerate(bin(bits)[:1:-1]) if bit == '1']
+
+    def paths(self, bits: int) -> list[PurePosixPath]:
+        """
+        Returns paths in a bitset in ID order.
+        """
+        paths = self._paths
+        return [paths[id] for id in PathTable.ids(bits)]
+
+__all__ = [
+    'PathTable',
+]
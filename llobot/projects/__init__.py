@@ -21,6 +21,10 @@ union
     A project that is a union of multiple projects.
 items
     Defines item types that can be part of a project (file, directory, link).
+snapshots
+    Process-wide cache of project snapshots validated by file stat data.
+mirrors
+    Live in-memory mirrors of directory projects, kept up to date by inotify.
 """
 from __future__ import annotations
 from pathlib import Path, PurePosixPath
@@ -80,6 +84,27 @@ class Project:
         """
         return None
 
+    def read_many(self, paths: Iterable[PurePosixPath]) -> Knowledge:
+        """
+        Reads several files at once.
+
+        The default implementation calls `read()` for every path. Subclasses
+        may override it to route or read files in bulk.
+
+        Args:
+            paths: Paths of the files to read.
+
+        Returns:
+            Knowledge with content of the files that exist and can be read,
+            in the order of `paths`.
+        """
+        docs = {}
+        for path in paths:
+            content = self.read(path)
+            if content is not None:
+                docs[path] = content
+        return Knowledge(docs)
+
     def tracked(self, item: ProjectItem) -> bool:
         """
         Indicates whether an item should be included in project-derived knowledge.
@@ -116,29 +141,46 @@ class Project:
             if isinstance(item, ProjectDirectory) and self.tracked(item):
                 yield from self.walk(item.path)
 
+    def tracked_files(self) -> list[PurePosixPath]:
+        """
+        Lists all tracked files in the project.
+
+        Files are listed in walk order. The default implementation filters the
+        output of `walk()`. Subclasses may override it with faster enumeration.
+
+        Returns:
+            A list of paths of tracked files.
+        """
+        return [item.path for item in self.walk() if isinstance(item, ProjectFile) and self.tracked(item)]
+
     def index(self) -> KnowledgeIndex:
         """
         Returns a KnowledgeIndex of all tracked files in the project.
         """
         from llobot.knowledge.indexes import KnowledgeIndex
-        files = []
-        for item in self.walk():
-            if isinstance(item, ProjectFile) and self.tracked(item):
-                files.append(item.path)
-        return KnowledgeIndex(files)
+        return KnowledgeIndex(self.tracked_files())
 
     def read_all(self) -> Knowledge:
         """
         Reads all tracked files and returns them as a Knowledge object.
         """
         docs = {}
-        for item in self.walk():
-            if isinstance(item, ProjectFile) and self.tracked(item):
-                content = self.read(item.path)
-                if content is not None:
-                    docs[item.path] = content
+        for path in self.tracked_files():
+            content = self.read(path)
+            if content is not None:
+                docs[path] = content
         return Knowledge(docs)
 
+    def read_lazy(self) -> Knowledge:
+        """
+        Returns tracked files as knowledge that may read content on demand.
+
+        Projects backed by storage may return `LazyKnowledge`, which can be
+        ranked and budgeted using estimated document sizes without reading
+        all files. The default implementation returns `read_all()`.
+        """
+        return self.read_all()
+
     def __or__(self, other: Project) -> Project:
         """
         Creates a union of this project and another project.
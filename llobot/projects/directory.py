@@ -1,16 +1,26 @@
 from __future__ import annotations
+import os
+import stat
 import subprocess
+import time
 from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Iterable
+from llobot.knowledge import Knowledge
 from llobot.knowledge.subsets import KnowledgeSubset
 from llobot.knowledge.subsets.standard import blacklist_subset
 from llobot.knowledge.subsets.universal import UniversalSubset
 from llobot.projects import Project
 from llobot.projects.items import ProjectDirectory, ProjectFile, ProjectItem, ProjectLink
 from llobot.utils.fs import create_parents, read_document, write_text
+from llobot.utils.git import find_git_directory, read_git_index
+from llobot.utils.threads import parallel_map
 from llobot.utils.values import ValueTypeMixin
 from llobot.utils.zones import validate_zone
 from llobot.formats.paths import coerce_path
 
+if TYPE_CHECKING:
+    from llobot.projects.mirrors import ProjectMirror
+
 class DirectoryProject(Project, ValueTypeMixin):
     """
     A project that sources its content from a filesystem directory.
@@ -22,6 +32,10 @@ class DirectoryProject(Project, ValueTypeMixin):
     _blacklist: KnowledgeSubset
     _mutable: bool
     _executable: bool
+    _workers: int
+    _watch: bool
+    _git: bool
+    _max_size: int | None
 
     def __init__(
         self,
@@ -32,6 +46,10 @@ class DirectoryProject(Project, ValueTypeMixin):
         blacklist: KnowledgeSubset | None = None,
         mutable: bool = False,
         executable: bool = False,
+        workers: int = 1,
+        watch: bool = False,
+        git: bool = False,
+        max_size: int | None = None,
     ):
         """
         Initializes a new DirectoryProject.
@@ -45,7 +63,28 @@ class DirectoryProject(Project, ValueTypeMixin):
             blacklist: A custom blacklist subset for this project.
             mutable: If `True`, the project allows write operations. Defaults to `False`.
             executable: If `True`, the project allows script execution. Defaults to `False`.
+            workers: Number of threads used to read files in `read_all()`. Values
+                     above 1 help on network filesystems and cold page caches.
+                     Defaults to 1, which reads files sequentially.
+            watch: If `True`, tracked files are served from an in-memory mirror
+                   kept up to date by inotify (see `llobot.projects.mirrors`).
+                   Falls back to reading the directory where inotify is not
+                   available. Defaults to `False`.
+            git: If `True` and the directory is in a git working tree, tracked
+                 files are listed from git index instead of walking the
+                 directory. Whitelist and blacklist still apply. Cannot be
+                 combined with `watch`, because the mirror tracks files by
+                 watching the directory. Defaults to `False`.
+            max_size: Files larger than this many bytes are listed, but left out
+                      of `read_all()` and `read_lazy()` without being opened.
+                      They can still be read individually via `read()`.
+                      Defaults to `None`, which admits files of any size.
+
+        Raises:
+            ValueError: If both `watch` and `git` are enabled.
         """
+        if watch and git:
+            raise ValueError("DirectoryProject cannot combine watch and git modes.")
         self._directory = Path(directory).expanduser().absolute()
 
         # Compute default prefix: home-relative path for directories under home,
@@ -66,6 +105,10 @@ class DirectoryProject(Project, ValueTypeMixin):
         self._blacklist = blacklist or blacklist_subset()
         self._mutable = mutable
         self._executable = executable
+        self._workers = workers
+        self._watch = watch
+        self._git = git
+        self._max_size = max_size
 
     @property
     def directory(self) -> Path:
@@ -97,6 +140,42 @@ class DirectoryProject(Project, ValueTypeMixin):
         """Whether the project allows script execution."""
         return self._executable
 
+    @property
+    def workers(self) -> int:
+        """Number of threads used to read files in `read_all()`."""
+        return self._workers
+
+    @property
+    def watch(self) -> bool:
+        """Whether tracked files are served from an inotify-backed mirror."""
+        return self._watch
+
+    @property
+    def git(self) -> bool:
+        """Whether tracked files are listed from git index."""
+        return self._git
+
+    @property
+    def max_size(self) -> int | None:
+        """Size limit for files included in `read_all()` and `read_lazy()`."""
+        return self._max_size
+
+    @property
+    def generation(self) -> int | None:
+        """
+        Generation number of the project's mirror, which is incremented on every change.
+
+        It is `None` if the project is not watched or cannot be watched.
+        """
+        mirror = self._mirror()
+        return mirror.generation if mirror is not None else None
+
+    def _mirror(self) -> ProjectMirror | None:
+        if not self._watch:
+            return None
+        from llobot.projects.mirrors import standard_mirror_cache
+        return standard_mirror_cache().get(self)
+
     @property
     def prefixes(self) -> set[PurePosixPath]:
         return {self._prefix}
@@ -136,21 +215,112 @@ class DirectoryProject(Project, ValueTypeMixin):
             return []
 
         result = []
-        for p in real_path.iterdir():
-            item_path = path / p.name
-            if p.is_file():
-                result.append(ProjectFile(item_path))
-            elif p.is_dir():
-                result.append(ProjectDirectory(item_path))
-            elif p.is_symlink():
-                result.append(ProjectLink(item_path, PurePosixPath(p.readlink())))
+        # DirEntry caches file type from the directory listing, which saves stat calls.
+        with os.scandir(real_path) as entries:
+            for entry in entries:
+                item_path = path / entry.name
+                if entry.is_file():
+                    result.append(ProjectFile(item_path))
+                elif entry.is_dir():
+                    result.append(ProjectDirectory(item_path))
+                elif entry.is_symlink():
+                    result.append(ProjectLink(item_path, PurePosixPath(os.readlink(entry.path))))
+        return result
+
+    def tracked_files(self) -> list[PurePosixPath]:
+        """
+        Lists tracked files using a fast `os.scandir` walk.
+
+        The result is identical to filtering `walk()`, but file types are taken
+        from cached `os.DirEntry` data, which avoids most stat calls, and
+        blacklisted directories are pruned without creating any items.
+        Watched projects list files from their mirror.
+
+        In `git` mode, files are listed from git index, which also skips
+        ignored files. Files that were not yet added to git are not listed,
+        while files deleted since the last git command are listed until git
+        notices. If there is no usable git index, the directory is walked.
+        """
+        mirror = self._mirror()
+        if mirror is not None:
+            return mirror.tracked_files()
+        if self._git:
+            files = self._git_files()
+            if files is not None:
+                return files
+        result: list[PurePosixPath] = []
+        if self._directory.is_dir():
+            self._scan(str(self._directory), self._prefix, result)
+        return result
+
+    def _scan(self, directory: str, path: PurePosixPath, result: list[PurePosixPath]):
+        """
+        Recursively collects tracked files under a directory in walk order.
+        """
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            return
+        for entry in entries:
+            item_path = path / entry.name
+            if entry.is_file():
+                if item_path in self._whitelist and item_path not in self._blacklist:
+                    result.append(item_path)
+            elif entry.is_dir():
+                if item_path not in self._blacklist:
+                    self._scan(entry.path, item_path, result)
+
+    def _git_files(self) -> list[PurePosixPath] | None:
+        """
+        Lists tracked files from git index or returns `None` if there is no usable index.
+        """
+        found = find_git_directory(self._directory)
+        if found is None:
+            return None
+        root, git_directory = found
+        entries = read_git_index(git_directory)
+        if entries is None:
+            return None
+        # Paths are processed as strings, because PurePosixPath operations dominate run time in large repositories.
+        base = '/'.join(self._directory.relative_to(root).parts)
+        base = base + '/' if base else ''
+        pruned: dict[str, bool] = {'': False}
+        result = []
+        for entry in entries:
+            name = str(entry.path)
+            if not name.startswith(base):
+                continue
+            relative = name[len(base):]
+            path = self._prefix / relative
+            if path in self._whitelist and path not in self._blacklist and not self._pruned(relative.rpartition('/')[0], pruned):
+                result.append((relative.split('/'), path))
+        result.sort(key=lambda item: item[0])
+        return [path for _, path in result]
+
+    def _pruned(self, directory: str, memory: dict[str, bool]) -> bool:
+        """
+        Checks whether a directory or any of its ancestors within the project is blacklisted.
+        """
+        result = memory.get(directory)
+        if result is None:
+            result = self._prefix / directory in self._blacklist or self._pruned(directory.rpartition('/')[0], memory)
+            memory[directory] = result
         return result
 
     def read(self, path: PurePosixPath) -> str | None:
+        mirror = self._mirror()
+        if mirror is not None and mirror.tracks(path):
+            content = mirror.read(path)
+            # Oversized files are not kept in the mirror.
+            if content is not None or self._max_size is None:
+                return content
         local_path = self._to_local_path(path)
         if local_path is None:
             return None
-        real_path = self._directory / local_path
+        return self._read_file(self._directory / local_path)
+
+    def _read_file(self, real_path: Path) -> str | None:
         if not real_path.is_file():
             return None
         try:
@@ -158,6 +328,87 @@ class DirectoryProject(Project, ValueTypeMixin):
         except (ValueError, UnicodeDecodeError):
             return None # e.g. binary file
 
+    def read_many(self, paths: Iterable[PurePosixPath]) -> Knowledge:
+        """
+        Reads several files using `workers` threads.
+
+        Filesystem paths are derived with string operations, which are much
+        cheaper than `PurePosixPath.relative_to()`. Watched projects serve
+        files from their mirror.
+        """
+        paths = list(paths)
+        if self._mirror() is not None:
+            contents = parallel_map(self.read, paths, self._workers)
+        else:
+            prefix = str(self._prefix) + '/'
+            directory = str(self._directory) + '/'
+            requested = []
+            real_paths = []
+            for path in paths:
+                name = str(path)
+                if name.startswith(prefix):
+                    requested.append(path)
+                    real_paths.append(Path(directory + name[len(prefix):]))
+            paths = requested
+            contents = parallel_map(self._read_file, real_paths, self._workers)
+        return Knowledge({path: content for path, content in zip(paths, contents) if content is not None})
+
+    def read_all(self) -> Knowledge:
+        """
+        Reads all tracked files, reusing content of unchanged files.
+
+        Content is cached process-wide in `standard_snapshot_cache()`. Files
+        are re-read only if their inode, size, or modification time changed.
+        If no file changed, the previously returned `Knowledge` is returned.
+        Files are read by `workers` threads. Files larger than `max_size` are
+        skipped without being opened. Watched projects return content of
+        their mirror.
+        """
+        mirror = self._mirror()
+        if mirror is not None:
+            return mirror.read_all()
+        from llobot.projects.snapshots import standard_snapshot_cache
+        return standard_snapshot_cache().read(self, self._real_files(), workers=self._workers, max_size=self._max_size)
+
+    def read_lazy(self) -> Knowledge:
+        """
+        Returns `LazyKnowledge` of tracked files with file sizes as estimated costs.
+
+        Only stat data is collected. Files are read when accessed. Version of
+        the knowledge consists of modification times, so that knowledge of an
+        unchanged project compares equal. Files larger than `max_size` are left
+        out. Watched projects return content of their mirror, which is already
+        in memory.
+        """
+        mirror = self._mirror()
+        if mirror is not None:
+            return mirror.read_all()
+        from llobot.knowledge.lazy import LazyKnowledge
+        from llobot.projects.snapshots import RACY_WINDOW_NS
+        racy_threshold = time.time_ns() - RACY_WINDOW_NS
+        sizes = {}
+        versions = []
+        for path, real_path in self._real_files():
+            try:
+                info = os.stat(real_path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(info.st_mode):
+                continue
+            if self._max_size is not None and info.st_size > self._max_size:
+                continue
+            sizes[path] = info.st_size
+            # Recently modified files may change again without changing their stat data.
+            versions.append((info.st_ino, info.st_mtime_ns) if info.st_mtime_ns < racy_threshold else object())
+        return LazyKnowledge(self.read, sizes, version=tuple(versions))
+
+    def _real_files(self) -> Iterable[tuple[PurePosixPath, Path]]:
+        """
+        Lazily pairs tracked files with their filesystem paths.
+        """
+        for path in self.tracked_files():
+            yield path, self._directory / path.relative_to(self._prefix)
+
     def tracked(self, item: ProjectItem) -> bool:
         if isinstance(item, ProjectFile):
             return item.path in self._whitelist and item.path not in self._blacklist
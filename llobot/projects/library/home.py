@@ -31,6 +31,10 @@ class HomeProjectLibrary(ProjectLibrary, ValueTypeMixin):
     _blacklist: KnowledgeSubset | None
     _mutable: bool
     _executable: bool
+    _workers: int
+    _watch: bool
+    _git: bool
+    _max_size: int | None
     _parents: bool
 
     def __init__(
@@ -41,6 +45,10 @@ class HomeProjectLibrary(ProjectLibrary, ValueTypeMixin):
         blacklist: KnowledgeSubset | None = None,
         mutable: bool = False,
         executable: bool = False,
+        workers: int = 1,
+        watch: bool = False,
+        git: bool = False,
+        max_size: int | None = None,
         parents: bool = True,
     ):
         """
@@ -52,6 +60,10 @@ class HomeProjectLibrary(ProjectLibrary, ValueTypeMixin):
             blacklist: A blacklist to pass to created `DirectoryProject` instances.
             mutable: If `True`, created projects allow write operations.
             executable: If `True`, created projects allow script execution.
+            workers: Number of threads created projects use to read files.
+            watch: If `True`, created projects are kept up to date by inotify.
+            git: If `True`, created projects list files from git index where possible.
+            max_size: Size limit for files included in bulk reads of created projects.
             parents: If `True`, the library also returns projects for
                 ancestor directories of any matched project. Defaults to `True`.
         """
@@ -60,6 +72,10 @@ class HomeProjectLibrary(ProjectLibrary, ValueTypeMixin):
         self._blacklist = blacklist
         self._mutable = mutable
         self._executable = executable
+        self._workers = workers
+        self._watch = watch
+        self._git = git
+        self._max_size = max_size
         self._parents = parents
 
     @property
@@ -87,6 +103,26 @@ class HomeProjectLibrary(ProjectLibrary, ValueTypeMixin):
         """Whether created projects allow script execution."""
         return self._executable
 
+    @property
+    def workers(self) -> int:
+        """Number of threads created projects use to read files."""
+        return self._workers
+
+    @property
+    def watch(self) -> bool:
+        """Whether created projects are kept up to date by inotify."""
+        return self._watch
+
+    @property
+    def git(self) -> bool:
+        """Whether created projects list files from git index where possible."""
+        return self._git
+
+    @property
+    def max_size(self) -> int | None:
+        """Size limit for files included in bulk reads of created projects."""
+        return self._max_size
+
     @property
     def parents(self) -> bool:
         """Whether the library returns projects for ancestor directories."""
@@ -120,6 +156,10 @@ class HomeProjectLibrary(ProjectLibrary, ValueTypeMixin):
             blacklist=self._blacklist,
             mutable=self._mutable,
             executable=self._executable,
+            workers=self._workers,
+            watch=self._watch,
+            git=self._git,
+            max_size=self._max_size,
         )
 
     def lookup(self, key: str) -> list[Project]:
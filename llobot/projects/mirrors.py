@@ -0,0 +1,351 @@
+"""
+Live in-memory mirrors of directory projects, kept up to date by inotify.
+
+Long-running processes read the same projects over and over. `ProjectMirror`
+reads a `DirectoryProject` once, watches all its tracked directories with
+inotify, and applies pending change events when it is accessed. No background
+thread is involved. Every observed change increments the mirror's generation
+number. While nothing changes, the mirror returns the very same `Knowledge`
+object, so that downstream caches keyed by `Knowledge` hit immediately.
+
+Mirrors are only available on Linux. Use `standard_mirror_cache()` to share
+mirrors process-wide.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+import errno
+from functools import cache
+import logging
+import os
+import threading
+from pathlib import Path, PurePosixPath
+from llobot.knowledge import Knowledge
+from llobot.projects.directory import DirectoryProject
+from llobot.projects.items import ProjectDirectory, ProjectFile
+from llobot.utils.fs import read_document
+from llobot.utils.inotify import (
+    IN_ATTRIB, IN_CLOSE_WRITE, IN_CREATE, IN_DELETE, IN_DELETE_SELF, IN_EXCL_UNLINK,
+    IN_IGNORED, IN_ISDIR, IN_MODIFY, IN_MOVE_SELF, IN_MOVED_FROM, IN_MOVED_TO,
+    IN_ONLYDIR, IN_Q_OVERFLOW, IN_UNMOUNT, Inotify, inotify_available,
+)
+
+_logger = logging.getLogger(__name__)
+
+_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+    | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_EXCL_UNLINK)
+
+def _read(path: Path, max_size: int | None) -> str | None:
+    """
+    Reads a document, returning `None` for unreadable, binary, and oversized files.
+    """
+    try:
+        if max_size is not None and os.stat(path).st_size > max_size:
+            return None
+        return read_document(path)
+    except (OSError, ValueError, UnicodeDecodeError):
+        return None
+
+class ProjectMirror:
+    """
+    In-memory copy of tracked files of a `DirectoryProject`, kept up to date by inotify.
+
+    Files larger than project's `max_size` are tracked, but not read.
+    All methods are thread-safe. Changes to targets of symlinks that point
+    outside watched directories are not detected.
+    """
+    _project: DirectoryProject
+    _lock: threading.Lock
+    _inotify: Inotify
+    _watches: dict[int, PurePosixPath]
+    _files: dict[PurePosixPath, str | None]
+    _knowledge: Knowledge | None
+    # Last returned knowledge and paths changed since, which become lineage of the next knowledge.
+    # Changed paths are `None` when they are unknown, because the whole project was read again.
+    _previous: Knowledge | None
+    _changes: set[PurePosixPath] | None
+    _generation: int
+
+    def __init__(self, project: DirectoryProject):
+        """
+        Reads the project and starts watching it.
+
+        Args:
+            project: The project to mirror.
+
+        Raises:
+            OSError: If inotify is not available or the project cannot be
+                     watched, typically because of inotify limits.
+        """
+        self._project = project
+        self._lock = threading.Lock()
+        self._inotify = Inotify()
+        self._watches = {}
+        self._files = {}
+        self._knowledge = None
+        self._previous = None
+        self._changes = None
+        self._generation = 0
+        try:
+            self._rebuild()
+        except OSError:
+            self._inotify.close()
+            raise
+
+    @property
+    def project(self) -> DirectoryProject:
+        """The mirrored project."""
+        return self._project
+
+    @property
+    def generation(self) -> int:
+        """
+        Number that is incremented whenever tracked files or their content change.
+        """
+        with self._lock:
+            self._sync()
+            return self._generation
+
+    def tracked_files(self) -> list[PurePosixPath]:
+        """
+        Lists tracked files in walk order.
+        """
+        with self._lock:
+            self._sync()
+            return sorted(self._files)
+
+    def tracks(self, path: PurePosixPath) -> bool:
+        """
+        Checks whether a path is a tracked file.
+        """
+        with self._lock:
+            self._sync()
+            return path in self._files
+
+    def read(self, path: PurePosixPath) -> str | None:
+        """
+        Returns content of a tracked file or `None` if it is not tracked, not
+        a text file, or larger than project's `max_size`.
+        """
+        with self._lock:
+            self._sync()
+            return self._files.get(path)
+
+    def read_all(self) -> Knowledge:
+        """
+        Returns content of all tracked text files.
+
+        The same object is returned until the next change.
+        """
+        with self._lock:
+            self._sync()
+            if self._knowledge is None:
+                documents = {}
+                for path in sorted(self._files):
+                    content = self._files[path]
+                    if content is not None:
+                        documents[path] = content
+                if self._previous is not None and self._changes is not None:
+                    self._knowledge = Knowledge(documents, parent=self._previous, changes=self._changes)
+                else:
+                    self._knowledge = Knowledge(documents)
+                self._previous = None
+                self._changes = set()
+            return self._knowledge
+
+    def close(self):
+        """
+        Stops watching the project. The mirror must not be used afterwards.
+        """
+        self._inotify.close()
+
+    def _real_path(self, path: PurePosixPath) -> Path:
+        return self._project.directory / path.relative_to(self._project.prefix)
+
+    def _rebuild(self):
+        """
+        Drops all watches and reads the whole project again.
+        """
+        for wd in self._watches:
+            self._inotify.remove_watch(wd)
+        self._watches = {}
+        files: dict[PurePosixPath, str | None] = {}
+        self._add_tree(self._project.prefix, files)
+        self._files = files
+        self._knowledge = None
+        self._previous = None
+        self._changes = None
+
+    def _add_tree(self, path: PurePosixPath, files: dict[PurePosixPath, str | None]):
+        """
+        Watches a directory and its tracked subdirectories, reading tracked files.
+        """
+        real_path = self._real_path(path)
+        try:
+            self._watches[self._inotify.add_watch(str(real_path), _MASK)] = path
+            with os.scandir(real_path) as iterator:
+                entries = list(iterator)
+        except OSError as ex:
+            # Running out of watches must not go unnoticed. Other errors mean the directory is gone or inaccessible.
+            if ex.errno == errno.ENOSPC:
+                raise
+            return
+        for entry in entries:
+            item_path = path / entry.name
+            if entry.is_file():
+                if self._project.tracked(ProjectFile(item_path)):
+                    files[item_path] = _read(Path(entry.path), self._project.max_size)
+            elif entry.is_dir():
+                if self._project.tracked(ProjectDirectory(item_path)):
+                    self._add_tree(item_path, files)
+
+    def _rescan(self, path: PurePosixPath) -> bool:
+        """
+        Reads a directory subtree again. Returns `True` if anything changed.
+        """
+        old = {file: content for file, content in self._files.items() if file.is_relative_to(path)}
+        for file in old:
+            del self._files[file]
+        for wd, directory in list(self._watches.items()):
+            if directory.is_relative_to(path):
+                self._inotify.remove_watch(wd)
+                del self._watches[wd]
+        new: dict[PurePosixPath, str | None] = {}
+        if path == self._project.prefix or self._project.tracked(ProjectDirectory(path)):
+            self._add_tree(path, new)
+        self._files.update(new)
+        if self._changes is not None:
+            self._changes.update(file for file in old.keys() | new.keys() if old.get(file) != new.get(file))
+        return old != new
+
+    def _refresh(self, path: PurePosixPath) -> bool:
+        """
+        Reads a single file again. Returns `True` if anything changed.
+        """
+        real_path = self._real_path(path)
+        if real_path.is_file() and self._project.tracked(ProjectFile(path)):
+            content = _read(real_path, self._project.max_size)
+            if path in self._files and self._files[path] == content:
+                return False
+            self._files[path] = content
+            if self._changes is not None:
+                self._changes.add(path)
+            return True
+        if self._files.pop(path, False) is False:
+            return False
+        if self._changes is not None:
+            self._changes.add(path)
+        return True
+
+    def _sync(self):
+        """
+        Applies pending inotify events.
+        """
+        events = self._inotify.read()
+        if not events:
+            return
+        files: set[PurePosixPath] = set()
+        directories: set[PurePosixPath] = set()
+        overflow = False
+        for wd, mask, name in events:
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._watches[wd]
+            elif not name:
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_UNMOUNT):
+                    directories.add(directory)
+            elif mask & IN_ISDIR:
+                directories.add(directory / name)
+            else:
+                files.add(directory / name)
+        if overflow:
+            _logger.debug(f"Event queue overflow, reading ~/{self._project.prefix} again")
+            self._rebuild()
+            self._generation += 1
+            return
+        changed = False
+        rescanned: list[PurePosixPath] = []
+        for directory in sorted(directories):
+            if not any(directory.is_relative_to(parent) for parent in rescanned):
+                rescanned.append(directory)
+                changed |= self._rescan(directory)
+        for file in files:
+            if not any(file.is_relative_to(parent) for parent in rescanned):
+                changed |= self._refresh(file)
+        if changed:
+            if self._knowledge is not None:
+                self._previous = self._knowledge
+            self._knowledge = None
+            self._generation += 1
+
+class MirrorCache:
+    """
+    Thread-safe LRU cache of project mirrors.
+
+    Every mirror holds an inotify instance and one watch per directory, both of
+    which are limited per user, so only a few mirrors are kept. Projects that
+    cannot be mirrored are remembered too, so that failures are not retried.
+    """
+    _capacity: int
+    _lock: threading.Lock
+    _mirrors: OrderedDict[DirectoryProject, ProjectMirror | None]
+
+    def __init__(self, capacity: int = 16):
+        """
+        Creates an empty mirror cache.
+
+        Args:
+            capacity: Maximum number of mirrors to keep.
+        """
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._mirrors = OrderedDict()
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of mirrors to keep."""
+        return self._capacity
+
+    def get(self, project: DirectoryProject) -> ProjectMirror | None:
+        """
+        Returns a mirror of the project, creating it if necessary.
+
+        Evicted mirrors stop watching once they are no longer referenced.
+
+        Args:
+            project: The project to mirror.
+
+        Returns:
+            Mirror of the project or `None` if it cannot be mirrored.
+        """
+        with self._lock:
+            if project in self._mirrors:
+                self._mirrors.move_to_end(project)
+                return self._mirrors[project]
+            mirror = None
+            if inotify_available():
+                try:
+                    mirror = ProjectMirror(project)
+                except OSError as ex:
+                    _logger.warning(f"Cannot watch ~/{project.prefix}: {ex}")
+            self._mirrors[project] = mirror
+            while len(self._mirrors) > self._capacity:
+                self._mirrors.popitem(last=False)
+            return mirror
+
+@cache
+def standard_mirror_cache() -> MirrorCache:
+    """
+    Returns the process-wide mirror cache used by `DirectoryProject`.
+    """
+    return MirrorCache()
+
+__all__ = [
+    'ProjectMirror',
+    'MirrorCache',
+    'standard_mirror_cache',
+]
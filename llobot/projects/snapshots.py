@@ -0,0 +1,344 @@
+"""
+Process-wide cache of project snapshots.
+
+Reading a whole project is expensive, because every file must be read, decoded,
+and normalized. `SnapshotCache` remembers the last snapshot of recently read
+projects together with stat data of every file. Subsequent reads only stat the
+files and re-read those that changed. When nothing changed, the very same
+`Knowledge` object is returned, so that downstream caches keyed by `Knowledge`
+hit immediately.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from functools import cache
+import logging
+import os
+import threading
+import time
+from pathlib import Path, PurePosixPath
+from typing import Hashable, Iterable
+from llobot.knowledge import Knowledge
+from llobot.utils.fs import read_document
+from llobot.utils.threads import parallel_map
+from llobot.utils.values import ValueTypeMixin
+
+_logger = logging.getLogger(__name__)
+
+# File identity as far as the cache is concerned: inode, size, and mtime in nanoseconds.
+type _FileKey = tuple[int, int, int]
+
+# Files modified this recently cannot be trusted to be unchanged even if their stat
+# data matches, because filesystem timestamps are coarse. Such files are re-read.
+RACY_WINDOW_NS = 2_000_000_000
+
+class SnapshotStats(ValueTypeMixin):
+    """
+    Cumulative statistics of a `SnapshotCache`.
+    """
+    _hits: int
+    _misses: int
+    _reuses: int
+    _skipped: int
+    _skipped_bytes: int
+    _list_time: float
+    _stat_time: float
+    _read_time: float
+
+    def __init__(self, *,
+        hits: int = 0,
+        misses: int = 0,
+        reuses: int = 0,
+        skipped: int = 0,
+        skipped_bytes: int = 0,
+        list_time: float = 0,
+        stat_time: float = 0,
+        read_time: float = 0,
+    ):
+        """
+        Creates new snapshot statistics.
+
+        Args:
+            hits: Number of files whose cached content was reused.
+            misses: Number of files that had to be read.
+            reuses: Number of whole snapshots returned unchanged.
+            skipped: Number of files left out, because they exceeded size limit.
+            skipped_bytes: Total size of skipped files.
+            list_time: Seconds spent enumerating files.
+            stat_time: Seconds spent collecting stat data.
+            read_time: Seconds spent reading, validating, and normalizing files.
+        """
+        self._hits = hits
+        self._misses = misses
+        self._reuses = reuses
+        self._skipped = skipped
+        self._skipped_bytes = skipped_bytes
+        self._list_time = list_time
+        self._stat_time = stat_time
+        self._read_time = read_time
+
+    @property
+    def hits(self) -> int:
+        """Number of files whose cached content was reused."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of files that had to be read."""
+        return self._misses
+
+    @property
+    def reuses(self) -> int:
+        """Number of whole snapshots returned unchanged."""
+        return self._reuses
+
+    @property
+    def skipped(self) -> int:
+        """Number of files left out, because they exceeded size limit."""
+        return self._skipped
+
+    @property
+    def skipped_bytes(self) -> int:
+        """Total size of skipped files."""
+        return self._skipped_bytes
+
+    @property
+    def list_time(self) -> float:
+        """Seconds spent enumerating files."""
+        return self._list_time
+
+    @property
+    def stat_time(self) -> float:
+        """Seconds spent collecting stat data."""
+        return self._stat_time
+
+    @property
+    def read_time(self) -> float:
+        """Seconds spent reading, validating, and normalizing files."""
+        return self._read_time
+
+class _Snapshot:
+    """
+    Last known state of one project.
+    """
+    files: dict[PurePosixPath, tuple[_FileKey | None, str | None]]
+    knowledge: Knowledge
+
+    def __init__(self, files: dict[PurePosixPath, tuple[_FileKey | None, str | None]], knowledge: Knowledge):
+        self.files = files
+        self.knowledge = knowledge
+
+def _stat_key(path: Path) -> _FileKey | None:
+    """
+    Returns stat-based identity of a file or `None` if it cannot be stat-ed.
+    """
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return (info.st_ino, info.st_size, info.st_mtime_ns)
+
+def _read(path: Path) -> str | None:
+    """
+    Reads a document, returning `None` for unreadable and binary files.
+    """
+    try:
+        return read_document(path)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+class SnapshotCache:
+    """
+    Thread-safe LRU cache of project snapshots, validated by file stat data.
+
+    Every file is keyed by its inode, size, and modification time. Files with
+    unchanged keys are not read again. Snapshots of the least recently read
+    projects are evicted when capacity is exceeded.
+    """
+    _capacity: int
+    _lock: threading.Lock
+    _snapshots: OrderedDict[Hashable, _Snapshot]
+    _hits: int
+    _misses: int
+    _reuses: int
+    _skipped: int
+    _skipped_bytes: int
+    _list_time: float
+    _stat_time: float
+    _read_time: float
+
+    def __init__(self, capacity: int = 8):
+        """
+        Creates an empty snapshot cache.
+
+        Args:
+            capacity: Maximum number of project snapshots to keep.
+        """
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._snapshots = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._reuses = 0
+        self._skipped = 0
+        self._skipped_bytes = 0
+        self._list_time = 0
+        self._stat_time = 0
+        self._read_time = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of project snapshots to keep."""
+        return self._capacity
+
+    @property
+    def stats(self) -> SnapshotStats:
+        """Cumulative statistics of this cache."""
+        with self._lock:
+            return SnapshotStats(
+                hits=self._hits,
+                misses=self._misses,
+                reuses=self._reuses,
+                skipped=self._skipped,
+                skipped_bytes=self._skipped_bytes,
+                list_time=self._list_time,
+                stat_time=self._stat_time,
+                read_time=self._read_time,
+            )
+
+    def clear(self):
+        """
+        Drops all cached snapshots. Statistics are preserved.
+        """
+        with self._lock:
+            self._snapshots.clear()
+
+    def read(self,
+        key: Hashable,
+        files: Iterable[tuple[PurePosixPath, Path]],
+        *,
+        workers: int = 1,
+        max_size: int | None = None,
+    ) -> Knowledge:
+        """
+        Reads a set of files, reusing cached content of unchanged files.
+
+        Files that cannot be read or that are not valid text are left out of
+        the result, just like in `Project.read_all()`. Stat calls and reads
+        can be spread over a thread pool, which helps on network filesystems
+        and cold page caches. Results are always in the order of `files`.
+
+        Args:
+            key: Identity of the snapshot, usually the project itself.
+            files: Pairs of project paths and filesystem paths, in the order
+                   in which they should appear in the resulting knowledge.
+                   Time spent iterating it is reported as listing time.
+            workers: Number of threads for stat calls and reads. Value 1
+                     reads files sequentially in the calling thread.
+            max_size: Files larger than this many bytes are left out without
+                      being opened. `None` admits files of any size.
+
+        Returns:
+            Knowledge containing all readable files. If nothing changed since
+            the last read with the same key, the previously returned object is
+            returned again. Otherwise the previous snapshot is recorded as
+            parent of the new one, so that `Knowledge.diff()` between them is
+            fast.
+        """
+        with self._lock:
+            previous = self._snapshots.get(key)
+            if previous is not None:
+                self._snapshots.move_to_end(key)
+
+        started = time.perf_counter()
+        listed = list(files)
+        listed_time = time.perf_counter()
+        racy_threshold = time.time_ns() - RACY_WINDOW_NS
+        file_keys = parallel_map(_stat_key, [real_path for _, real_path in listed], workers)
+        stated_time = time.perf_counter()
+
+        cached_entries: list[tuple[_FileKey | None, str | None] | None] = []
+        stale: list[int] = []
+        admitted: list[int] = []
+        skipped = 0
+        skipped_bytes = 0
+        for i, ((path, real_path), file_key) in enumerate(zip(listed, file_keys)):
+            cached = previous.files.get(path) if previous is not None else None
+            cached_entries.append(cached)
+            size = file_key[1] if file_key is not None else 0
+            oversized = max_size is not None and size > max_size
+            if oversized:
+                skipped += 1
+                skipped_bytes += size
+            if file_key is None or cached is None or cached[0] != file_key:
+                stale.append(i)
+                if file_key is not None and not oversized:
+                    admitted.append(i)
+        contents = parallel_map(_read, [listed[i][1] for i in admitted], workers)
+        read_time = time.perf_counter()
+
+        fresh = dict(zip(admitted, contents))
+        snapshot_files: dict[PurePosixPath, tuple[_FileKey | None, str | None]] = {}
+        changed = previous is None
+        changes: list[PurePosixPath] = []
+        for i, (path, _) in enumerate(listed):
+            file_key = file_keys[i]
+            cached = cached_entries[i]
+            if cached is not None and file_key is not None and cached[0] == file_key:
+                content = cached[1]
+            else:
+                content = fresh.get(i)
+                if cached is None or cached[1] != content:
+                    changed = True
+                    changes.append(path)
+            # Recently modified files might change again without changing their stat data.
+            if file_key is not None and file_key[2] >= racy_threshold:
+                file_key = None
+            snapshot_files[path] = (file_key, content)
+
+        if not changed and previous is not None and snapshot_files.keys() == previous.files.keys():
+            knowledge = previous.knowledge
+            reused = True
+        else:
+            documents = {path: content for path, (_, content) in snapshot_files.items() if content is not None}
+            if previous is not None:
+                # Lineage lets consumers diff the two snapshots without comparing all documents.
+                changes.extend(path for path in previous.files if path not in snapshot_files)
+                knowledge = Knowledge(documents, parent=previous.knowledge, changes=changes)
+            else:
+                knowledge = Knowledge(documents)
+            reused = False
+
+        hits = len(listed) - len(stale)
+        misses = len(stale)
+        _logger.debug(
+            f"Snapshot of {key}: {len(listed)} files, {len(admitted)} read, {skipped} skipped, "
+            f"list {listed_time - started:.3f}s, stat {stated_time - listed_time:.3f}s, read {read_time - stated_time:.3f}s")
+        with self._lock:
+            self._snapshots[key] = _Snapshot(snapshot_files, knowledge)
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self._capacity:
+                self._snapshots.popitem(last=False)
+            self._hits += hits
+            self._misses += misses
+            if reused:
+                self._reuses += 1
+            self._skipped += skipped
+            self._skipped_bytes += skipped_bytes
+            self._list_time += listed_time - started
+            self._stat_time += stated_time - listed_time
+            self._read_time += read_time - stated_time
+        return knowledge
+
+@cache
+def standard_snapshot_cache() -> SnapshotCache:
+    """
+    Returns the process-wide snapshot cache used by `DirectoryProject`.
+    """
+    return SnapshotCache()
+
+__all__ = [
+    'RACY_WINDOW_NS',
+    'SnapshotStats',
+    'SnapshotCache',
+    'standard_snapshot_cache',
+]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pathlib import PurePosixPath
 from typing import Iterable
+from llobot.knowledge import Knowledge
 from llobot.projects import Project
 from llobot.projects.empty import EmptyProject
 from llobot.projects.items import ProjectItem
@@ -76,10 +77,80 @@ class UnionProject(Project, ValueTypeMixin):
         project = self._find_project(path)
         return project.read(path) if project else None
 
+    def read_many(self, paths: Iterable[PurePosixPath]) -> Knowledge:
+        """
+        Groups paths by member and reads every group with `read_many()` of the member.
+
+        Members are found once per directory rather than once per path.
+        """
+        paths = list(paths)
+        owners: dict[PurePosixPath, Project | None] = {}
+        groups: dict[Project, list[PurePosixPath]] = {}
+        for path in paths:
+            # Paths in the same directory have the same owner unless the path is a prefix itself.
+            if path in self._routing:
+                project = self._routing[path]
+            else:
+                if path.parent not in owners:
+                    owners[path.parent] = self._find_project(path.parent)
+                project = owners[path.parent]
+            if project is not None:
+                groups.setdefault(project, []).append(path)
+        docs = {}
+        for project, group in groups.items():
+            docs.update(project.read_many(group))
+        return Knowledge({path: docs[path] for path in paths if path in docs})
+
     def tracked(self, item: ProjectItem) -> bool:
         project = self._find_project(item.path)
         return project.tracked(item) if project else False
 
+    def tracked_files(self) -> list[PurePosixPath]:
+        """
+        Lists tracked files of all members, using their fast enumeration.
+
+        Every path is taken only from the member that owns it, i.e. the member
+        with the longest matching prefix, so that nested members do not produce
+        duplicates.
+        """
+        result = []
+        for member in sorted(self._members, key=lambda p: sorted(p.prefixes)):
+            result.extend(path for path in member.tracked_files() if self._find_project(path) is member)
+        return result
+
+    def read_all(self) -> Knowledge:
+        """
+        Reads all tracked files by delegating to `read_all()` of members.
+
+        This lets members use their own bulk reading, which may be parallel or
+        cached. Ownership of paths is resolved as in `tracked_files()`.
+        """
+        docs = {}
+        for member in sorted(self._members, key=lambda p: sorted(p.prefixes)):
+            for path, content in member.read_all():
+                if self._find_project(path) is member:
+                    docs[path] = content
+        return Knowledge(docs)
+
+    def read_lazy(self) -> Knowledge:
+        """
+        Combines lazy knowledge of members.
+
+        If any member returns eagerly loaded knowledge, all files are read.
+        """
+        from llobot.knowledge.lazy import LazyKnowledge
+        sizes = {}
+        versions = []
+        for member in sorted(self._members, key=lambda p: sorted(p.prefixes)):
+            knowledge = member.read_lazy()
+            if not isinstance(knowledge, LazyKnowledge):
+                return self.read_all()
+            versions.append(knowledge.version)
+            for path in knowledge.keys():
+                if self._find_project(path) is member:
+                    sizes[path] = knowledge.size(path)
+        return LazyKnowledge(self.read, sizes, version=tuple(versions))
+
     def mutable(self, path: PurePosixPath) -> bool:
         """
         Checks if a path is mutable by delegating to the appropriate member project.
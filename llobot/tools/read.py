@@ -43,44 +43,54 @@ class ReadTool(FencedTool):
         context_env = env[ContextEnv]
         knowledge_env = env[KnowledgeEnv]
 
-        lines = content.splitlines()
-
-        for line in lines:
+        # Collect overviews and targets first, so that all files can be read in one batch.
+        # Paths before an invalid line are still served before the error is raised.
+        requests = []
+        error = None
+        for line in content.splitlines():
             line = line.strip()
             if not line:
                 continue
 
-            path = parse_path(line)
+            try:
+                path = parse_path(line)
+            except ValueError as ex:
+                error = ex
+                break
 
-            # 1. Load overviews
             parents = list(path.parents)
             parents.reverse()
 
+            related = []
             for parent in parents:
                 items = sorted(project.items(parent), key=lambda i: i.path)
                 for item in items:
-                    if isinstance(item, ProjectFile) and item.path in self._overviews:
-                        p = item.path
-                        if p == path:
-                            continue
+                    if isinstance(item, ProjectFile) and item.path in self._overviews and item.path != path:
+                        related.append(item.path)
+            requests.append((path, related))
 
-                        content_str = project.read(p)
-                        if content_str is None:
-                            continue
+        knowledge = project.read_many([p for path, related in requests for p in [*related, path]])
+
+        for path, related in requests:
+            # 1. Load overviews
+            for p in related:
+                if p not in knowledge:
+                    continue
+                content_str = knowledge[p]
 
-                        if knowledge_env.get(p) == content_str:
-                            continue
+                if knowledge_env.get(p) == content_str:
+                    continue
 
-                        listing = self._format.render(p, content_str)
+                listing = self._format.render(p, content_str)
 
-                        context_env.add(ChatMessage(ChatIntent.SYSTEM, f"Reading also related `~/{p}`..."))
-                        context_env.add(ChatMessage(ChatIntent.SYSTEM, listing))
-                        knowledge_env.add(p, content_str)
+                context_env.add(ChatMessage(ChatIntent.SYSTEM, f"Reading also related `~/{p}`..."))
+                context_env.add(ChatMessage(ChatIntent.SYSTEM, listing))
+                knowledge_env.add(p, content_str)
 
             # 2. Load target file
-            content_str = project.read(path)
-            if content_str is None:
+            if path not in knowledge:
                 raise ValueError(f"File not found: ~/{path}")
+            content_str = knowledge[path]
 
             if knowledge_env.get(path) == content_str:
                 context_env.add(ChatMessage(ChatIntent.SYSTEM, f"File `~/{path}` is already in the context."))
@@ -91,6 +101,8 @@ class ReadTool(FencedTool):
             context_env.add(ChatMessage(ChatIntent.SYSTEM, listing))
             knowledge_env.add(path, content_str)
 
+        if error is not None:
+            raise error
         return True
 
 __all__ = [
@@ -18,4 +18,10 @@ zones
     Zoning system for mapping abstract zone names to filesystem paths.
 values
     Provides ValueTypeMixin for creating value-like objects.
+inotify
+    Minimal binding of Linux inotify API via ctypes.
+git
+    Reading of git index without running git.
+threads
+    Helpers for running I/O-bound work in threads.
 """
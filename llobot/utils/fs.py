@@ -4,7 +4,6 @@ Filesystem utilities.
 This module provides functions for interactions with the filesystem, including
 path manipulation, file I/O, and path component extraction.
 """
-import re
 from pathlib import Path, PurePosixPath
 from llobot.utils.text import normalize_document
 
@@ -54,7 +53,62 @@ def write_text(path: Path, content: str):
     """
     write_bytes(path, content.encode('utf-8'))
 
-_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+# Control characters other than TAB, LF, and CR. Bytes are deleted with translate(), which is faster than regex search.
+_CONTROL_BYTES = bytes([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f])
+
+# Binary files almost always contain NUL bytes near the beginning.
+_SNIFF_SIZE = 8192
+
+# UTF-8 sequences that normalization would change in text without control characters:
+# non-ASCII line separators and non-ASCII whitespace at the end of a line.
+_UNNORMALIZED_UTF8 = tuple(
+    [separator.encode('utf-8') for separator in '\x85\u2028\u2029']
+    + [(space + '\n').encode('utf-8') for space in '\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u202f\u205f\u3000']
+)
+
+def _read_valid_bytes(path: Path) -> bytes:
+    """
+    Reads a file and checks that it has no forbidden control characters.
+
+    The beginning of the file is checked for NUL bytes before the rest is
+    read, so that binary files are rejected cheaply. Control characters are
+    checked on raw bytes, which is safe, because UTF-8 never encodes other
+    characters with bytes below 0x80.
+    """
+    try:
+        with open(path, 'rb') as file:
+            head = file.read(_SNIFF_SIZE)
+            # If there is a NUL byte in the beginning, the rest of the file is not needed.
+            data = head + file.read() if len(head) == _SNIFF_SIZE and b'\0' not in head else head
+    except Exception as ex:
+        raise ValueError(f"Failed to read {path}: {ex}") from ex
+    if len(data.translate(None, _CONTROL_BYTES)) != len(data):
+        raise ValueError(f"Control characters found in {path}")
+    return data
+
+def _decode(path: Path, data: bytes) -> str:
+    """
+    Strictly decodes UTF-8 and translates CRLF and CR to LF like universal newlines mode of open().
+    """
+    try:
+        content = data.decode('utf-8', errors='strict')
+    except UnicodeDecodeError as ex:
+        raise ValueError(f"Failed to read {path}: {ex}") from ex
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+def _is_normalized(data: bytes) -> bool:
+    """
+    Checks whether text without control characters is unchanged by `normalize_document`.
+    """
+    if not data:
+        return True
+    if data[-1:] != b'\n' or data[:1] == b'\n' or data.endswith(b'\n\n'):
+        return False
+    if b'\r' in data or b' \n' in data or b'\t\n' in data:
+        return False
+    return data.isascii() or not any(sequence in data for sequence in _UNNORMALIZED_UTF8)
 
 def read_text(path: Path) -> str:
     """
@@ -73,24 +127,16 @@ def read_text(path: Path) -> str:
         ValueError: If the file cannot be read, is not valid UTF-8, or contains
                     forbidden control characters.
     """
-    try:
-        # read_text() uses open() which defaults to universal newlines mode,
-        # so it translates \r\n and \r to \n.
-        content = path.read_text(encoding='utf-8', errors='strict')
-    except Exception as ex:
-        raise ValueError(f"Failed to read {path}: {ex}") from ex
-
-    if _CONTROL_CHARS_RE.search(content):
-        raise ValueError(f"Control characters found in {path}")
-
-    return content
+    return _decode(path, _read_valid_bytes(path))
 
 def read_document(path: Path) -> str:
     """
     Reads and normalizes a document from a file.
 
     This function reads a text file and then normalizes its content using
-    `normalize_document`.
+    `normalize_document`. Documents that are already normalized, which is
+    the common case for source code, are detected on raw bytes and returned
+    without rebuilding them.
 
     Args:
         path: The path to the document to read.
@@ -98,7 +144,9 @@ def read_document(path: Path) -> str:
     Returns:
         The normalized content of the document.
     """
-    return normalize_document(read_text(path))
+    data = _read_valid_bytes(path)
+    content = _decode(path, data)
+    return content if _is_normalized(data) else normalize_document(content)
 
 def path_stem(path: Path | PurePosixPath | str) -> str:
     """
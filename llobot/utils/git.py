@@ -0,0 +1,216 @@
+"""
+Reading of git repository metadata without running git.
+
+Only the index (staging area) is supported. It lists all files tracked by git
+together with stat data recorded by the last git command that refreshed it.
+Index versions 2, 3, and 4 are supported, including SHA-256 repositories.
+"""
+from __future__ import annotations
+from functools import lru_cache
+import os
+import re
+import struct
+from pathlib import Path, PurePosixPath
+from llobot.utils.values import ValueTypeMixin
+
+# ctime (s, ns), mtime (s, ns), dev, ino, mode, uid, gid, size
+_ENTRY_STAT = struct.Struct('>10I')
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE = 0x3000
+_FLAG_NAME_LENGTH = 0x0fff
+_FLAG_SKIP_WORKTREE = 0x4000
+_MODE_TYPE = 0o170000
+_MODE_DIRECTORY = 0o040000
+_MODE_GITLINK = 0o160000
+_OBJECT_FORMAT_RE = re.compile(r'^\s*objectformat\s*=\s*sha256\s*$', re.MULTILINE | re.IGNORECASE)
+
+class GitIndexEntry(ValueTypeMixin):
+    """
+    A file listed in git index.
+    """
+    _path: PurePosixPath
+    _mode: int
+    _size: int
+    _mtime_ns: int
+    _ino: int
+
+    def __init__(self, path: PurePosixPath, *, mode: int, size: int, mtime_ns: int, ino: int):
+        """
+        Creates a new index entry.
+
+        Args:
+            path: Path of the file relative to the root of the working tree.
+            mode: Git file mode, e.g. `0o100644` or `0o120000` for symlinks.
+            size: File size as recorded in the index, truncated to 32 bits.
+            mtime_ns: Modification time as recorded in the index.
+            ino: Inode number as recorded in the index, truncated to 32 bits.
+        """
+        self._path = path
+        self._mode = mode
+        self._size = size
+        self._mtime_ns = mtime_ns
+        self._ino = ino
+
+    @property
+    def path(self) -> PurePosixPath:
+        """Path of the file relative to the root of the working tree."""
+        return self._path
+
+    @property
+    def mode(self) -> int:
+        """Git file mode."""
+        return self._mode
+
+    @property
+    def size(self) -> int:
+        """File size as recorded in the index, truncated to 32 bits."""
+        return self._size
+
+    @property
+    def mtime_ns(self) -> int:
+        """Modification time as recorded in the index."""
+        return self._mtime_ns
+
+    @property
+    def ino(self) -> int:
+        """Inode number as recorded in the index, truncated to 32 bits."""
+        return self._ino
+
+def find_git_directory(directory: Path) -> tuple[Path, Path] | None:
+    """
+    Finds git repository containing a directory.
+
+    Both regular repositories and linked worktrees, in which `.git` is a file
+    pointing to the actual git directory, are supported.
+
+    Args:
+        directory: Directory inside the working tree.
+
+    Returns:
+        Root of the working tree and git directory, or `None` if the directory
+        is not in a git working tree.
+    """
+    for root in [directory, *directory.parents]:
+        marker = root / '.git'
+        if marker.is_dir():
+            return root, marker
+        if marker.is_file():
+            try:
+                content = marker.read_text().strip()
+            except (OSError, UnicodeDecodeError):
+                return None
+            if not content.startswith('gitdir:'):
+                return None
+            return root, root / content.removeprefix('gitdir:').strip()
+    return None
+
+def _varint(data: bytes, offset: int) -> tuple[int, int]:
+    """
+    Decodes variable-length integer used in index version 4.
+    """
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7f
+    while byte & 0x80:
+        byte = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (byte & 0x7f)
+    return value, offset
+
+def parse_git_index(data: bytes, *, hash_size: int = 20) -> list[GitIndexEntry]:
+    """
+    Parses content of git index file.
+
+    Unmerged paths are listed once. Submodules and entries excluded from
+    sparse checkout are left out, because they are not files in the working
+    tree. Entries are in index order, which is sorted by path bytes.
+
+    Args:
+        data: Content of the index file.
+        hash_size: Size of object hashes, 20 for SHA-1, 32 for SHA-256.
+
+    Returns:
+        List of index entries.
+
+    Raises:
+        ValueError: If the data is not a supported git index. This includes
+                    sparse indexes, which list directories instead of files.
+    """
+    if len(data) < 12 or data[:4] != b'DIRC':
+        raise ValueError('Not a git index')
+    version, count = struct.unpack_from('>II', data, 4)
+    if version not in (2, 3, 4):
+        raise ValueError(f'Unsupported git index version: {version}')
+    entries = []
+    offset = 12
+    previous = b''
+    try:
+        for _ in range(count):
+            start = offset
+            stat = _ENTRY_STAT.unpack_from(data, offset)
+            offset += _ENTRY_STAT.size + hash_size
+            flags, = struct.unpack_from('>H', data, offset)
+            offset += 2
+            extended = 0
+            if version >= 3 and flags & _FLAG_EXTENDED:
+                extended, = struct.unpack_from('>H', data, offset)
+                offset += 2
+            if version == 4:
+                strip, offset = _varint(data, offset)
+                end = data.index(b'\0', offset)
+                name = previous[:len(previous) - strip] + data[offset:end]
+                offset = end + 1
+            else:
+                length = flags & _FLAG_NAME_LENGTH
+                end = data.index(b'\0', offset + length) if length == _FLAG_NAME_LENGTH else offset + length
+                name = data[offset:end]
+                # Entries are padded with 1-8 NUL bytes to a multiple of 8 bytes.
+                offset = start + ((end - start + 8) & ~7)
+            previous = name
+            mode = stat[6]
+            if mode & _MODE_TYPE == _MODE_DIRECTORY:
+                raise ValueError('Sparse git index is not supported')
+            if mode & _MODE_TYPE == _MODE_GITLINK or extended & _FLAG_SKIP_WORKTREE:
+                continue
+            path = PurePosixPath(os.fsdecode(name))
+            if flags & _FLAG_STAGE and entries and entries[-1].path == path:
+                continue
+            entries.append(GitIndexEntry(path, mode=mode, size=stat[9], mtime_ns=stat[2] * 1_000_000_000 + stat[3], ino=stat[5]))
+    except (struct.error, IndexError) as ex:
+        raise ValueError('Truncated git index') from ex
+    return entries
+
+@lru_cache(maxsize=16)
+def _read_git_index(path: Path, hash_size: int, key: tuple[int, int, int]) -> tuple[GitIndexEntry, ...]:
+    return tuple(parse_git_index(path.read_bytes(), hash_size=hash_size))
+
+def read_git_index(git_directory: Path) -> list[GitIndexEntry] | None:
+    """
+    Reads index of a git repository.
+
+    Parsed indexes are cached until the index file changes.
+
+    Args:
+        git_directory: The git directory, usually `.git` in the working tree.
+
+    Returns:
+        List of index entries or `None` if there is no readable, supported index.
+    """
+    path = git_directory / 'index'
+    try:
+        info = os.stat(path)
+        try:
+            config = (git_directory / 'config').read_text()
+        except FileNotFoundError:
+            config = ''
+        hash_size = 32 if _OBJECT_FORMAT_RE.search(config) else 20
+        return list(_read_git_index(path, hash_size, (info.st_ino, info.st_size, info.st_mtime_ns)))
+    except (OSError, UnicodeDecodeError, ValueError):
+        return None
+
+__all__ = [
+    'GitIndexEntry',
+    'find_git_directory',
+    'parse_git_index',
+    'read_git_index',
+]
@@ -0,0 +1,162 @@
+"""
+Minimal binding of Linux inotify API via ctypes.
+
+Only the small subset needed to watch directory trees is exposed. The watcher
+is non-blocking: pending events are drained by calling `Inotify.read()`, which
+returns immediately. Use `inotify_available()` to check for platform support.
+"""
+from __future__ import annotations
+import ctypes
+import ctypes.util
+from functools import cache
+import os
+import struct
+import sys
+import weakref
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_UNMOUNT = 0x00002000
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+
+# Event header: watch descriptor, mask, cookie, and length of the padded name.
+_HEADER = struct.Struct('iIII')
+
+# Watch descriptor, event mask, and name of the file relative to the watched directory.
+type InotifyEvent = tuple[int, int, str]
+
+@cache
+def _libc() -> ctypes.CDLL | None:
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, 'inotify_init1'):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+def inotify_available() -> bool:
+    """
+    Checks whether inotify is supported on this platform.
+    """
+    return _libc() is not None
+
+def _check(result: int) -> int:
+    if result < 0:
+        code = ctypes.get_errno()
+        raise OSError(code, os.strerror(code))
+    return result
+
+class Inotify:
+    """
+    Non-blocking inotify instance.
+
+    The instance owns a file descriptor, which is released by `close()` or
+    when the instance is garbage collected.
+    """
+    _libc: ctypes.CDLL
+    _fd: int
+    _finalizer: weakref.finalize
+
+    def __init__(self):
+        """
+        Creates a new inotify instance.
+
+        Raises:
+            OSError: If inotify is not available or the per-user limit of
+                     inotify instances was reached.
+        """
+        libc = _libc()
+        if libc is None:
+            raise OSError('inotify is not available on this platform')
+        self._libc = libc
+        self._fd = _check(libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC))
+        self._finalizer = weakref.finalize(self, os.close, self._fd)
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """
+        Starts watching a path.
+
+        Args:
+            path: Filesystem path to watch.
+            mask: Combination of `IN_*` flags.
+
+        Returns:
+            Watch descriptor, which is reported in events. Watching the same
+            path twice returns the same descriptor.
+
+        Raises:
+            OSError: If the path cannot be watched, for example because it does
+                     not exist or the per-user limit of watches was reached.
+        """
+        return _check(self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask))
+
+    def remove_watch(self, wd: int):
+        """
+        Stops watching a path. Descriptors that are no longer valid are ignored.
+        """
+        self._libc.inotify_rm_watch(self._fd, wd)
+
+    def read(self) -> list[InotifyEvent]:
+        """
+        Drains all pending events without blocking.
+
+        Returns:
+            Pending events in the order in which they occurred.
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _HEADER.unpack_from(data, offset)
+                offset += _HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        """
+        Releases the file descriptor. Further calls are ignored.
+        """
+        self._finalizer()
+
+__all__ = [
+    'IN_MODIFY',
+    'IN_ATTRIB',
+    'IN_CLOSE_WRITE',
+    'IN_MOVED_FROM',
+    'IN_MOVED_TO',
+    'IN_CREATE',
+    'IN_DELETE',
+    'IN_DELETE_SELF',
+    'IN_MOVE_SELF',
+    'IN_UNMOUNT',
+    'IN_Q_OVERFLOW',
+    'IN_IGNORED',
+    'IN_ONLYDIR',
+    'IN_EXCL_UNLINK',
+    'IN_ISDIR',
+    'InotifyEvent',
+    'inotify_available',
+    'Inotify',
+]
@@ -0,0 +1,29 @@
+"""
+Helpers for running I/O-bound work in threads.
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+def parallel_map[T, R](function: Callable[[T], R], items: list[T], workers: int) -> list[R]:
+    """
+    Applies a function to all items, optionally in a thread pool, preserving order.
+
+    Args:
+        function: The function to apply.
+        items: Items to process.
+        workers: Maximum number of threads. Value 1 or less processes items
+                 sequentially in the calling thread, which is also done when
+                 there is at most one item.
+
+    Returns:
+        Results in the order of items.
+    """
+    if workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(function, items))
+
+__all__ = [
+    'parallel_map',
+]
@@ -65,6 +65,34 @@ class ValueTypeMixin:
         fields = ", ".join(f"{k}={v!r}" for k, v in sorted(self._value_fields().items()))
         return f"{self.__class__.__name__}({fields})"
 
+def value_identity(value: Any) -> str:
+    """
+    Returns a textual identity of a value that is stable across processes.
+
+    Unlike `repr()`, the identity does not depend on iteration order of sets
+    and dicts, which varies with hash randomization. Value types are
+    identified by their qualified class name and value fields. Other objects
+    fall back to `repr()`, which must then be stable for the identity to be.
+
+    Args:
+        value: The value to identify.
+
+    Returns:
+        Identity string that is equal for equal values.
+    """
+    if isinstance(value, ValueTypeMixin):
+        fields = ", ".join(f"{k}={value_identity(v)}" for k, v in sorted(value._value_fields().items()))
+        return f"{type(value).__module__}.{type(value).__qualname__}({fields})"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ", ".join(sorted(value_identity(item) for item in value)) + "}"
+    if isinstance(value, dict):
+        return "{" + ", ".join(sorted(f"{value_identity(k)}: {value_identity(v)}" for k, v in value.items())) + "}"
+    if isinstance(value, (list, tuple)):
+        items = ", ".join(value_identity(item) for item in value)
+        return f"[{items}]" if isinstance(value, list) else f"({items})"
+    return repr(value)
+
 __all__ = [
     'ValueTypeMixin',
+    'value_identity',
 ]
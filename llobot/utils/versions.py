@@ -0,0 +1,24 @@
+"""
+Version of the installed llobot package.
+
+Persistent caches include the version in their keys, so that upgrades do not
+serve results computed by older code.
+"""
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+
+@cache
+def package_version() -> str:
+    """
+    Returns version of the installed llobot package.
+
+    Source trees that are not installed report version `'unknown'`.
+    """
+    try:
+        return version('llobot')
+    except PackageNotFoundError:
+        return 'unknown'
+
+__all__ = [
+    'package_version',
+]
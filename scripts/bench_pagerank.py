@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmarks PageRank backends on random knowledge graphs.
+
+Run from the repository root:
+
+    python scripts/bench_pagerank.py
+    python scripts/bench_pagerank.py --sizes 1000 10000 --links 4
+
+Graphs have random links between paths spread over 50 directories. Every
+size is measured with the pure-Python backend and, if NumPy is installed,
+with the NumPy backend. Time of the first run is reported, because results
+of `pagerank_scores()` are cached.
+"""
+from __future__ import annotations
+import argparse
+from importlib.util import find_spec
+from pathlib import Path, PurePosixPath
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from llobot.knowledge.graphs import KnowledgeGraph
+from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
+from llobot.knowledge.scores.pagerank import pagerank_scores
+
+def random_graph(size: int, links: int, seed: int) -> KnowledgeGraph:
+    generator = random.Random(seed)
+    paths = [PurePosixPath(f'd{i % 50}/f{i}.py') for i in range(size)]
+    builder = KnowledgeGraphBuilder()
+    for _ in range(size * links):
+        builder.add(generator.choice(paths), generator.choice(paths))
+    return builder.build()
+
+def measure(graph: KnowledgeGraph, tolerance: float, vectorized: bool) -> float:
+    start = time.perf_counter()
+    pagerank_scores(graph, tolerance=tolerance, vectorized=vectorized)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks PageRank backends on random knowledge graphs.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help='numbers of nodes')
+    parser.add_argument('--links', type=int, default=8, help='links per node')
+    parser.add_argument('--tolerance', type=float, default=1e-6, help='convergence tolerance')
+    args = parser.parse_args()
+    numpy_installed = find_spec('numpy') is not None
+    print(f'Random graphs, {args.links} links per node, tolerance {args.tolerance:g}')
+    for size in args.sizes:
+        graph = random_graph(size, args.links, size)
+        python = measure(graph, args.tolerance, False)
+        numpy = f'{measure(graph, args.tolerance, True):.2f}s' if numpy_installed else 'n/a'
+        print(f'  {size} nodes: python {python:.2f}s, numpy {numpy}')
+
+if __name__ == '__main__':
+    main()
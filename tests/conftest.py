@@ -0,0 +1,24 @@
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import pytest
+
+_home: Path | None = None
+_original_home: str | None = None
+
+def pytest_configure(config: pytest.Config):
+    # Standard caches are persisted under the home directory. They are created during collection,
+    # so the home directory is replaced before that and removed after the run.
+    global _home, _original_home
+    _original_home = os.environ.get('HOME')
+    _home = Path(tempfile.mkdtemp(prefix='llobot-home-'))
+    os.environ['HOME'] = str(_home)
+
+def pytest_unconfigure(config: pytest.Config):
+    if _original_home is None:
+        os.environ.pop('HOME', None)
+    else:
+        os.environ['HOME'] = _original_home
+    if _home is not None:
+        shutil.rmtree(_home, ignore_errors=True)
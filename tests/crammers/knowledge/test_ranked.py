@@ -6,6 +6,7 @@ from llobot.environments.context import ContextEnv
 from llobot.environments.knowledge import KnowledgeEnv
 from llobot.environments.projects import ProjectEnv
 from llobot.knowledge import Knowledge
+from llobot.knowledge.lazy import LazyKnowledge
 from llobot.knowledge.ranking import KnowledgeRanking
 from llobot.knowledge.ranking.lexicographical import LexicographicalRanker
 from llobot.knowledge.subsets import coerce_subset
@@ -17,7 +18,7 @@ def setup_env(knowledge: Knowledge) -> Environment:
 
     # Setup project to return provided knowledge
     mock_project = MagicMock()
-    mock_project.read_all.return_value = knowledge
+    mock_project.read_lazy.return_value = knowledge
     # Inject mock project into ProjectEnv cache
     env[ProjectEnv].__dict__['union'] = mock_project
 
@@ -152,3 +153,35 @@ def test_cram_skips_existing():
     # Check KnowledgeEnv
     assert "a.txt" in env[KnowledgeEnv]
     assert "b.txt" in env[KnowledgeEnv]
+
+def test_cram_skips_unreadable():
+    """Tests that unreadable documents do not consume budget."""
+    documents = {
+        PurePosixPath("a.txt"): "a" * 500,
+        PurePosixPath("b.bin"): None,
+        PurePosixPath("c.txt"): "c" * 500,
+    }
+    k = LazyKnowledge(documents.get, {
+        PurePosixPath("a.txt"): 500,
+        PurePosixPath("b.bin"): 600,
+        PurePosixPath("c.txt"): 500,
+    })
+    crammer = RankedKnowledgeCrammer(
+        ranker=LexicographicalRanker(),
+        blacklist=EmptySubset(),
+        budget=1200
+    )
+    env = setup_env(k)
+
+    crammer.cram(env)
+
+    # Check ContextEnv
+    chat = env[ContextEnv].build()
+    assert any("File: ~/a.txt" in msg.content for msg in chat)
+    assert any("File: ~/c.txt" in msg.content for msg in chat)
+    assert not any("File: ~/b.bin" in msg.content for msg in chat)
+
+    # Check KnowledgeEnv
+    assert "a.txt" in env[KnowledgeEnv]
+    assert "c.txt" in env[KnowledgeEnv]
+    assert "b.bin" not in env[KnowledgeEnv]
@@ -13,3 +13,25 @@ def test_builder():
     assert graph[PurePosixPath('a')] == KnowledgeIndex(['b', 'c'])
     assert graph[PurePosixPath('b')] == KnowledgeIndex(['c'])
     assert graph[PurePosixPath('c')] == KnowledgeIndex()
+
+def test_builder_seed_and_remove():
+    builder = KnowledgeGraphBuilder()
+    builder.add(PurePosixPath('a'), PurePosixPath('b'))
+    builder.add(PurePosixPath('b'), PurePosixPath('c'))
+    seeded = KnowledgeGraphBuilder(builder.build())
+    seeded.remove(PurePosixPath('a'))
+    seeded.add(PurePosixPath('c'), PurePosixPath('a'))
+    graph = seeded.build()
+    assert graph[PurePosixPath('a')] == KnowledgeIndex()
+    assert graph[PurePosixPath('b')] == KnowledgeIndex(['c'])
+    assert graph[PurePosixPath('c')] == KnowledgeIndex(['a'])
+
+def test_builder_seed_adopts_paths():
+    builder = KnowledgeGraphBuilder()
+    builder.add(PurePosixPath('a'), PurePosixPath('b'))
+    graph = builder.build()
+    seeded = KnowledgeGraphBuilder(graph)
+    seeded.add(PurePosixPath('b'), PurePosixPath('c'))
+    patched = seeded.build()
+    assert patched.paths[:2] == graph.paths
+    assert patched[PurePosixPath('b')] == KnowledgeIndex(['c'])
@@ -1,9 +1,14 @@
+import gc
 from pathlib import PurePosixPath
+import weakref
 from llobot.knowledge import Knowledge
 from llobot.knowledge.graphs import KnowledgeGraph
 from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
 from llobot.knowledge.graphs.chain import KnowledgeCrawlerChain
 from llobot.knowledge.graphs.crawler import KnowledgeCrawler
+from llobot.knowledge.indexes import KnowledgeIndex
+from llobot.knowledge.subsets import KnowledgeSubset
+from llobot.knowledge.subsets.suffix import SuffixSubset
 from llobot.utils.values import ValueTypeMixin
 
 class SimpleCrawler(KnowledgeCrawler, ValueTypeMixin):
@@ -33,3 +38,63 @@ def test_chain_flattening():
     chain1 = KnowledgeCrawlerChain(c1, c2)
     chain2 = KnowledgeCrawlerChain(chain1, c3)
     assert chain2._crawlers == (c1, c2, c3)
+
+class RecordingCrawler(KnowledgeCrawler):
+    def __init__(self, suffix: str):
+        self.suffix = suffix
+        self.sources: list[list[PurePosixPath]] = []
+    @property
+    def subset(self) -> KnowledgeSubset:
+        return SuffixSubset(self.suffix)
+    def crawl_into(self, knowledge: Knowledge, sources: list[PurePosixPath], builder: KnowledgeGraphBuilder):
+        self.sources.append(sources)
+        for path in sources:
+            builder.add(path, PurePosixPath(knowledge[path]))
+
+def test_chain_dispatch():
+    py = RecordingCrawler('.py')
+    rs = RecordingCrawler('.rs')
+    chain = KnowledgeCrawlerChain(py, rs, SimpleCrawler('x.py', 'y.rs'))
+    knowledge = Knowledge({PurePosixPath('x.py'): 'y.rs', PurePosixPath('y.rs'): 'x.py', PurePosixPath('z.txt'): 'x.py'})
+    graph = chain.crawl(knowledge)
+    assert py.sources == [[PurePosixPath('x.py')]]
+    assert rs.sources == [[PurePosixPath('y.rs')]]
+    assert graph[PurePosixPath('x.py')] == KnowledgeIndex(['y.rs'])
+    assert graph[PurePosixPath('y.rs')] == KnowledgeIndex(['x.py'])
+    assert graph[PurePosixPath('z.txt')] == KnowledgeIndex()
+
+def test_chain_incremental():
+    py = RecordingCrawler('.py')
+    chain = KnowledgeCrawlerChain(py, RecordingCrawler('.rs'))
+    old = Knowledge({PurePosixPath('a.py'): 'b.py', PurePosixPath('b.py'): 'a.py'})
+    chain.crawl(old)
+    # Modified documents are crawled again.
+    new = old | Knowledge({PurePosixPath('a.py'): 'c.py'})
+    graph = chain.crawl(new)
+    assert py.sources[-1] == [PurePosixPath('a.py')]
+    assert graph == chain.crawl(Knowledge(dict(new)))
+    # Added documents cause full crawl.
+    added = new | Knowledge({PurePosixPath('c.py'): 'a.py'})
+    chain.crawl(added)
+    assert len(py.sources[-1]) == 3
+
+def test_chain_history_is_weak():
+    chain = KnowledgeCrawlerChain(RecordingCrawler('.py'))
+    knowledge = Knowledge({PurePosixPath('a.py'): 'b.py'})
+    chain.crawl(knowledge)
+    reference = weakref.ref(knowledge)
+    del knowledge
+    # Push the knowledge out of the crawl cache, which holds it strongly.
+    for name in ['c.py', 'd.py']:
+        chain.crawl(Knowledge({PurePosixPath(name): ''}))
+    gc.collect()
+    assert reference() is None
+
+def test_chain_update():
+    py = RecordingCrawler('.py')
+    chain = KnowledgeCrawlerChain(py, RecordingCrawler('.rs'))
+    old = Knowledge({PurePosixPath('a.py'): 'b.py', PurePosixPath('b.py'): 'a.py'})
+    new = old | Knowledge({PurePosixPath('a.py'): 'c.py'})
+    graph = chain.update(new, old.diff(new), chain.crawl(old))
+    assert py.sources[-1] == [PurePosixPath('a.py')]
+    assert graph == chain.crawl(Knowledge(dict(new)))
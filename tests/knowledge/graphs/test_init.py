@@ -82,3 +82,45 @@ def test_graph_symmetrical():
     assert symmetrical.keys() == KnowledgeIndex(['a', 'b'])
     assert symmetrical[PurePosixPath('a')] == KnowledgeIndex(['b'])
     assert symmetrical[PurePosixPath('b')] == KnowledgeIndex(['a'])
+
+def test_graph_csr():
+    graph = KnowledgeGraph({
+        PurePosixPath('a'): KnowledgeIndex(['c', 'b']),
+        PurePosixPath('b'): KnowledgeIndex(['c']),
+        PurePosixPath('d'): KnowledgeIndex(),
+    })
+    assert graph.paths == (PurePosixPath('a'), PurePosixPath('b'), PurePosixPath('c'))
+    assert list(graph.offsets) == [0, 2, 3, 3]
+    assert list(graph.targets) == [1, 2, 2]
+    assert PurePosixPath('d') not in graph
+
+def test_graph_reverse_shares_paths():
+    graph = KnowledgeGraph({
+        PurePosixPath('a'): KnowledgeIndex(['b', 'c']),
+        PurePosixPath('b'): KnowledgeIndex(['c']),
+    })
+    reversed_graph = graph.reverse()
+    assert reversed_graph.paths is graph.paths
+    assert list(reversed_graph.offsets) == [0, 0, 1, 3]
+    assert list(reversed_graph.targets) == [0, 0, 1]
+    assert reversed_graph.reverse() == graph
+
+def test_graph_merge_tables():
+    graph1 = KnowledgeGraph({PurePosixPath('a'): KnowledgeIndex(['b'])})
+    graph2 = KnowledgeGraph({
+        PurePosixPath('c'): KnowledgeIndex(['a']),
+        PurePosixPath('a'): KnowledgeIndex(['c']),
+    })
+    merged = graph1 | graph2
+    assert merged == KnowledgeGraph({
+        PurePosixPath('a'): KnowledgeIndex(['b', 'c']),
+        PurePosixPath('c'): KnowledgeIndex(['a']),
+    })
+    assert hash(merged) == hash(graph2 | graph1)
+    assert graph1 | KnowledgeGraph() is graph1
+
+def test_graph_from_ids():
+    paths = (PurePosixPath('a'), PurePosixPath('b'), PurePosixPath('c'))
+    graph = KnowledgeGraph.from_ids(paths, [{2, 1}, set(), set()])
+    assert graph == KnowledgeGraph({PurePosixPath('a'): KnowledgeIndex(['b', 'c'])})
+    assert len(graph) == 1
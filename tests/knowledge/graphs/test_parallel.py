@@ -0,0 +1,40 @@
+from pathlib import PurePosixPath
+from llobot.knowledge import Knowledge
+from llobot.knowledge.graphs.parallel import CrawlPool, standard_crawl_pool
+from llobot.knowledge.graphs.python import PythonImportsCrawler
+from llobot.knowledge.graphs.references import ReferenceCache
+
+def _square(items: list[int]) -> list[int]:
+    return [item * item for item in items]
+
+def test_crawl_pool():
+    pool = CrawlPool(workers=2, threshold=10)
+    try:
+        assert pool.map(_square, [1, 2, 3]) == [1, 4, 9]
+        assert pool.map(_square, list(range(100))) == [item * item for item in range(100)]
+    finally:
+        pool.shutdown()
+
+def test_crawl_pool_unpicklable():
+    pool = CrawlPool(workers=2, threshold=1)
+    try:
+        # Lambdas cannot be sent to workers, so the pool falls back to serial execution.
+        assert pool.map(lambda items: [-item for item in items], [1, 2]) == [-1, -2]
+    finally:
+        pool.shutdown()
+
+def test_parallel_crawl():
+    knowledge = Knowledge({PurePosixPath(f'pkg/m{i}.py'): f'import pkg.m{(i + 1) % 50}\nfrom . import m{(i + 2) % 50}' for i in range(50)})
+    pool = CrawlPool(workers=2, threshold=1)
+    try:
+        parallel = PythonImportsCrawler(cache=ReferenceCache(), pool=pool).crawl(knowledge)
+    finally:
+        pool.shutdown()
+    serial = PythonImportsCrawler(cache=ReferenceCache(), pool=CrawlPool(workers=1)).crawl(knowledge)
+    assert parallel == serial
+    assert parallel[PurePosixPath('pkg/m0.py')] == serial[PurePosixPath('pkg/m0.py')]
+    assert len(parallel[PurePosixPath('pkg/m0.py')]) == 2
+
+def test_standard_crawl_pool_is_serial():
+    assert standard_crawl_pool().workers == 1
+    assert PythonImportsCrawler().pool.workers == 1
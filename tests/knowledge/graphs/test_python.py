@@ -1,6 +1,8 @@
 from pathlib import PurePosixPath
 from llobot.knowledge import Knowledge
+from llobot.knowledge.indexes import KnowledgeIndex
 from llobot.knowledge.graphs.python import (
+    PythonImportsCrawler,
     PythonSimpleImportsCrawler,
     PythonFromImportsCrawler,
     PythonItemImportsCrawler,
@@ -41,3 +43,54 @@ def test_python_item_imports_crawler():
 
     graph2 = crawler.crawl(KNOWLEDGE)
     assert list(graph2[PurePosixPath('utils/helpers.py')].sorted()) == [PurePosixPath('utils/constants.py')]
+
+def test_python_crawler_update():
+    updated = KNOWLEDGE | Knowledge({PurePosixPath('main.py'): "import services.api"})
+    for crawler in [PythonSimpleImportsCrawler(), PythonFromImportsCrawler(), PythonItemImportsCrawler()]:
+        # Modification recrawls only the modified file.
+        graph = crawler.update(updated, KNOWLEDGE.diff(updated), crawler.crawl(KNOWLEDGE))
+        assert graph == crawler.crawl(updated)
+        # Added file might resolve imports elsewhere, which triggers full crawl.
+        added = KNOWLEDGE | Knowledge({PurePosixPath('services/__init__.py'): "", PurePosixPath('utils/__init__.py'): ""})
+        graph = crawler.update(added, KNOWLEDGE.diff(added), crawler.crawl(KNOWLEDGE))
+        assert graph == crawler.crawl(added)
+
+def test_python_imports_crawler():
+    knowledge = Knowledge({
+        PurePosixPath('app/main.py'): "\n".join([
+            "import app.config",
+            "import lib.util, lib.other",
+            "from . import views",
+            "from .models import Model, forms as f",
+            "from ..lib import util",
+            "from lib import (",
+            "    other,",
+            "    extra as e,",
+            ")",
+            "    from app import models",
+            "from app.views import *",
+            "from  import nothing",
+        ]),
+        PurePosixPath('app/config.py'): "from app import config",
+        PurePosixPath('app/views.py'): "import lib",
+        PurePosixPath('app/models/__init__.py'): "from .forms import Form",
+        PurePosixPath('app/models/forms.py'): "",
+        PurePosixPath('lib/__init__.py'): "",
+        PurePosixPath('lib/util.py'): "",
+        PurePosixPath('lib/other.py'): "",
+        PurePosixPath('lib/extra.py'): "",
+    })
+    chained = PythonSimpleImportsCrawler() | PythonFromImportsCrawler() | PythonItemImportsCrawler()
+    graph = PythonImportsCrawler().crawl(knowledge)
+    assert graph == chained.crawl(knowledge)
+    assert graph[PurePosixPath('app/main.py')] == KnowledgeIndex([
+        'app/config.py',
+        'app/models/__init__.py',
+        'app/models/forms.py',
+        'app/views.py',
+        'lib/__init__.py',
+        'lib/extra.py',
+        'lib/other.py',
+        'lib/util.py',
+    ])
+    assert PythonImportsCrawler().crawl(KNOWLEDGE) == chained.crawl(KNOWLEDGE)
@@ -0,0 +1,69 @@
+from pathlib import Path, PurePosixPath
+from llobot.knowledge import Knowledge
+from llobot.knowledge.graphs.python import PythonFromImportsCrawler
+from llobot.knowledge.graphs.references import ReferenceCache
+from llobot.utils.versions import package_version
+
+KNOWLEDGE = Knowledge({
+    PurePosixPath('main.py'): "from utils import helpers\nfrom .utils import x",
+    PurePosixPath('utils.py'): "",
+})
+
+def _key(path: str) -> tuple[str, PurePosixPath, bytes]:
+    return ('crawler', PurePosixPath(path), b'\x01\x02')
+
+def test_reference_cache():
+    cache = ReferenceCache(capacity=2)
+    assert cache.get(_key('a')) is None
+    cache.put(_key('a'), ('x',))
+    cache.put(_key('b'), ('y',))
+    assert cache.get(_key('a')) == ('x',)
+    cache.put(_key('c'), ())
+    # Least recently used entry is evicted.
+    assert cache.get(_key('b')) is None
+    assert cache.get(_key('c')) == ()
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.size) == (2, 2, 2)
+
+def test_reference_cache_persistence(tmp_path: Path):
+    location = tmp_path / 'references.jsonl'
+    cache = ReferenceCache(location)
+    cache.put(_key('a'), ('x', 'y'))
+    cache.flush()
+    with open(location, 'a') as file:
+        file.write('["truncated')
+    reloaded = ReferenceCache(location)
+    assert reloaded.get(_key('a')) == ('x', 'y')
+    reloaded.clear()
+    assert not location.exists()
+
+def test_reference_crawler_cache():
+    cache = ReferenceCache()
+    crawler = PythonFromImportsCrawler(cache=cache)
+    assert crawler == PythonFromImportsCrawler()
+    graph = crawler.crawl(KNOWLEDGE)
+    assert crawler.references(KNOWLEDGE, PurePosixPath('main.py')) == ('utils', '.utils')
+    assert crawler.crawl(KNOWLEDGE) == graph
+    assert cache.stats.misses == 2
+    assert cache.stats.size == 2
+
+def test_reference_crawler_cache_key_version():
+    class BumpedCrawler(PythonFromImportsCrawler):
+        CACHE_VERSION = PythonFromImportsCrawler.CACHE_VERSION + 1
+    cache = ReferenceCache()
+    PythonFromImportsCrawler(cache=cache).crawl(KNOWLEDGE)
+    assert package_version() in PythonFromImportsCrawler().cache_key
+    # Bumped version does not see references extracted by the older version.
+    BumpedCrawler(cache=cache).crawl(KNOWLEDGE)
+    assert cache.stats.misses == 4
+
+def test_reference_cache_flush_compacts(tmp_path: Path):
+    location = tmp_path / 'references.jsonl'
+    cache = ReferenceCache(location, capacity=10)
+    for i in range(2000):
+        cache.put(_key(f'f{i}'), ('x',))
+        cache.flush()
+    # Log is compacted during flushes instead of growing until the next load.
+    assert len(location.read_text().splitlines()) < 2 * 10 + 1024
+    assert not list(tmp_path.glob('*.tmp'))
+    assert ReferenceCache(location).get(_key('f1999')) == ('x',)
@@ -0,0 +1,105 @@
+import os
+from pathlib import Path, PurePosixPath
+from llobot.knowledge import Knowledge
+from llobot.knowledge.lazy import LazyKnowledge
+from llobot.knowledge.scores import KnowledgeScores
+from llobot.knowledge.scores import cached
+from llobot.knowledge.scores.cached import CachedScorer, ScoreCache, score_cache_key
+from llobot.knowledge.scores.length import LengthScorer
+from llobot.knowledge.scores.scorers import KnowledgeScorer, standard_scorer
+from llobot.utils.values import ValueTypeMixin
+
+KNOWLEDGE = Knowledge({
+    PurePosixPath('a.py'): 'abc',
+    PurePosixPath('dir/b.py'): 'abcdef',
+})
+
+class CountingScorer(KnowledgeScorer):
+    def __init__(self):
+        self.calls = 0
+    def score(self, knowledge: Knowledge) -> KnowledgeScores:
+        self.calls += 1
+        return LengthScorer().score(knowledge)
+
+def test_score_cache_persistence(tmp_path: Path):
+    scores = KnowledgeScores({PurePosixPath('a.py'): 1.5, PurePosixPath('dir/b.py'): -2.0})
+    ScoreCache(tmp_path).put('key', scores)
+    assert ScoreCache(tmp_path).get('key') == scores
+    assert ScoreCache(tmp_path).get('missing') is None
+    (tmp_path / 'key.scores').write_bytes(b'garbage')
+    assert ScoreCache(tmp_path).get('key') is None
+
+def test_score_cache_eviction(tmp_path: Path):
+    scores = KnowledgeScores({PurePosixPath(f'file{i}.py'): float(i + 1) for i in range(100)})
+    cache = ScoreCache(tmp_path)
+    cache.put('old', scores)
+    size = (tmp_path / 'old.scores').stat().st_size
+    os.utime(tmp_path / 'old.scores', (0, 0))
+    cache = ScoreCache(tmp_path, capacity=size + size // 2)
+    cache.put('new', scores)
+    assert not (tmp_path / 'old.scores').exists()
+    assert (tmp_path / 'new.scores').exists()
+
+def test_cached_scorer(tmp_path: Path):
+    inner = CountingScorer()
+    scorer = CachedScorer(inner, cache=ScoreCache(tmp_path))
+    scores = scorer.score(KNOWLEDGE)
+    assert scores == LengthScorer().score(KNOWLEDGE)
+    assert scorer.score(Knowledge(dict(KNOWLEDGE))) == scores
+    assert inner.calls == 1
+    # Fresh process-like cache only has the disk copy.
+    restarted = CachedScorer(inner, cache=ScoreCache(tmp_path))
+    assert restarted.score(KNOWLEDGE) == scores
+    assert inner.calls == 1
+    # Hits are interned in the path table of the scored knowledge like fresh scores.
+    copy = Knowledge(dict(KNOWLEDGE))
+    assert restarted.score(KNOWLEDGE).table is KNOWLEDGE.keys().table
+    assert restarted.score(copy).table is copy.keys().table
+    scorer.score(KNOWLEDGE | Knowledge({PurePosixPath('a.py'): 'changed'}))
+    assert inner.calls == 2
+
+def test_score_cache_key():
+    key = score_cache_key(LengthScorer(), KNOWLEDGE)
+    assert key == score_cache_key(LengthScorer(), Knowledge(dict(KNOWLEDGE)))
+    assert key != score_cache_key(LengthScorer(), KNOWLEDGE & 'a.py')
+
+def test_score_cache_key_version(monkeypatch):
+    key = score_cache_key(LengthScorer(), KNOWLEDGE)
+    # Scores computed by other versions of scoring code are not reused.
+    monkeypatch.setattr(cached, 'SCORE_CACHE_VERSION', cached.SCORE_CACHE_VERSION + 1)
+    assert score_cache_key(LengthScorer(), KNOWLEDGE) != key
+    monkeypatch.undo()
+    monkeypatch.setattr(cached, 'package_version', lambda: 'other')
+    assert score_cache_key(LengthScorer(), KNOWLEDGE) != key
+
+class CountingProject(ValueTypeMixin):
+    _documents: dict[PurePosixPath, str]
+
+    def __init__(self, documents: dict[PurePosixPath, str]):
+        self._documents = documents
+        self.reads = 0
+
+    def _ephemeral_fields(self):
+        return ['reads']
+
+    def read(self, path: PurePosixPath) -> str | None:
+        self.reads += 1
+        return self._documents.get(path)
+
+def test_standard_scorer_lazy_reads():
+    documents = {}
+    for i in range(30):
+        documents[PurePosixPath(f'pkg/m{i}.py')] = f'import pkg.m{(i + 1) % 30}\n'
+        documents[PurePosixPath(f'data/d{i}.json')] = '{}'
+    project = CountingProject(documents)
+    sizes = {path: len(content) for path, content in documents.items()}
+    scores = standard_scorer().score(LazyKnowledge(project.read, sizes, version=1))
+    assert scores.keys() == LazyKnowledge(project.read, sizes).keys()
+    # Only Python files are read by the crawler. Computing the cache key reads nothing.
+    assert project.reads == 30
+    # Equal lazy knowledge is scored from cache without reading anything.
+    assert standard_scorer().score(LazyKnowledge(project.read, sizes, version=1)) == scores
+    assert project.reads == 30
+    # Knowledge without fingerprint is scored without the cache, still reading only Python files.
+    standard_scorer().score(LazyKnowledge(project.read, sizes, version=object()))
+    assert project.reads == 60
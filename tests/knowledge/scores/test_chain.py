@@ -55,3 +55,32 @@ def test_or_operator():
     chain = scorer1 | scorer2
     assert isinstance(chain, KnowledgeScorerChain)
     assert chain._scorers == (scorer1, scorer2)
+
+def test_chain_forwards_deltas():
+    first = KnowledgeScores({PurePosixPath('a.txt'): 10})
+    second = KnowledgeScores({PurePosixPath('a.txt'): 5})
+    scorer1 = Mock(spec=KnowledgeScorer)
+    scorer1.score.return_value = first
+    scorer1.update.return_value = first
+    scorer1.rescore.return_value = first
+    scorer1.update_rescore.return_value = first
+    scorer2 = Mock(spec=KnowledgeScorer)
+    scorer2.rescore.return_value = second
+    scorer2.update_rescore.return_value = second
+    chain = KnowledgeScorerChain(scorer1, scorer2)
+    chain.score(knowledge)
+    updated = knowledge | Knowledge({PurePosixPath('a.txt'): 'AA'})
+    assert chain.score(updated) is second
+    delta = knowledge.diff(updated)
+    scorer1.update.assert_called_once_with(updated, delta, first)
+    scorer2.update_rescore.assert_called_once_with(updated, delta, first, second)
+    # Rescoring is forwarded separately, because its older scores come from different initial scores.
+    initial = KnowledgeScores({PurePosixPath('a.txt'): 1})
+    chain.rescore(knowledge, initial)
+    chain.rescore(updated, initial)
+    scorer1.update_rescore.assert_called_once_with(updated, delta, initial, first)
+
+def test_chain_update_matches_score():
+    scorer = ConstantScorer(2) | ConstantScorer(3)
+    updated = knowledge | Knowledge({PurePosixPath('c.txt'): 'C'})
+    assert scorer.update(updated, knowledge.diff(updated), scorer.score(knowledge)) == scorer.score(Knowledge(dict(updated)))
@@ -42,3 +42,9 @@ def test_constant_scores_invalid_type():
         assert False, "Should have raised TypeError"
     except TypeError:
         pass
+
+def test_constant_scorer_update():
+    scorer = ConstantScorer(2.0)
+    updated = Knowledge({PurePosixPath('b.txt'): 'changed', PurePosixPath('c.txt'): 'C'})
+    scores = scorer.update(updated, knowledge.diff(updated), scorer.score(knowledge))
+    assert scores == scorer.score(updated)
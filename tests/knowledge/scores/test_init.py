@@ -1,8 +1,12 @@
+import operator
 from pathlib import PurePosixPath
+from random import Random
 from unittest.mock import patch
+import pytest
 from llobot.knowledge import Knowledge
 from llobot.knowledge.scores import KnowledgeScores, coerce_scores
 from llobot.knowledge.indexes import KnowledgeIndex
+from llobot.knowledge.tables import PathTable
 
 def test_knowledge_scores():
     scores = KnowledgeScores({PurePosixPath('a.txt'): 1.0, PurePosixPath('b.txt'): 2.0, PurePosixPath('c.txt'): 0})
@@ -32,3 +36,34 @@ def test_coerce_scores_from_index():
     scores = coerce_scores(idx)
     assert scores[PurePosixPath('a.txt')] == 1
     assert scores[PurePosixPath('b.txt')] == 1
+
+def test_knowledge_scores_table():
+    table = PathTable()
+    paths = [PurePosixPath(f'dir{i % 3}/file{i}.txt') for i in range(20)]
+    random = Random(5)
+    for _ in range(20):
+        left = {path: random.choice([0.0, 1.0, -2.5, random.random()]) for path in random.sample(paths, 12)}
+        right = {path: random.choice([0.0, 3.0, random.random()]) for path in random.sample(paths, 12)}
+        plain = (KnowledgeScores(left), KnowledgeScores(right))
+        dense = (KnowledgeScores(left, table=table), KnowledgeScores(right, table=table))
+        assert dense[0] == plain[0]
+        assert hash(dense[0]) == hash(plain[0])
+        assert len(dense[0]) == len(plain[0])
+        assert dense[0].keys() == plain[0].keys()
+        assert dense[0].total() == pytest.approx(plain[0].total())
+        for operation in [operator.add, operator.sub, operator.mul, operator.truediv, operator.or_]:
+            expected = operation(*plain)
+            actual = operation(*dense)
+            assert actual.table is table
+            assert actual.keys() == expected.keys()
+            for path in paths:
+                assert actual[path] == pytest.approx(expected[path])
+        for scalar in [0, 2, -0.5]:
+            assert dense[0] + scalar == plain[0] + scalar
+            assert dense[0] * scalar == plain[0] * scalar
+            assert scalar - dense[0] == scalar - plain[0]
+        subset = KnowledgeIndex(random.sample(paths, 10), table=table)
+        assert dense[0] & subset == plain[0] & subset
+        assert dense[0] - subset == plain[0] - subset
+        assert dense[0] & '*.txt' == plain[0] & '*.txt'
+        assert dense[0] - 'dir1' == plain[0] - 'dir1'
@@ -20,3 +20,13 @@ def test_length_scorer():
     assert scores[PurePosixPath('a.txt')] == 1
     assert scores[PurePosixPath('b.txt')] == 2
     assert PurePosixPath('c.txt') not in scores
+
+def test_length_scorer_update():
+    scorer = LengthScorer()
+    updated = Knowledge({
+        PurePosixPath('a.txt'): 'AAA',
+        PurePosixPath('c.txt'): 'C',
+        PurePosixPath('d.txt'): 'DDDD',
+    })
+    scores = scorer.update(updated, knowledge.diff(updated), scorer.score(knowledge))
+    assert scores == scorer.score(updated)
@@ -1,10 +1,16 @@
+import gc
+from importlib.util import find_spec
 from pathlib import PurePosixPath
+from random import Random
+import weakref
+import pytest
 from llobot.knowledge import Knowledge
 from llobot.knowledge.graphs import KnowledgeGraph
+from llobot.knowledge.graphs.builder import KnowledgeGraphBuilder
 from llobot.knowledge.graphs.crawler import KnowledgeCrawler
 from llobot.knowledge.indexes import KnowledgeIndex
 from llobot.knowledge.scores import KnowledgeScores
-from llobot.knowledge.scores.pagerank import PageRankScorer
+from llobot.knowledge.scores.pagerank import PageRankScorer, pagerank_scores
 from llobot.utils.values import ValueTypeMixin
 
 p = lambda s: PurePosixPath(s)
@@ -54,3 +60,116 @@ def test_pagerank_rescore():
     scores = scorer.rescore(knowledge, initial)
     assert len(scores) == 2
     assert scores[p('a')] > scores[p('b')]
+
+def test_pagerank_backends_match():
+    pytest.importorskip('numpy')
+    random = Random(42)
+    paths = [p(f'd{i % 7}/f{i}.py') for i in range(200)]
+    builder = KnowledgeGraphBuilder()
+    for _ in range(600):
+        builder.add(random.choice(paths[:150]), random.choice(paths[:150]))
+    graph = builder.build()
+    nodes = KnowledgeIndex(paths)
+    initial = KnowledgeScores({path: random.random() for path in paths})
+    for kwargs in [{}, {'initial': initial}, {'tolerance': 1e-9}]:
+        expected = pagerank_scores(graph, nodes, vectorized=False, **kwargs)
+        actual = pagerank_scores(graph, nodes, vectorized=True, **kwargs)
+        assert list(actual.keys()) == list(expected.keys())
+        for path in paths:
+            assert actual[path] == pytest.approx(expected[path], rel=1e-9)
+
+def test_pagerank_unlinked_table_nodes():
+    builder = KnowledgeGraphBuilder()
+    builder.add(p('a'), p('b'))
+    builder.add(p('c'), p('d'))
+    builder.add(p('a'), p('d'))
+    builder.remove(p('c'))
+    # Node 'c' stays in the node table, but it has no links.
+    graph = builder.build()
+    assert p('c') in graph.paths
+    expected = pagerank_scores(KnowledgeGraph({p('a'): KnowledgeIndex([p('b'), p('d')])}), KnowledgeIndex([p('e')]), vectorized=False)
+    assert expected.keys() == KnowledgeIndex([p('a'), p('b'), p('d'), p('e')])
+    for vectorized in [False, True] if find_spec('numpy') else [False]:
+        scores = pagerank_scores(graph, KnowledgeIndex([p('e')]), vectorized=vectorized)
+        assert scores.keys() == expected.keys()
+        for path in expected.keys():
+            assert scores[path] == pytest.approx(expected[path])
+
+def test_pagerank_warm_start():
+    random = Random(7)
+    paths = [p(f'f{i}.py') for i in range(100)]
+    knowledge = Knowledge({path: '' for path in paths})
+    builder = KnowledgeGraphBuilder()
+    for _ in range(400):
+        builder.add(random.choice(paths), random.choice(paths))
+    graph = builder.build()
+    builder.add(paths[0], paths[1])
+    builder.add(paths[2], paths[1])
+    edited_graph = builder.build()
+    edited = knowledge | Knowledge({paths[0]: '# edited', paths[2]: '# edited'})
+
+    class LineageCrawler(KnowledgeCrawler):
+        def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
+            return edited_graph if knowledge is edited else graph
+
+    scorer = PageRankScorer(LineageCrawler())
+    scorer.score(knowledge)
+    assert scorer.stats.runs == 1
+    assert scorer.stats.warm_runs == 0
+    warm = scorer.score(edited)
+    assert scorer.stats.runs == 2
+    assert scorer.stats.warm_runs == 1
+    # Warm and cold starts stop on the same test, which bounds their distance from exact PageRank.
+    exact = pagerank_scores(edited_graph, edited.keys(), tolerance=1e-12)
+    cold = pagerank_scores(edited_graph, edited.keys())
+    bound = 1e-3 * 0.85 / (1 - 0.85)
+    for scores in [warm, cold]:
+        assert sum(abs(scores[path] - exact[path]) for path in paths) / len(paths) < bound
+    # Scoring the same knowledge again gives the same scores.
+    assert scorer.score(edited) == warm
+    # Explicit updates start from the given scores.
+    fresh = PageRankScorer(LineageCrawler())
+    updated = fresh.update(edited, knowledge.diff(edited), fresh.score(knowledge))
+    assert fresh.stats.warm_runs == 1
+    assert updated == warm
+
+def test_pagerank_cold_start_after_large_change():
+    paths = [p(f'f{i}.py') for i in range(20)]
+    knowledge = Knowledge({path: '' for path in paths})
+    graph = KnowledgeGraph({path: KnowledgeIndex([paths[0]]) for path in paths[1:]})
+    scorer = PageRankScorer(ConstantGraphCrawler(graph))
+    scorer.score(knowledge)
+    # Warm start does not save iterations when many documents change.
+    edited = knowledge | Knowledge({path: '# edited' for path in paths[:5]})
+    scorer.score(edited)
+    assert scorer.stats.warm_runs == 0
+
+def test_pagerank_history_is_weak():
+    knowledge = Knowledge({p('a'): '', p('b'): ''})
+    scorer = PageRankScorer(ConstantGraphCrawler(KnowledgeGraph({p('a'): KnowledgeIndex([p('b')])})))
+    scorer.score(knowledge)
+    reference = weakref.ref(knowledge)
+    del knowledge
+    gc.collect()
+    assert reference() is None
+
+def test_pagerank_stats_count_lost_iterations():
+    paths = [p(f'f{i}.py') for i in range(20)]
+    knowledge = Knowledge({path: '' for path in paths})
+    edited = knowledge | Knowledge({paths[0]: '# edited'})
+    linked = KnowledgeGraph({paths[0]: KnowledgeIndex(paths[1:])})
+
+    class LineageCrawler(KnowledgeCrawler):
+        def crawl(self, knowledge: Knowledge) -> KnowledgeGraph:
+            return linked if knowledge is edited else KnowledgeGraph()
+
+    scorer = PageRankScorer(LineageCrawler())
+    scorer.score(knowledge)
+    cold = scorer.stats.iterations
+    scorer.score(edited)
+    stats = scorer.stats
+    warm = stats.iterations - cold
+    # Warm start on the new graph took longer than the cold start that began the lineage.
+    assert warm > cold
+    assert stats.saved_iterations == cold - warm
+    assert stats.lost_iterations == warm - cold
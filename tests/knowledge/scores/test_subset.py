@@ -14,3 +14,9 @@ def test_subset_scorer():
     scores = scorer.score(knowledge)
     assert scores[PurePosixPath('b.py')] == 5.0
     assert PurePosixPath('a.txt') not in scores
+
+def test_subset_scorer_update():
+    scorer = SubsetScorer(coerce_subset('*.py'), score=5.0)
+    updated = Knowledge({PurePosixPath('a.txt'): '', PurePosixPath('c.py'): ''})
+    scores = scorer.update(updated, knowledge.diff(updated), scorer.score(knowledge))
+    assert scores == scorer.score(updated)
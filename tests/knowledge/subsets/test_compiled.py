@@ -0,0 +1,67 @@
+from pathlib import PurePosixPath
+from llobot.knowledge.subsets.compiled import CompiledSubset, compile_subset
+from llobot.knowledge.subsets.difference import DifferenceSubset
+from llobot.knowledge.subsets.parsing import parse_pattern
+from llobot.knowledge.subsets.paths import PathsSubset
+from llobot.knowledge.subsets.standard import blacklist_subset
+from llobot.knowledge.subsets.union import UnionSubset
+from llobot.knowledge.indexes import KnowledgeIndex
+
+PATTERNS = [
+    '*.py', '.editorconfig', 'node_modules/**', '/src/gen/**', '**/*.min.js', '/docs/*.md',
+    'test_*.py', 'docs/*.rst', '.eslintrc*', 'a.*', 'x/[ab]?.txt', 'lib/**/*.so', '*.egg-info/**',
+]
+
+PATHS = [PurePosixPath(p) for p in [
+    'main.py', 'a/b/main.py', '.py', 'x.py.txt', 'py', '.editorconfig', 'a/.editorconfig', 'node_modules',
+    'node_modules/x.js', 'a/node_modules/b/c.js', 'src/gen/x.java', 'src/gen', 'a/src/gen/x.java',
+    'src/generated/x.java', 'app.min.js', 'a/b/app.min.js', 'docs/index.md', 'a/docs/index.md',
+    'docs/sub/index.md', 'test_x.py', 'a/test_x.txt', 'docs/x.rst', 'a/docs/x.rst', 'docs/a/x.rst',
+    '.eslintrc.json', 'a/.eslintrc', 'a.', 'a.b', 'b/a.c', 'x/ab.txt', 'x/bz.txt', 'x/cz.txt',
+    'y/x/az.txt', 'lib/a.so', 'lib/a/b/c.so', 'a/lib/x.so', 'foo.egg-info/PKG-INFO', 'a/foo.egg-info/x',
+]]
+
+def test_compile_subset_equivalence():
+    for pattern in PATTERNS:
+        original = parse_pattern(pattern)
+        compiled = compile_subset(original)
+        assert isinstance(compiled, CompiledSubset), pattern
+        for path in PATHS:
+            assert compiled.contains(path) == original.contains(path), (pattern, path)
+    original = parse_pattern(*PATTERNS)
+    compiled = compile_subset(original)
+    assert isinstance(compiled, CompiledSubset)
+    assert [compiled.contains(p) for p in PATHS] == [original.contains(p) for p in PATHS]
+
+def test_compile_subset_combinators():
+    py = compile_subset(parse_pattern('*.py'))
+    docs = compile_subset(parse_pattern('docs/**'))
+    # Union of compiled subsets is merged into one compiled subset.
+    union = py | docs
+    assert isinstance(union, CompiledSubset)
+    assert union == compile_subset(parse_pattern('*.py', 'docs/**'))
+    difference = py - parse_pattern('test_*.py')
+    assert isinstance(difference, DifferenceSubset)
+    assert isinstance(difference.subtrahend, CompiledSubset)
+    assert PurePosixPath('a.py') in difference and PurePosixPath('test_a.py') not in difference
+    assert PurePosixPath('a.py') not in ~py
+    # Subsets that cannot be compiled are kept.
+    paths = PathsSubset(KnowledgeIndex(['a.txt']))
+    mixed = compile_subset(UnionSubset(parse_pattern('*.py'), paths))
+    assert isinstance(mixed, UnionSubset)
+    assert PurePosixPath('a.txt') in mixed and PurePosixPath('b.py') in mixed
+    assert compile_subset(paths) is paths
+
+def test_standard_subsets_compiled():
+    assert isinstance(blacklist_subset(), CompiledSubset)
+
+def test_compiled_contains_many():
+    for pattern in PATTERNS:
+        compiled = compile_subset(parse_pattern(pattern))
+        assert compiled.contains_many(PATHS) == [compiled.contains(p) for p in PATHS], pattern
+    combined = compile_subset(parse_pattern(*PATTERNS))
+    assert combined.contains_many(PATHS) == [combined.contains(p) for p in PATHS]
+    # Combinators evaluate operands in bulk too.
+    mixed = (combined - parse_pattern('*.py')) | ~parse_pattern('a/**')
+    assert mixed.contains_many(PATHS) == [mixed.contains(p) for p in PATHS]
+    assert mixed.filter(PATHS) == [p for p in PATHS if p in mixed]
@@ -3,6 +3,7 @@ from llobot.knowledge.subsets import coerce_subset
 from llobot.knowledge.subsets.solo import SoloSubset
 from llobot.knowledge.subsets.parsing import parse_pattern
 from llobot.knowledge.subsets.paths import PathsSubset
+from llobot.knowledge.subsets.suffix import SuffixSubset
 from llobot.knowledge.indexes import KnowledgeIndex
 
 def test_coerce_subset_from_path():
@@ -48,3 +49,16 @@ def test_operators():
     complement = ~s1
     assert PurePosixPath('a.txt') not in complement
     assert PurePosixPath('b.txt') in complement
+
+def test_mask_and_filter():
+    subset = SuffixSubset('.txt')
+    paths = [PurePosixPath('a.txt'), PurePosixPath('b.py'), PurePosixPath('c/d.txt')]
+    assert subset.mask(paths) == [True, False, True]
+    # Bulk results are remembered in the memo.
+    stats = subset.memo.stats
+    assert (stats.hits, stats.misses, stats.size) == (0, 3, 3)
+    assert subset.filter(reversed(paths)) == [PurePosixPath('c/d.txt'), PurePosixPath('a.txt')]
+    assert subset.memo.stats.hits == 3
+    # Complement reuses memo of the original subset.
+    assert (~subset).mask(paths) == [False, True, False]
+    assert subset.memo.stats.hits == 6
@@ -0,0 +1,67 @@
+from __future__ import annotations
+import threading
+from pathlib import PurePosixPath
+from llobot.knowledge.subsets.memos import SubsetMemo
+from llobot.knowledge.subsets.suffix import SuffixSubset
+
+def test_memo_lru():
+    memo = SubsetMemo(2)
+    memo.put(PurePosixPath('a'), True)
+    memo.put(PurePosixPath('b'), False)
+    assert memo.get(PurePosixPath('a')) is True
+    memo.put(PurePosixPath('c'), True)
+    # 'b' was least recently used.
+    assert memo.get(PurePosixPath('b')) is None
+    assert memo.get(PurePosixPath('a')) is True
+    assert memo.get(PurePosixPath('c')) is True
+    stats = memo.stats
+    assert (stats.hits, stats.misses, stats.evictions, stats.size, stats.capacity) == (3, 1, 1, 2, 2)
+
+def test_memo_resize():
+    memo = SubsetMemo(4)
+    for name in 'abcd':
+        memo.put(PurePosixPath(name), True)
+    memo.resize(1)
+    assert memo.stats.size == 1
+    assert memo.get(PurePosixPath('d')) is True
+    memo.clear()
+    assert memo.stats.size == 0
+
+def test_subset_memo():
+    subset = SuffixSubset('.py')
+    subset.memo.resize(2)
+    for name in ['a.py', 'b.txt', 'c.py', 'a.py']:
+        assert (PurePosixPath(name) in subset) == name.endswith('.py')
+    stats = subset.memo.stats
+    assert stats.size == 2
+    assert stats.misses == 4
+    assert stats.evictions == 2
+    # Memo does not affect equality.
+    assert subset == SuffixSubset('.py')
+
+def test_subset_memo_threads():
+    subset = SuffixSubset('.py')
+    subset.memo.resize(50)
+    paths = [PurePosixPath(f'{i}.py' if i % 2 else f'{i}.txt') for i in range(200)]
+    errors = []
+    def work():
+        for path in paths:
+            if (path in subset) != (path.suffix == '.py'):
+                errors.append(path)
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    stats = subset.memo.stats
+    assert stats.size <= 50
+    assert stats.hits + stats.misses == 8 * len(paths)
+
+def test_memo_bulk():
+    memo = SubsetMemo(3)
+    paths = [PurePosixPath(name) for name in 'abcd']
+    memo.put_many(paths, [True, False, True, False])
+    assert memo.get_many(paths) == [None, False, True, False]
+    stats = memo.stats
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (3, 1, 1, 3)
@@ -0,0 +1,14 @@
+from llobot.knowledge.deltas import KnowledgeDelta
+from llobot.knowledge.indexes import KnowledgeIndex
+
+def test_delta():
+    delta = KnowledgeDelta(added=KnowledgeIndex(['a']), removed=KnowledgeIndex(['b']), modified=KnowledgeIndex(['c']))
+    assert delta.changed == KnowledgeIndex(['a', 'b', 'c'])
+    assert delta.structural
+    assert len(delta) == 3
+    assert delta.reversed() == KnowledgeDelta(added=KnowledgeIndex(['b']), removed=KnowledgeIndex(['a']), modified=KnowledgeIndex(['c']))
+
+def test_delta_empty():
+    assert not KnowledgeDelta()
+    assert not KnowledgeDelta().structural
+    assert not KnowledgeDelta(modified=KnowledgeIndex(['c'])).structural
@@ -7,6 +7,7 @@ from llobot.knowledge import Knowledge
 from llobot.knowledge.indexes import KnowledgeIndex, coerce_index
 from llobot.knowledge.ranking import KnowledgeRanking
 from llobot.knowledge.subsets.pattern import PatternSubset
+from llobot.knowledge.tables import PathTable
 
 INDEX = KnowledgeIndex(['a/b.txt', 'a/c.txt', 'd.txt'])
 
@@ -72,3 +73,28 @@ def test_coerce_index_invalid_type():
         assert False, "Should have raised TypeError"
     except TypeError:
         pass
+
+def test_knowledge_index_table():
+    table = PathTable()
+    a = KnowledgeIndex(['a/b.txt', 'a/c.txt', 'd.txt'], table=table)
+    b = KnowledgeIndex(['d.txt', 'e.txt'], table=table)
+    # Bitset-backed indexes behave exactly like plain ones.
+    assert a == INDEX and INDEX == a
+    assert hash(a) == hash(INDEX)
+    assert len(a) == 3 and a and not KnowledgeIndex(table=table)
+    assert 'a/b.txt' in a and 'x.txt' not in a
+    assert set(a) == set(INDEX)
+    assert a | b == KnowledgeIndex(['a/b.txt', 'a/c.txt', 'd.txt', 'e.txt'])
+    assert a & b == KnowledgeIndex(['d.txt'])
+    assert a - b == KnowledgeIndex(['a/b.txt', 'a/c.txt'])
+    assert a | PurePosixPath('f.txt') == INDEX | PurePosixPath('f.txt')
+    assert a & PatternSubset('a/*') == KnowledgeIndex(['a/b.txt', 'a/c.txt'])
+    # Mixing tables or representations falls back to path sets.
+    assert a | KnowledgeIndex(['e.txt'], table=PathTable()) == a | b
+    assert INDEX - b == a - b
+
+def test_knowledge_keys_share_table():
+    knowledge = Knowledge({PurePosixPath('a.py'): 'a', PurePosixPath('b.txt'): 'b'})
+    python = knowledge & '*.py'
+    assert knowledge.keys() - python.keys() == KnowledgeIndex(['b.txt'])
+    assert (knowledge | python).keys() & python.keys() == KnowledgeIndex(['a.py'])
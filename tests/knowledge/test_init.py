@@ -30,6 +30,28 @@ def test_knowledge_eq_hash():
     assert KNOWLEDGE != Knowledge({PurePosixPath('a/b.txt'): 'changed'})
     assert {KNOWLEDGE, k2} == {KNOWLEDGE}
 
+def test_knowledge_digest():
+    digest = KNOWLEDGE.digest
+    assert len(digest) == 32
+    # Digest depends on paths and content, but not on order.
+    assert Knowledge(dict(reversed(list(KNOWLEDGE)))).digest == digest
+    assert Knowledge({PurePosixPath('a/b.txt'): 'changed'}).digest != Knowledge({PurePosixPath('a/b.txt'): 'content b'}).digest
+    assert Knowledge({PurePosixPath('x.txt'): 'content b'}).digest != Knowledge({PurePosixPath('a/b.txt'): 'content b'}).digest
+    assert Knowledge().digest == Knowledge().digest
+
+def test_knowledge_digest_derived():
+    # Derived knowledge reuses digests of the source, but the result is the same as for fresh knowledge.
+    KNOWLEDGE.digest
+    for derived in [
+        KNOWLEDGE & 'a/b.txt',
+        KNOWLEDGE - 'd.txt',
+        KNOWLEDGE | Knowledge({PurePosixPath('d.txt'): 'new d', PurePosixPath('e.txt'): 'e'}),
+        'x' / KNOWLEDGE,
+        KNOWLEDGE / 'a',
+    ]:
+        assert derived.digest == Knowledge(dict(derived)).digest
+        assert derived == Knowledge(dict(derived))
+
 def test_knowledge_contains():
     assert PurePosixPath('a/b.txt') in KNOWLEDGE
     assert 'a/b.txt' in KNOWLEDGE
@@ -47,6 +69,23 @@ def test_knowledge_filter():
     filtered = KNOWLEDGE & SoloSubset(PurePosixPath('a/b.txt'))
     assert filtered.keys() == KnowledgeIndex(['a/b.txt'])
 
+def test_knowledge_filter_view():
+    view = KNOWLEDGE - SoloSubset(PurePosixPath('a/c.txt'))
+    assert len(view) == 2
+    assert list(view) == [(PurePosixPath('a/b.txt'), 'content b'), (PurePosixPath('d.txt'), 'content d')]
+    assert view.cost == len('content b') + len('content d')
+    nested = view - SoloSubset(PurePosixPath('d.txt'))
+    assert list(nested) == [(PurePosixPath('a/b.txt'), 'content b')]
+    assert PurePosixPath('a/b.txt') in nested
+    assert PurePosixPath('a/c.txt') not in nested
+    assert nested[PurePosixPath('d.txt')] == ''
+    # Views are indistinguishable from eagerly built knowledge.
+    assert nested == Knowledge({PurePosixPath('a/b.txt'): 'content b'})
+    assert hash(view) == hash(Knowledge(dict(view)))
+    assert (view | nested) == view
+    # Filter that keeps everything returns the same object.
+    assert (KNOWLEDGE & '**') is KNOWLEDGE
+
 def test_knowledge_union():
     other = Knowledge({PurePosixPath('x.txt'): 'content x', PurePosixPath('a/b.txt'): 'overwritten'})
     merged = KNOWLEDGE | other
@@ -62,3 +101,28 @@ def test_knowledge_paths():
     assert prefixed.keys() == KnowledgeIndex(['a/b.txt'])
     subtree = KNOWLEDGE / 'a'
     assert subtree.keys() == KnowledgeIndex(['b.txt', 'c.txt'])
+
+def test_knowledge_diff():
+    other = Knowledge({
+        PurePosixPath('a/b.txt'): 'changed',
+        PurePosixPath('a/c.txt'): 'content c',
+        PurePosixPath('x.txt'): 'content x',
+    })
+    delta = KNOWLEDGE.diff(other)
+    assert delta.added == KnowledgeIndex(['x.txt'])
+    assert delta.removed == KnowledgeIndex(['d.txt'])
+    assert delta.modified == KnowledgeIndex(['a/b.txt'])
+    assert other.diff(KNOWLEDGE) == delta.reversed()
+    assert not KNOWLEDGE.diff(KNOWLEDGE)
+
+def test_knowledge_lineage():
+    updated = KNOWLEDGE | Knowledge({PurePosixPath('a/b.txt'): 'changed'})
+    assert updated.parent is KNOWLEDGE
+    delta = KNOWLEDGE.diff(updated)
+    assert delta.modified == KnowledgeIndex(['a/b.txt'])
+    assert not delta.structural
+    # Lineage is followed in both directions.
+    assert updated.diff(KNOWLEDGE) == delta.reversed()
+    # Unchanged content recorded as a change does not show up in the delta.
+    same = Knowledge(dict(KNOWLEDGE), parent=KNOWLEDGE, changes=[PurePosixPath('d.txt')])
+    assert not KNOWLEDGE.diff(same)
@@ -0,0 +1,98 @@
+from pathlib import PurePosixPath
+from llobot.knowledge import Knowledge
+from llobot.knowledge.indexes import KnowledgeIndex
+from llobot.knowledge.lazy import LazyKnowledge
+from llobot.utils.values import ValueTypeMixin
+
+DOCUMENTS = {
+    PurePosixPath('a.py'): 'import b',
+    PurePosixPath('b.py'): 'pass',
+    PurePosixPath('c.bin'): None,
+}
+
+class Loader:
+    def __init__(self):
+        self.reads = []
+
+    def __call__(self, path: PurePosixPath) -> str | None:
+        self.reads.append(path)
+        return DOCUMENTS[path]
+
+def _lazy(loader: Loader) -> LazyKnowledge:
+    return LazyKnowledge(loader, {PurePosixPath('a.py'): 10, PurePosixPath('b.py'): 4, PurePosixPath('c.bin'): 100}, version=1)
+
+def test_lazy_knowledge_metadata():
+    loader = Loader()
+    knowledge = _lazy(loader)
+    assert len(knowledge) == 3
+    assert knowledge.keys() == KnowledgeIndex(['a.py', 'b.py', 'c.bin'])
+    assert PurePosixPath('a.py') in knowledge
+    assert knowledge.size(PurePosixPath('a.py')) == 10
+    assert knowledge.cost == 114
+    filtered = knowledge & '*.py'
+    assert filtered.keys() == KnowledgeIndex(['a.py', 'b.py'])
+    assert loader.reads == []
+
+def test_lazy_knowledge_content():
+    loader = Loader()
+    knowledge = _lazy(loader)
+    filtered = knowledge & '*.py'
+    assert filtered[PurePosixPath('a.py')] == 'import b'
+    # Exact size is known once the document is read.
+    assert filtered.size(PurePosixPath('a.py')) == 8
+    # Content is shared with the original knowledge.
+    assert knowledge[PurePosixPath('a.py')] == 'import b'
+    assert loader.reads == [PurePosixPath('a.py')]
+    assert knowledge[PurePosixPath('missing.py')] == ''
+    assert list(knowledge) == [(PurePosixPath('a.py'), 'import b'), (PurePosixPath('b.py'), 'pass')]
+    assert knowledge | Knowledge({PurePosixPath('d.txt'): 'd'}) == Knowledge({
+        PurePosixPath('a.py'): 'import b',
+        PurePosixPath('b.py'): 'pass',
+        PurePosixPath('d.txt'): 'd',
+    })
+
+def test_lazy_knowledge_equality():
+    loader = Loader()
+    assert _lazy(loader) == _lazy(loader)
+    assert hash(_lazy(loader)) == hash(_lazy(loader))
+    assert _lazy(loader) != LazyKnowledge(loader, {PurePosixPath('a.py'): 10}, version=1)
+    assert _lazy(loader) != LazyKnowledge(loader, {PurePosixPath('a.py'): 10, PurePosixPath('b.py'): 4, PurePosixPath('c.bin'): 100}, version=2)
+    eager = Knowledge({path: content for path, content in _lazy(Loader())})
+    assert _lazy(loader) != eager and eager != _lazy(loader)
+    assert loader.reads == []
+
+def test_lazy_knowledge_unreadable():
+    loader = Loader()
+    knowledge = _lazy(loader)
+    filtered = knowledge & '*'
+    assert knowledge.size(PurePosixPath('c.bin')) == 100
+    assert knowledge[PurePosixPath('c.bin')] == ''
+    # Unreadable documents disappear once they are read, including in derived knowledge.
+    for view in [knowledge, filtered]:
+        assert PurePosixPath('c.bin') not in view
+        assert view.keys() == KnowledgeIndex(['a.py', 'b.py'])
+        assert len(view) == 2
+        assert view.size(PurePosixPath('c.bin')) == 0
+    assert knowledge.cost == 14
+    assert loader.reads == [PurePosixPath('c.bin')]
+
+class Project(ValueTypeMixin):
+    _name: str
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def read(self, path: PurePosixPath) -> str | None:
+        return DOCUMENTS[path]
+
+def test_lazy_knowledge_fingerprint():
+    sizes = {PurePosixPath('a.py'): 10, PurePosixPath('b.py'): 4}
+    fingerprint = LazyKnowledge(Project('x').read, sizes, version=(1, 2)).fingerprint
+    assert fingerprint is not None
+    assert fingerprint == LazyKnowledge(Project('x').read, dict(reversed(sizes.items())), version=(1, 2)).fingerprint
+    assert fingerprint != LazyKnowledge(Project('y').read, sizes, version=(1, 2)).fingerprint
+    assert fingerprint != LazyKnowledge(Project('x').read, sizes, version=(1, 3)).fingerprint
+    assert fingerprint != LazyKnowledge(Project('x').read, {PurePosixPath('a.py'): 10}, version=(1, 2)).fingerprint
+    # Fingerprint requires value-comparable loader and plain version.
+    assert LazyKnowledge(Loader(), sizes, version=(1, 2)).fingerprint is None
+    assert LazyKnowledge(Project('x').read, sizes, version=(1, object())).fingerprint is None
@@ -1,5 +1,6 @@
 from pathlib import PurePosixPath
 from llobot.knowledge import Knowledge
+from llobot.knowledge.deltas import KnowledgeDelta
 from llobot.knowledge.indexes import KnowledgeIndex
 from llobot.knowledge.ranking import KnowledgeRanking
 from llobot.knowledge.resolver import KnowledgeResolver, cached_knowledge_resolver
@@ -90,3 +91,27 @@ def test_resolve_near():
     assert resolver.resolve_near(PurePosixPath('src/other.py'), PurePosixPath('nonexistent.py')) is None
     # Tie
     assert resolver.resolve_near(PurePosixPath('root.py'), PurePosixPath('main.py')) is None
+
+def test_resolver_update():
+    old = KnowledgeIndex(['src/main.py', 'src/utils/helper.py', 'README.md'])
+    new = KnowledgeIndex(['src/main.py', 'lib/utils/helper.py', 'docs/README.md', 'setup.py'])
+    delta = KnowledgeDelta(added=new - old, removed=old - new)
+    updated = KnowledgeResolver(old).update(delta)
+    fresh = KnowledgeResolver(new)
+    assert updated._names == fresh._names
+    assert updated._tails == fresh._tails
+    resolver = KnowledgeResolver(old)
+    assert resolver.update(KnowledgeDelta(modified=KnowledgeIndex(['README.md']))) is resolver
+
+def test_cached_resolver_follows_lineage():
+    old = Knowledge({PurePosixPath('a/b.py'): '', PurePosixPath('c/d.py'): ''})
+    resolver = cached_knowledge_resolver(old)
+    # Modified documents keep the resolver.
+    modified = old | Knowledge({PurePosixPath('a/b.py'): 'x'})
+    assert cached_knowledge_resolver(modified) is resolver
+    # Added documents update the resolver of the ancestor.
+    added = modified | Knowledge({PurePosixPath('e/b.py'): ''})
+    updated = cached_knowledge_resolver(added)
+    assert updated._names == KnowledgeResolver(added.keys())._names
+    assert updated._tails == KnowledgeResolver(added.keys())._tails
+    assert updated._tails[PurePosixPath('c/d.py')] is resolver._tails[PurePosixPath('c/d.py')]
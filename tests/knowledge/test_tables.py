@@ -0,0 +1,35 @@
+"""
+Tests for `llobot.knowledge.tables`.
+"""
+from pathlib import PurePosixPath
+from llobot.knowledge.tables import PathTable
+
+def test_path_table():
+    table = PathTable()
+    a = PurePosixPath('a.txt')
+    b = PurePosixPath('b/c.txt')
+    assert table.find(a) is None
+    assert table.intern(a) == 0
+    assert table.intern(b) == 1
+    assert table.intern(a) == 0
+    assert table.find(b) == 1
+    assert table.path(1) == b
+    assert len(table) == 2
+
+def test_path_table_bits():
+    table = PathTable()
+    paths = [PurePosixPath(f'{i}.txt') for i in range(100)]
+    bits = table.bits(reversed(paths[::3]))
+    assert bits.bit_count() == 34
+    # Paths are returned in ID order, i.e. in order of interning.
+    assert table.paths(bits) == list(reversed(paths[::3]))
+    assert table.bits([]) == 0
+    assert table.paths(0) == []
+
+def test_path_table_ids():
+    ids = [0, 3, 8, 64]
+    bits = PathTable.id_bits(reversed(ids))
+    assert bits.bit_count() == 4
+    assert PathTable.ids(bits) == ids
+    assert PathTable.id_bits([]) == 0
+    assert PathTable.ids(0) == []
@@ -150,6 +150,10 @@ def test_home_project_library_properties(tmp_path: Path):
         blacklist=blacklist,
         mutable=True,
         executable=True,
+        workers=4,
+        watch=True,
+        git=True,
+        max_size=1000,
         parents=False,
     )
     assert lib.directory == tmp_path.absolute()
@@ -157,4 +161,8 @@ def test_home_project_library_properties(tmp_path: Path):
     assert lib.blacklist == blacklist
     assert lib.is_mutable is True
     assert lib.is_executable is True
+    assert lib.workers == 4
+    assert lib.watch is True
+    assert lib.git is True
+    assert lib.max_size == 1000
     assert lib.parents is False
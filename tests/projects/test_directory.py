@@ -1,5 +1,7 @@
 import os
+import shutil
 import stat
+import subprocess
 from pathlib import Path, PurePosixPath
 import pytest
 from llobot.projects.directory import DirectoryProject
@@ -140,6 +142,82 @@ def test_directory_project_filtering(tmp_path: Path):
     assert {item.path for item in project.walk(PurePosixPath('p')) if isinstance(item, ProjectFile) and project.tracked(item)} == {PurePosixPath('p/file1.txt')}
     assert project.read_all() == Knowledge({PurePosixPath('p/file1.txt'): 'content1\n'})
 
+def test_directory_project_tracked_files(tmp_path: Path):
+    (tmp_path / "src" / "core").mkdir(parents=True)
+    (tmp_path / "node_modules" / "lib").mkdir(parents=True)
+    (tmp_path / "b.txt").write_text("b")
+    (tmp_path / "a.py").write_text("a")
+    (tmp_path / "src" / "core" / "c.py").write_text("c")
+    (tmp_path / "src" / "d.txt").write_text("d")
+    (tmp_path / "node_modules" / "lib" / "e.js").write_text("e")
+    (tmp_path / "link.txt").symlink_to(tmp_path / "b.txt")
+    (tmp_path / "broken").symlink_to(tmp_path / "missing")
+
+    project = DirectoryProject(tmp_path, prefix="p")
+    walked = [item.path for item in project.walk() if isinstance(item, ProjectFile) and project.tracked(item)]
+    assert project.tracked_files() == walked
+    assert project.tracked_files() == [
+        PurePosixPath("p/a.py"),
+        PurePosixPath("p/b.txt"),
+        PurePosixPath("p/link.txt"),
+        PurePosixPath("p/src/core/c.py"),
+        PurePosixPath("p/src/d.txt"),
+    ]
+    assert project.index() == KnowledgeIndex(walked)
+
+    whitelisted = DirectoryProject(tmp_path, prefix="p", whitelist=SuffixSubset(".py"))
+    assert whitelisted.tracked_files() == [PurePosixPath("p/a.py"), PurePosixPath("p/src/core/c.py")]
+
+def test_directory_project_tracked_files_missing_directory(tmp_path: Path):
+    assert DirectoryProject(tmp_path / "missing", prefix="p").tracked_files() == []
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_directory_project_git_index(tmp_path: Path):
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    (tmp_path / "src" / "node_modules").mkdir(parents=True)
+    (tmp_path / "build").mkdir()
+    (tmp_path / ".gitignore").write_text("build/\n")
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "src" / "b.py").write_text("b")
+    (tmp_path / "src" / "node_modules" / "c.js").write_text("c")
+    (tmp_path / "build" / "out.txt").write_text("ignored")
+    subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+    (tmp_path / "untracked.txt").write_text("u")
+
+    project = DirectoryProject(tmp_path, prefix="p", git=True)
+    assert project.git
+    # Ignored and not yet added files are not listed. Blacklist still applies.
+    assert project.tracked_files() == [PurePosixPath("p/.gitignore"), PurePosixPath("p/a.txt"), PurePosixPath("p/src/b.py")]
+    assert project.read_all()[PurePosixPath("p/src/b.py")] == "b\n"
+
+    # Subdirectories of the working tree use the repository's index too.
+    assert DirectoryProject(tmp_path / "src", prefix="s", git=True).tracked_files() == [PurePosixPath("s/b.py")]
+
+def test_directory_project_git_fallback(tmp_path: Path):
+    (tmp_path / "a.txt").write_text("a")
+    project = DirectoryProject(tmp_path, prefix="p", git=True)
+    assert project.tracked_files() == DirectoryProject(tmp_path, prefix="p").tracked_files()
+
+def test_directory_project_git_watch_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        DirectoryProject(tmp_path, prefix="p", git=True, watch=True)
+
+def test_directory_project_read_lazy(tmp_path: Path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.bin").write_bytes(b"\x00\x01")
+    old = os.stat(tmp_path / "a.txt").st_mtime_ns - 60_000_000_000
+    os.utime(tmp_path / "a.txt", ns=(old, old))
+    os.utime(tmp_path / "b.bin", ns=(old, old))
+    project = DirectoryProject(tmp_path, prefix="p")
+    knowledge = project.read_lazy()
+    assert knowledge.keys() == KnowledgeIndex(["p/a.txt", "p/b.bin"])
+    assert knowledge.size(PurePosixPath("p/b.bin")) == 2
+    assert list(knowledge) == list(project.read_all())
+    # Unchanged project produces equal knowledge, so downstream caches hit.
+    assert project.read_lazy() == knowledge
+    (tmp_path / "a.txt").write_text("changed")
+    assert project.read_lazy() != knowledge
+
 def test_items(tmp_path: Path):
     (tmp_path / "file.txt").write_text("content")
     (tmp_path / "subdir").mkdir()
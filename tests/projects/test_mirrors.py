@@ -0,0 +1,107 @@
+from __future__ import annotations
+from pathlib import Path, PurePosixPath
+import pytest
+from llobot.knowledge import Knowledge
+from llobot.projects.directory import DirectoryProject
+from llobot.projects.mirrors import MirrorCache, ProjectMirror
+from llobot.utils.inotify import inotify_available
+
+pytestmark = pytest.mark.skipif(not inotify_available(), reason="inotify is not available")
+
+def test_project_mirror_initial(tmp_path: Path):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'node_modules').mkdir()
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'src' / 'b.py').write_text('b')
+    (tmp_path / 'node_modules' / 'c.js').write_text('c')
+    (tmp_path / 'd.bin').write_bytes(b'\x00')
+    project = DirectoryProject(tmp_path, prefix='p')
+    mirror = ProjectMirror(project)
+    try:
+        assert mirror.tracked_files() == project.tracked_files()
+        assert mirror.read_all() == project.read_all()
+        assert mirror.read_all() is mirror.read_all()
+        assert mirror.tracks(PurePosixPath('p/d.bin'))
+        assert mirror.read(PurePosixPath('p/d.bin')) is None
+        assert mirror.generation == 0
+    finally:
+        mirror.close()
+
+def test_project_mirror_changes(tmp_path: Path):
+    (tmp_path / 'a.txt').write_text('a')
+    project = DirectoryProject(tmp_path, prefix='p')
+    mirror = ProjectMirror(project)
+    try:
+        first = mirror.read_all()
+
+        (tmp_path / 'a.txt').write_text('changed')
+        assert mirror.read(PurePosixPath('p/a.txt')) == 'changed\n'
+        assert mirror.generation == 1
+
+        # New directories are watched, so that changes inside them are noticed too.
+        (tmp_path / 'sub').mkdir()
+        (tmp_path / 'sub' / 'b.txt').write_text('b')
+        assert mirror.tracked_files() == [PurePosixPath('p/a.txt'), PurePosixPath('p/sub/b.txt')]
+        (tmp_path / 'sub' / 'c.txt').write_text('c')
+        assert mirror.tracks(PurePosixPath('p/sub/c.txt'))
+
+        (tmp_path / 'sub').rename(tmp_path / 'moved')
+        (tmp_path / 'a.txt').unlink()
+        assert mirror.read_all() == Knowledge({
+            PurePosixPath('p/moved/b.txt'): 'b\n',
+            PurePosixPath('p/moved/c.txt'): 'c\n',
+        })
+        assert mirror.read_all() is not first
+        assert mirror.tracked_files() == project.tracked_files()
+
+        # Events that do not change anything do not bump generation.
+        generation = mirror.generation
+        (tmp_path / 'moved' / 'b.txt').write_text('b')
+        assert mirror.generation == generation
+    finally:
+        mirror.close()
+
+def test_mirror_cache(tmp_path: Path):
+    cache = MirrorCache(capacity=1)
+    first = DirectoryProject(tmp_path / 'first', prefix='first')
+    (tmp_path / 'first').mkdir()
+    mirror = cache.get(first)
+    assert mirror is not None
+    assert cache.get(DirectoryProject(tmp_path / 'first', prefix='first')) is mirror
+    cache.get(DirectoryProject(tmp_path, prefix='second'))
+    assert cache.get(first) is not mirror
+
+def test_directory_project_watch(tmp_path: Path):
+    (tmp_path / 'a.txt').write_text('a')
+    project = DirectoryProject(tmp_path, prefix='p', watch=True)
+    assert project.watch
+    first = project.read_all()
+    assert first == DirectoryProject(tmp_path, prefix='p').read_all()
+    generation = project.generation
+    assert generation is not None
+
+    (tmp_path / 'b.txt').write_text('b')
+    assert project.read(PurePosixPath('p/b.txt')) == 'b\n'
+    assert project.tracked_files() == [PurePosixPath('p/a.txt'), PurePosixPath('p/b.txt')]
+    assert project.generation == generation + 1
+    # Untracked files are still read from disk.
+    (tmp_path / '.git').mkdir()
+    (tmp_path / '.git' / 'config').write_text('x')
+    assert project.read(PurePosixPath('p/.git/config')) == 'x\n'
+
+def test_directory_project_unwatched_generation(tmp_path: Path):
+    assert DirectoryProject(tmp_path, prefix='p').generation is None
+
+def test_project_mirror_max_size(tmp_path: Path):
+    (tmp_path / 'small.txt').write_text('a')
+    (tmp_path / 'large.txt').write_text('x' * 100)
+    project = DirectoryProject(tmp_path, prefix='p', max_size=10, watch=True)
+    mirror = ProjectMirror(project)
+    try:
+        assert mirror.tracks(PurePosixPath('p/large.txt'))
+        assert mirror.read(PurePosixPath('p/large.txt')) is None
+        assert mirror.read_all() == Knowledge({PurePosixPath('p/small.txt'): 'a\n'})
+    finally:
+        mirror.close()
+    # Individual reads fall back to the filesystem.
+    assert project.read(PurePosixPath('p/large.txt')) == 'x' * 100 + '\n'
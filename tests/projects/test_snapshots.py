@@ -0,0 +1,141 @@
+from __future__ import annotations
+import os
+from pathlib import Path, PurePosixPath
+from llobot.knowledge import Knowledge
+from llobot.knowledge.indexes import KnowledgeIndex
+from llobot.projects.directory import DirectoryProject
+from llobot.projects.snapshots import SnapshotCache
+
+def _age(path: Path, seconds: int = 60):
+    """Moves mtime into the past, so that the file is not considered racy."""
+    info = path.stat()
+    os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns - seconds * 1_000_000_000))
+
+def _counts(cache: SnapshotCache) -> tuple[int, int, int]:
+    stats = cache.stats
+    return (stats.hits, stats.misses, stats.reuses)
+
+def _files(directory: Path, *names: str) -> list[tuple[PurePosixPath, Path]]:
+    return [(PurePosixPath('p', name), directory / name) for name in names]
+
+def test_snapshot_cache_reuse(tmp_path: Path):
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'b.txt').write_text('b')
+    _age(tmp_path / 'a.txt')
+    _age(tmp_path / 'b.txt')
+    cache = SnapshotCache()
+    files = _files(tmp_path, 'a.txt', 'b.txt')
+
+    first = cache.read('key', files)
+    assert first == Knowledge({PurePosixPath('p/a.txt'): 'a\n', PurePosixPath('p/b.txt'): 'b\n'})
+    assert _counts(cache) == (0, 2, 0)
+
+    second = cache.read('key', files)
+    assert second is first
+    assert _counts(cache) == (2, 2, 1)
+
+def test_snapshot_cache_rereads_changed(tmp_path: Path):
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'b.txt').write_text('b')
+    _age(tmp_path / 'a.txt')
+    _age(tmp_path / 'b.txt')
+    cache = SnapshotCache()
+    files = _files(tmp_path, 'a.txt', 'b.txt')
+    first = cache.read('key', files)
+
+    (tmp_path / 'b.txt').write_text('changed')
+    second = cache.read('key', files)
+    assert second is not first
+    assert second[PurePosixPath('p/b.txt')] == 'changed\n'
+    assert _counts(cache) == (1, 3, 0)
+    assert second.parent is first
+    assert first.diff(second).modified == KnowledgeIndex(['p/b.txt'])
+
+def test_snapshot_cache_file_set_change(tmp_path: Path):
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'b.txt').write_text('b')
+    cache = SnapshotCache()
+    first = cache.read('key', _files(tmp_path, 'a.txt', 'b.txt'))
+    second = cache.read('key', _files(tmp_path, 'a.txt'))
+    assert second is not first
+    assert second.keys() == first.keys() - PurePosixPath('p/b.txt')
+
+def test_snapshot_cache_racy_files(tmp_path: Path):
+    # Fresh files are always re-read, but unchanged content still reuses the snapshot.
+    (tmp_path / 'a.txt').write_text('a')
+    cache = SnapshotCache()
+    files = _files(tmp_path, 'a.txt')
+    first = cache.read('key', files)
+    assert cache.read('key', files) is first
+    assert _counts(cache) == (0, 2, 1)
+
+def test_snapshot_cache_binary_and_missing(tmp_path: Path):
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'b.bin').write_bytes(b'\x00\x01')
+    cache = SnapshotCache()
+    knowledge = cache.read('key', _files(tmp_path, 'a.txt', 'b.bin', 'missing.txt'))
+    assert knowledge == Knowledge({PurePosixPath('p/a.txt'): 'a\n'})
+
+def test_snapshot_cache_eviction(tmp_path: Path):
+    (tmp_path / 'a.txt').write_text('a')
+    _age(tmp_path / 'a.txt')
+    cache = SnapshotCache(capacity=1)
+    files = _files(tmp_path, 'a.txt')
+    cache.read('first', files)
+    cache.read('second', files)
+    cache.read('first', files)
+    assert _counts(cache) == (0, 3, 0)
+
+def test_directory_project_read_all_reuses_snapshot(tmp_path: Path):
+    (tmp_path / 'a.txt').write_text('a')
+    project = DirectoryProject(tmp_path, prefix='p')
+    first = project.read_all()
+    # Equal project created later (e.g. in another session) shares the snapshot.
+    assert DirectoryProject(tmp_path, prefix='p').read_all() is first
+
+def test_snapshot_cache_parallel(tmp_path: Path):
+    names = [f'{i:02}.txt' for i in range(20)] + ['b.bin', 'missing.txt']
+    for name in names[:20]:
+        (tmp_path / name).write_text(name)
+    (tmp_path / 'b.bin').write_bytes(b'\x00\x01')
+    serial = SnapshotCache().read('key', _files(tmp_path, *names))
+    cache = SnapshotCache()
+    parallel = cache.read('key', _files(tmp_path, *names), workers=4)
+    assert parallel == serial
+    # Order of files is preserved regardless of the order in which reads complete.
+    assert list(parallel.keys()) == list(serial.keys())
+    stats = cache.stats
+    assert stats.list_time >= 0 and stats.stat_time >= 0 and stats.read_time >= 0
+
+def test_directory_project_workers(tmp_path: Path):
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'b.txt').write_text('b')
+    project = DirectoryProject(tmp_path, prefix='p', workers=4)
+    assert project.workers == 4
+    assert project.read_all() == DirectoryProject(tmp_path, prefix='p').read_all()
+
+def test_snapshot_cache_max_size(tmp_path: Path):
+    (tmp_path / 'small.txt').write_text('a')
+    (tmp_path / 'large.txt').write_text('x' * 100)
+    _age(tmp_path / 'small.txt')
+    _age(tmp_path / 'large.txt')
+    cache = SnapshotCache()
+    files = _files(tmp_path, 'small.txt', 'large.txt')
+    assert cache.read('key', files, max_size=10) == Knowledge({PurePosixPath('p/small.txt'): 'a\n'})
+    assert (cache.stats.skipped, cache.stats.skipped_bytes) == (1, 100)
+    # Once the file shrinks below the limit, it is read.
+    (tmp_path / 'large.txt').write_text('b')
+    _age(tmp_path / 'large.txt', 30)
+    assert cache.read('key', files, max_size=10) == Knowledge({PurePosixPath('p/small.txt'): 'a\n', PurePosixPath('p/large.txt'): 'b\n'})
+    assert cache.stats.skipped == 1
+
+def test_directory_project_max_size(tmp_path: Path):
+    (tmp_path / 'small.txt').write_text('a')
+    (tmp_path / 'large.txt').write_text('x' * 100)
+    project = DirectoryProject(tmp_path, prefix='p', max_size=10)
+    assert project.max_size == 10
+    # Oversized files are still listed, but left out of bulk reads.
+    assert project.tracked_files() == [PurePosixPath('p/large.txt'), PurePosixPath('p/small.txt')]
+    assert list(project.read_all().keys()) == [PurePosixPath('p/small.txt')]
+    assert list(project.read_lazy().keys()) == [PurePosixPath('p/small.txt')]
+    assert project.read(PurePosixPath('p/large.txt')) == 'x' * 100 + '\n'
@@ -4,6 +4,7 @@ import stat
 from pathlib import Path, PurePosixPath
 import pytest
 from llobot.knowledge import Knowledge
+from llobot.knowledge.subsets.suffix import SuffixSubset
 from llobot.projects import Project
 from llobot.projects.directory import DirectoryProject
 from llobot.projects.empty import EmptyProject
@@ -114,6 +115,20 @@ def test_union_nested_prefix_allowed():
     assert union.items(PurePosixPath('p')) == [ProjectDirectory(PurePosixPath('p/a'))]
     assert union.items(PurePosixPath('p/a')) == [ProjectFile(PurePosixPath('p/a/x'))]
 
+def test_union_nested_prefix_index(tmp_path: Path):
+    (tmp_path / "inner").mkdir()
+    (tmp_path / "top.txt").write_text("top")
+    (tmp_path / "inner" / "a.txt").write_text("a")
+    (tmp_path / "inner" / "b.py").write_text("b")
+    outer = DirectoryProject(tmp_path, prefix="p")
+    inner = DirectoryProject(tmp_path / "inner", prefix="p/inner", whitelist=SuffixSubset(".py"))
+    union = union_project(outer, inner)
+    # Nested paths are owned by the inner project, which tracks only Python files.
+    expected = [PurePosixPath("p/inner/b.py"), PurePosixPath("p/top.txt")]
+    assert sorted(union.tracked_files()) == expected
+    # Generic walk visits nested prefixes twice, but finds the same files.
+    assert set(union.tracked_files()) == set(Project.tracked_files(union))
+
 def test_union_project_mutable(tmp_path: Path):
     dir1 = tmp_path / "p1"
     dir1.mkdir()
@@ -227,3 +242,45 @@ def test_union_project_properties():
     union = union_project(p1, p2)
     assert isinstance(union, UnionProject)
     assert union.members == (p1, p2)
+
+def test_union_nested_prefix_read_all(tmp_path: Path):
+    (tmp_path / "inner").mkdir()
+    (tmp_path / "top.txt").write_text("top")
+    (tmp_path / "inner" / "a.txt").write_text("a")
+    (tmp_path / "inner" / "b.py").write_text("b")
+    outer = DirectoryProject(tmp_path, prefix="p")
+    inner = DirectoryProject(tmp_path / "inner", prefix="p/inner", whitelist=SuffixSubset(".py"))
+    union = union_project(outer, inner)
+    assert union.read_all() == Knowledge({
+        PurePosixPath("p/inner/b.py"): "b\n",
+        PurePosixPath("p/top.txt"): "top\n",
+    })
+
+def test_union_read_lazy(tmp_path: Path):
+    (tmp_path / "inner").mkdir()
+    (tmp_path / "top.txt").write_text("top")
+    (tmp_path / "inner" / "a.txt").write_text("a")
+    (tmp_path / "inner" / "b.py").write_text("b")
+    outer = DirectoryProject(tmp_path, prefix="p")
+    inner = DirectoryProject(tmp_path / "inner", prefix="p/inner", whitelist=SuffixSubset(".py"))
+    union = union_project(outer, inner)
+    knowledge = union.read_lazy()
+    assert knowledge.keys() == union.index()
+    assert list(knowledge) == list(union.read_all())
+    # Members without lazy reading fall back to reading everything.
+    mock = MockProject(prefixes={'m'}, files={"c.txt": "c"})
+    assert union_project(outer, mock).read_lazy() == union_project(outer, mock).read_all()
+
+def test_union_read_many(tmp_path: Path):
+    (tmp_path / "inner").mkdir()
+    (tmp_path / "top.txt").write_text("top")
+    (tmp_path / "inner" / "b.py").write_text("b")
+    outer = DirectoryProject(tmp_path, prefix="p")
+    inner = DirectoryProject(tmp_path / "inner", prefix="p/inner", workers=2)
+    mock = MockProject(prefixes={'m'}, files={"c.txt": "c"})
+    union = union_project(outer, inner, mock)
+    paths = [PurePosixPath(p) for p in ["m/c.txt", "p/inner/b.py", "p/missing.txt", "x/y.txt", "p/top.txt"]]
+    knowledge = union.read_many(paths)
+    # Order of requested paths is preserved and unreadable paths are left out.
+    assert [path for path, _ in knowledge] == [PurePosixPath(p) for p in ["m/c.txt", "p/inner/b.py", "p/top.txt"]]
+    assert all(content == union.read(path) for path, content in knowledge)
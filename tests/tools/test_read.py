@@ -154,3 +154,18 @@ def test_read_tool_no_comments(env: Environment):
     # Comments are no longer supported and are treated as paths, resulting in ValueError
     with pytest.raises(ValueError, match="Path must start with"):
         tool.execute_fenced(env, "Read", "read", content)
+
+def test_read_tool_invalid_line_after_valid_paths(env: Environment):
+    tool = ReadTool()
+    content = """
+    ~/myproject/a.txt
+    not a path
+    ~/myproject/b.py
+    """
+    with pytest.raises(ValueError, match="Path must start with"):
+        tool.execute_fenced(env, "Read", "read", content)
+
+    # Paths before the invalid line are served, paths after it are not.
+    seen = env[KnowledgeEnv]
+    assert "myproject/a.txt" in seen
+    assert "myproject/b.py" not in seen
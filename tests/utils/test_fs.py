@@ -5,6 +5,7 @@ from llobot.utils.fs import (
     user_home, data_home, cache_home, create_parents,
     write_bytes, write_text, read_text, read_document, path_stem
 )
+from llobot.utils.text import normalize_document
 
 def test_home_paths():
     assert user_home() == Path.home()
@@ -31,6 +32,25 @@ def test_file_io(tmp_path: Path):
     write_text(test_file, "  doc\ncontent  \n\n")
     assert read_document(test_file) == "  doc\ncontent\n"
 
+def test_read_document_normalization(tmp_path: Path):
+    f = tmp_path / "doc.txt"
+    cases = [
+        "clean\nsource\n",
+        "žluťoučký kůň\n",
+        "",
+        "no newline",
+        "trailing space \nx\n",
+        "trailing tab\t\n",
+        "trailing nbsp\u00a0\n",
+        "line\u2028separator\n",
+        "\nleading\n",
+        "trailing\n\n",
+        "crlf\r\nlines\r\n",
+    ]
+    for content in cases:
+        f.write_bytes(content.encode('utf-8'))
+        assert read_document(f) == normalize_document(read_text(f)), repr(content)
+
 def test_read_text_strictness(tmp_path: Path):
     f = tmp_path / "test.txt"
 
@@ -52,6 +72,17 @@ def test_read_text_strictness(tmp_path: Path):
     f.write_bytes(b"hello\rworld")
     # Universal newlines should translate \r to \n
     assert read_text(f) == "hello\nworld"
+    f.write_bytes(b"hello\r\nworld\r\n")
+    assert read_text(f) == "hello\nworld\n"
+
+    # Binary content after the sniffed prefix is still detected.
+    f.write_bytes(b"a" * 10000 + b"\x00")
+    with pytest.raises(ValueError, match="Control characters"):
+        read_text(f)
+
+    # Multi-byte characters and large files
+    f.write_text("žluťoučký kůň\n" * 1000, encoding='utf-8')
+    assert read_text(f) == "žluťoučký kůň\n" * 1000
 
 def test_path_stem():
     assert path_stem("a/b/c.tar.gz") == "c"
@@ -0,0 +1,47 @@
+from __future__ import annotations
+import shutil
+import subprocess
+from pathlib import Path, PurePosixPath
+import pytest
+from llobot.utils.git import find_git_directory, parse_git_index, read_git_index
+
+def _git(directory: Path, *args: str) -> str:
+    return subprocess.run(['git', *args], cwd=directory, check=True, capture_output=True, text=True).stdout
+
+@pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+@pytest.mark.parametrize('version', [2, 3, 4])
+def test_read_git_index(tmp_path: Path, version: int):
+    _git(tmp_path, 'init', '-q')
+    (tmp_path / 'src' / 'nested').mkdir(parents=True)
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'src' / 'b.py').write_text('b')
+    (tmp_path / 'src' / 'nested' / 'common-prefix-one.txt').write_text('c')
+    (tmp_path / 'src' / 'nested' / 'common-prefix-two.txt').write_text('c')
+    (tmp_path / 'untracked.txt').write_text('u')
+    _git(tmp_path, 'add', 'a.txt', 'src')
+    # Intent-to-add entries use extended flags, which need version 3.
+    (tmp_path / 'later.txt').write_text('l')
+    _git(tmp_path, 'add', '-N', 'later.txt')
+    _git(tmp_path, 'update-index', '--index-version', str(version))
+
+    entries = read_git_index(tmp_path / '.git')
+    assert entries is not None
+    assert [str(entry.path) for entry in entries] == _git(tmp_path, 'ls-files').splitlines()
+    entry = next(entry for entry in entries if entry.path == PurePosixPath('a.txt'))
+    assert entry.size == 1
+    assert entry.mtime_ns == (tmp_path / 'a.txt').stat().st_mtime_ns
+
+def test_parse_git_index_invalid():
+    with pytest.raises(ValueError):
+        parse_git_index(b'not an index')
+    with pytest.raises(ValueError):
+        parse_git_index(b'DIRC\0\0\0\x02\0\0\0\x01')
+
+def test_find_git_directory(tmp_path: Path):
+    (tmp_path / 'repo' / '.git').mkdir(parents=True)
+    (tmp_path / 'repo' / 'src').mkdir()
+    (tmp_path / 'worktree').mkdir()
+    (tmp_path / 'worktree' / '.git').write_text(f"gitdir: {tmp_path / 'repo' / '.git'}\n")
+    assert find_git_directory(tmp_path / 'repo' / 'src') == (tmp_path / 'repo', tmp_path / 'repo' / '.git')
+    assert find_git_directory(tmp_path / 'worktree') == (tmp_path / 'worktree', tmp_path / 'repo' / '.git')
+    assert read_git_index(tmp_path / 'repo' / '.git') is None
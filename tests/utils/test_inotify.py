@@ -0,0 +1,33 @@
+from __future__ import annotations
+from pathlib import Path
+import pytest
+from llobot.utils.inotify import IN_CREATE, IN_DELETE, IN_ISDIR, Inotify, inotify_available
+
+pytestmark = pytest.mark.skipif(not inotify_available(), reason="inotify is not available")
+
+def test_inotify_events(tmp_path: Path):
+    inotify = Inotify()
+    try:
+        wd = inotify.add_watch(str(tmp_path), IN_CREATE | IN_DELETE)
+        assert inotify.read() == []
+        (tmp_path / 'a.txt').write_text('a')
+        (tmp_path / 'sub').mkdir()
+        (tmp_path / 'a.txt').unlink()
+        assert inotify.read() == [
+            (wd, IN_CREATE, 'a.txt'),
+            (wd, IN_CREATE | IN_ISDIR, 'sub'),
+            (wd, IN_DELETE, 'a.txt'),
+        ]
+        assert inotify.read() == []
+    finally:
+        inotify.close()
+
+def test_inotify_missing_path(tmp_path: Path):
+    inotify = Inotify()
+    try:
+        with pytest.raises(FileNotFoundError):
+            inotify.add_watch(str(tmp_path / 'missing'), IN_CREATE)
+    finally:
+        inotify.close()
+    # Closing twice is harmless.
+    inotify.close()
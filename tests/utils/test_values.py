@@ -1,6 +1,6 @@
 from __future__ import annotations
 import pytest
-from llobot.utils.values import ValueTypeMixin
+from llobot.utils.values import ValueTypeMixin, value_identity
 
 def test_value_type_mixin():
     class MyValue(ValueTypeMixin):
@@ -87,3 +87,14 @@ def test_value_type_mixin_unhashable():
     assert v1 == v2
     assert v1 != v3
     assert v1 != v4
+
+def test_value_identity():
+    class MyValue(ValueTypeMixin):
+        def __init__(self, items):
+            self._items = items
+
+    identity = value_identity(MyValue(frozenset(['a', 'b', 'c'])))
+    assert identity == value_identity(MyValue(frozenset(['c', 'b', 'a'])))
+    assert identity != value_identity(MyValue(frozenset(['a', 'b'])))
+    assert 'MyValue(items={' in identity
+    assert value_identity({'b': 1, 'a': (2, [3])}) == "{'a': (2, [3]), 'b': 1}"
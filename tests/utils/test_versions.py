@@ -0,0 +1,5 @@
+from importlib.metadata import version
+from llobot.utils.versions import package_version
+
+def test_package_version():
+    assert package_version() == version('llobot')